@@ -0,0 +1,48 @@
+"""
+Compare two benchmark result files produced by ``benchmarks.run``.
+
+Usage::
+
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import argparse
+import json
+
+HIGHER_IS_BETTER = {'requests_per_sec', 'connections_reused'}
+METRICS = ('requests_per_sec', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_kib_per_in_flight',
+           'auth_calls_per_rotation', 'ttfb_p50_ms')
+
+def compare(baseline, candidate):
+    rows = []
+    for scenario, before in baseline['results'].items():
+        after = candidate['results'].get(scenario)
+        if after is None or 'skipped' in before or 'skipped' in after:
+            continue
+        for metric in METRICS:
+            if metric not in before or metric not in after:
+                continue
+            old, new = before[metric], after[metric]
+            change = (new - old) / old * 100 if old else 0.0
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            rows.append((scenario, metric, old, new, change, better))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    print(f"{baseline.get('client_version')} -> {candidate.get('client_version')}")
+    print(f"{'scenario':24s} {'metric':24s} {'baseline':>12s} {'candidate':>12s} {'change':>9s}")
+    for scenario, metric, old, new, change, better in compare(baseline, candidate):
+        marker = '+' if better else ('-' if change else ' ')
+        print(f'{scenario:24s} {metric:24s} {old:12.3f} {new:12.3f} {change:8.1f}% {marker}')
+
+if __name__ == '__main__':
+    main()
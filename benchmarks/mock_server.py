@@ -0,0 +1,261 @@
+"""
+Local stand-in for the Strongly API, used by the benchmark suite.
+
+Run it on its own with::
+
+    python -m benchmarks.mock_server --port 8080 --latency 0.02 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+API_KEY = 'bench-api-key'
+
+class MockState:
+    """
+    Behaviour knobs and counters shared by all request handlers.
+
+    Args:
+        latency (float): Mean server-side delay per request in seconds.
+        jitter (float): Uniform +/- jitter added to the latency, in seconds.
+        error_rate (float): Fraction of API calls answered with 503.
+        token_ttl (float, optional): Seconds an auth token stays valid. None never expires.
+        stream_chunks (int): Number of SSE events in a streamed prompt response.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, token_ttl=None, stream_chunks=20):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_ttl = token_ttl
+        self.stream_chunks = stream_chunks
+        self.tokens = {}
+        self.sessions = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def issue_token(self):
+        token = uuid.uuid4().hex
+        expires = time.monotonic() + self.token_ttl if self.token_ttl else None
+        with self.lock:
+            self.tokens[token] = expires
+        return token
+
+    def token_valid(self, token):
+        with self.lock:
+            if token not in self.tokens:
+                return False
+            expires = self.tokens[token]
+            if expires is not None and time.monotonic() >= expires:
+                del self.tokens[token]
+                return False
+            return True
+
+    def delay(self):
+        seconds = self.latency + random.uniform(-self.jitter, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'StronglyMock/1.0'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _authorized(self):
+        if self.headers.get('X-API-Key') != API_KEY:
+            self._send_json(401, {'error': 'Invalid API key'})
+            return False
+        if not self.state.token_valid(self.headers.get('X-Auth-Token')):
+            self.state.count('unauthorized')
+            self._send_json(401, {'error': 'Invalid or expired token'})
+            return False
+        return True
+
+    def _begin(self):
+        self.state.count(self.path)
+        self.state.delay()
+        if self.path != '/api/v1/authenticate' and random.random() < self.state.error_rate:
+            self.state.count('injected_errors')
+            self._send_json(503, {'error': 'Service Unavailable'}, {'Retry-After': '0'})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._begin():
+            return
+        if self.path == '/api/v1/authenticate':
+            if self.headers.get('X-API-Key') != API_KEY:
+                return self._send_json(401, {'error': 'Invalid API key'})
+            payload = {'authToken': self.state.issue_token()}
+            if self.state.token_ttl:
+                payload['expiresIn'] = self.state.token_ttl
+            return self._send_json(200, payload)
+        if not self._authorized():
+            return
+        if self.path == '/api/v1/models':
+            models = [{'id': str(i), 'name': f'Model {i}'} for i in range(10)]
+            return self._send_json(200, {'message': 'Models retrieved successfully', 'userId': 'bench',
+                                         'models': models})
+        if self.path == '/api/v1/filters':
+            filters = [{'_id': '1', 'name': 'Email', 'description': 'An email address.'}]
+            return self._send_json(200, {'message': 'Applied filters retrieved successfully',
+                                         'userId': 'bench', 'filters': filters}, {'ETag': '"filters-v1"'})
+        if self.path == '/api/v1/tokens':
+            return self._send_json(200, {'isOverLimit': False, 'isRestricted': False, 'userTokenUsage': 0,
+                                         'planTokenLimit': 10 ** 9, 'companyTokensAvailable': 0,
+                                         'purchasedTokens': 0})
+        self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        body = self._read_json()  # always drain the body so keep-alive connections stay usable
+        if not self._begin():
+            return
+        if not self._authorized():
+            return
+        if self.path == '/api/v1/filterText':
+            text = body.get('text', '')
+            count = text.count('@')
+            hash_map = {f'[{i}:email]': 'redacted@example.com' for i in range(count)}
+            return self._send_json(200, {'filteredText': text.replace('@', '[at]'),
+                                         'filterCounts': {'1': count} if count else {}, 'hashMap': hash_map})
+        if self.path == '/api/v1/submitPrompt':
+            answer = [f'token{i} ' for i in range(self.state.stream_chunks)]
+            if body.get('stream'):
+                return self._stream(answer)
+            return self._send_json(200, {'content': ''.join(answer)})
+        if self.path == '/api/v1/session/create':
+            session_id = uuid.uuid4().hex
+            with self.state.lock:
+                self.state.sessions[session_id] = body.get('sessionName')
+            return self._send_json(200, {'message': 'Session created successfully', 'sessionId': session_id})
+        if self.path == '/api/v1/session/delete':
+            with self.state.lock:
+                found = self.state.sessions.pop(body.get('sessionId'), None) is not None
+            if not found:
+                return self._send_json(404, {'error': 'Session not found'})
+            return self._send_json(200, {'message': 'Session deleted successfully'})
+        if self.path == '/api/v1/session/rename':
+            with self.state.lock:
+                if body.get('sessionId') not in self.state.sessions:
+                    return self._send_json(404, {'error': 'Session not found'})
+                self.state.sessions[body['sessionId']] = body.get('newName')
+            return self._send_json(200, {'message': 'Session renamed successfully'})
+        self._send_json(404, {'error': 'Not found'})
+
+    def _stream(self, pieces):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for piece in pieces:
+            self._write_chunk(f'data: {json.dumps({"content": piece})}\n\n'.encode())
+        self._write_chunk(b'data: [DONE]\n\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data):
+        self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+        self.wfile.flush()
+
+class MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # a short listen backlog causes 1s SYN retransmits under fan-out
+
+class MockServer:
+    """
+    Threaded mock Strongly API bound to a local port.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+        **options: Passed to :class:`MockState`.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, **options):
+        self.httpd = MockHTTPServer((host, port), MockHandler)
+        self.httpd.state = MockState(**options)
+        self._thread = None
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def env(self):
+        """Return a ``test_env`` dict pointing a client at this server."""
+        return {'API_HOST': self.url, 'API_KEY': API_KEY}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock Strongly API server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--token-ttl', type=float, default=None)
+    args = parser.parse_args()
+
+    server = MockServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, token_ttl=args.token_ttl)
+    print(f'Mock Strongly API listening on {server.url} (API_KEY={API_KEY})')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == '__main__':
+    main()
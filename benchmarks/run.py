@@ -0,0 +1,212 @@
+"""
+Throughput and latency benchmarks for the strongly client against a local mock server.
+
+Usage::
+
+    python -m benchmarks.run --requests 2000 --threads 32 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from strongly import APIClient
+from .mock_server import MockServer
+
+SESSION = {'sessionId': 'bench-session', 'sessionName': 'Benchmark'}
+TEXT = 'Contact info@strongly.ai or sales@strongly.ai for details. ' * 4
+
+def client_version():
+    try:
+        from importlib.metadata import version
+        return version('strongly')
+    except Exception:
+        return 'unknown'
+
+def summarize(latencies, elapsed, extra=None):
+    latencies = sorted(latencies)
+    count = len(latencies)
+
+    def pct(q):
+        return latencies[min(int(q / 100.0 * count), count - 1)] * 1000 if count else 0.0
+
+    result = {
+        'requests': count,
+        'seconds': round(elapsed, 4),
+        'requests_per_sec': round(count / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(pct(50), 3),
+        'p95_ms': round(pct(95), 3),
+        'p99_ms': round(pct(99), 3),
+    }
+    result.update(extra or {})
+    return result
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def run_measured(work, concurrency, args):
+    """
+    Run ``work(n)`` for timing, then a shorter pass under tracemalloc for memory.
+
+    Tracing allocations slows Python down considerably, so it is kept out of
+    the timed pass.
+    """
+    start = time.perf_counter()
+    latencies = work(args.requests)
+    elapsed = time.perf_counter() - start
+
+    extra = {}
+    if args.memory_requests:
+        tracemalloc.start()
+        try:
+            work(args.memory_requests)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        extra['peak_kib_per_in_flight'] = round(peak / 1024 / max(concurrency, 1), 2)
+    return latencies, elapsed, extra
+
+def bench_sync_sequential(server, args):
+    client = APIClient(test_env=server.env())
+    client.authenticate()
+
+    def work(n):
+        return [timed(lambda: client.filter_text(TEXT)) for _ in range(n)]
+    return summarize(*run_measured(work, 1, args))
+
+def bench_threaded_fanout(server, args):
+    client = APIClient(test_env=server.env(), pool_maxsize=args.threads, pool_block=True)
+    client.authenticate()
+
+    def work(n):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            return list(pool.map(lambda _: timed(lambda: client.filter_text(TEXT)), range(n)))
+    latencies, elapsed, extra = run_measured(work, args.threads, args)
+    extra.update({f'pool_{key}': value for key, value in client.connection_stats().items()})
+    return summarize(latencies, elapsed, extra)
+
+def bench_submit_prompt(server, args):
+    client = APIClient(test_env=server.env(), pool_maxsize=args.threads, pool_block=True)
+    client.authenticate()
+    model = 'bench-model'
+
+    def work(n):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            return list(pool.map(lambda _: timed(lambda: client.submit_prompt(SESSION, TEXT, model)), range(n)))
+    return summarize(*run_measured(work, args.threads, args))
+
+def bench_stream_ttfb(server, args):
+    client = APIClient(test_env=server.env())
+    client.authenticate()
+    first_chunk = []
+
+    def one():
+        start = time.perf_counter()
+        stream = client.stream_prompt(SESSION, TEXT, 'bench-model')
+        next(stream)
+        first_chunk.append(time.perf_counter() - start)
+        for _ in stream:
+            pass
+
+    def work(n):
+        return [timed(one) for _ in range(max(n // 10, 1))]
+    latencies, elapsed, extra = run_measured(work, 1, args)
+    ttfb = sorted(first_chunk)
+    extra['ttfb_p50_ms'] = round(ttfb[len(ttfb) // 2] * 1000, 3)
+    return summarize(latencies, elapsed, extra)
+
+def bench_async_fanout(server, args):
+    try:
+        from strongly import AsyncAPIClient
+        AsyncAPIClient(test_env=server.env())
+    except ImportError:
+        return {'skipped': 'aiohttp is not installed'}
+
+    async def run(n):
+        latencies = []
+        semaphore = asyncio.Semaphore(args.concurrency)
+        async with AsyncAPIClient(test_env=server.env(), max_connections=args.concurrency) as client:
+            await client.authenticate()
+
+            async def one():
+                async with semaphore:
+                    start = time.perf_counter()
+                    await client.filter_text(TEXT)
+                    latencies.append(time.perf_counter() - start)
+            await asyncio.gather(*(one() for _ in range(n)))
+        return latencies
+
+    return summarize(*run_measured(lambda n: asyncio.run(run(n)), args.concurrency, args))
+
+def bench_reauth_storm(server, args):
+    """Expire tokens quickly and count authentications per token rotation under threaded load."""
+    server.state.token_ttl = args.token_ttl
+    try:
+        client = APIClient(test_env=server.env(), pool_maxsize=args.threads, pool_block=True, refresh_margin=0)
+        before = server.state.counts.get('/api/v1/authenticate', 0)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            latencies = list(pool.map(lambda _: timed(lambda: client.get_models()), range(args.requests)))
+        elapsed = time.perf_counter() - start
+        extra = {}
+        auth_calls = server.state.counts.get('/api/v1/authenticate', 0) - before
+        rotations = max(int(elapsed / args.token_ttl) + 1, 1)
+        extra.update({'auth_calls': auth_calls, 'token_rotations': rotations,
+                      'auth_calls_per_rotation': round(auth_calls / rotations, 2),
+                      'unauthorized_responses': server.state.counts.get('unauthorized', 0)})
+        return summarize(latencies, elapsed, extra)
+    finally:
+        server.state.token_ttl = None
+
+SCENARIOS = {
+    'sync_sequential': bench_sync_sequential,
+    'threaded_fanout': bench_threaded_fanout,
+    'submit_prompt_threaded': bench_submit_prompt,
+    'stream_prompt_ttfb': bench_stream_ttfb,
+    'async_fanout': bench_async_fanout,
+    'reauth_storm': bench_reauth_storm,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the strongly client against a local mock server.')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per scenario')
+    parser.add_argument('--threads', type=int, default=16, help='worker threads for threaded scenarios')
+    parser.add_argument('--concurrency', type=int, default=64, help='in-flight requests for async scenarios')
+    parser.add_argument('--latency', type=float, default=0.005, help='mock server latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='mock server latency jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls answered with 503')
+    parser.add_argument('--memory-requests', type=int, default=100,
+                        help='requests in the tracemalloc pass; 0 skips memory measurement')
+    parser.add_argument('--token-ttl', type=float, default=0.5, help='token lifetime for the reauth storm')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='run only these scenarios (repeatable)')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    results = {}
+    with MockServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+        for name in args.scenario or SCENARIOS:
+            results[name] = SCENARIOS[name](server, args)
+            print(f'{name:24s} {json.dumps(results[name])}')
+
+    report = {
+        'client_version': client_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,16 @@ from setuptools import setup, find_packages
 setup(
     name="strongly",
     version="0.1",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     install_requires=[
         "requests",
         "python-dotenv",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson", "msgspec"],
+        "compression": ["zstandard"],
+    },
     author="StronglyAI, Inc.",
     author_email="info@strongly.ai",
     description="A Python client for the Strongly.AI API",
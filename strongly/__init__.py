@@ -1 +1,27 @@
-from .api_client import APIClient
+"""
+Python client for the Strongly.AI API.
+
+The client classes are imported on first access (PEP 562), so ``import
+strongly`` does not pay for ``requests``, ``aiohttp`` or the optional JSON
+backends until they are actually used.
+"""
+
+_LAZY_ATTRIBUTES = {
+    'APIClient': '.api_client',
+    'AsyncAPIClient': '.async_client',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,96 @@
+import socket
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+def keepalive_socket_options(idle=60, interval=10, count=5):
+    """
+    Build urllib3 socket options that enable TCP keep-alive on top of the defaults.
+
+    Args:
+        idle (int): Seconds a connection sits idle before the first probe.
+        interval (int): Seconds between probes.
+        count (int): Failed probes before the connection is dropped.
+
+    Returns:
+        list: Socket options suitable for ``socket_options`` in urllib3 pools.
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, 'TCP_KEEPALIVE'):  # macOS
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+class PoolingAdapter(HTTPAdapter):
+    """
+    HTTP adapter with a tunable connection pool, TCP keep-alive and default timeouts.
+
+    Args:
+        pool_connections (int): Number of per-host pools to keep.
+        pool_maxsize (int): Maximum connections kept open per host.
+        pool_block (bool): Block when a pool is exhausted instead of opening and
+            discarding overflow connections.
+        timeout (float or tuple, optional): Default ``(connect, read)`` timeout for
+            requests that do not set their own.
+        keepalive (bool): Enable TCP keep-alive probes on pooled sockets.
+        max_retries (int): Transport-level retries passed to urllib3.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['timeout', 'socket_options']
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, timeout=None,
+                 keepalive=True, max_retries=0):
+        self.timeout = timeout
+        if keepalive:
+            self.socket_options = keepalive_socket_options()
+        else:
+            self.socket_options = list(HTTPConnection.default_socket_options)
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                         pool_block=pool_block, max_retries=max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault('socket_options', self.socket_options)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs.setdefault('socket_options', self.socket_options)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        return super().send(request, timeout=timeout, **kwargs)
+
+    def connection_stats(self):
+        """
+        Summarize connection reuse across the pools currently held by this adapter.
+
+        The numbers are per live pool: when more than ``pool_connections`` hosts
+        are used, the least recently used pool is closed and its counts are
+        dropped from the totals.
+
+        Returns:
+            dict: ``pools``, ``requests``, ``connections_opened`` and ``connections_reused``.
+        """
+        pools = self.poolmanager.pools
+        requests_made = opened = 0
+        pool_count = 0
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:  # evicted since keys() was taken
+                continue
+            pool_count += 1
+            requests_made += pool.num_requests
+            opened += pool.num_connections
+        return {
+            'pools': pool_count,
+            'requests': requests_made,
+            'connections_opened': opened,
+            'connections_reused': max(requests_made - opened, 0),
+        }
@@ -1,64 +1,696 @@
+import hashlib
 import os
-from dotenv import load_dotenv
-import requests
-from .exceptions import AuthenticationError, APIError
-
-class APIClient:
-    def __init__(self, env_file='.env', test_env=None):
-        if test_env is None:
-            load_dotenv(env_file)
-            self.host = os.getenv('API_HOST')
-            self.api_key = os.getenv('API_KEY')
+import threading
+import time
+from .cache import MemoryCache, ResponseCache
+from .coalesce import RequestCoalescer
+from .filter_cache import FilterCache
+from .prefilter import LocalPrefilter
+from .profiling import Profiler, profiled
+from .balancer import HostBalancer
+from .batch import merge_filter_results, ordered_map, split_text
+from .exceptions import AuthenticationError, APIError, CircuitOpenError
+from .serialization import get_serializer
+from .retry import CircuitBreaker, RetryPolicy, is_idempotent, parse_retry_after
+from .streaming import iter_response_text
+from .tokens import estimate_prompt_tokens
+from .transport import Compression, is_stream, json_text_stream
+
+# Parsed .env files, keyed by absolute path: {path: ((mtime_ns, size), values)}.
+_env_files = {}
+_env_files_lock = threading.Lock()
+
+def read_env_file(env_file):
+    """
+    Parse a .env file, at most once per process unless the file changes.
+
+    Args:
+        env_file (str): Path to the .env file.
+
+    Returns:
+        dict: The variables defined in the file, or an empty dict if it does not exist.
+    """
+    path = os.path.abspath(env_file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _env_files.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    from dotenv import dotenv_values
+
+    values = dotenv_values(path)
+    with _env_files_lock:
+        _env_files[path] = (signature, values)
+    return values
+
+def load_config(env_file='.env', test_env=None, host=None, api_key=None):
+    """
+    Resolve the API host and key from explicit values, a test dict, the environment or a .env file.
+
+    Explicit ``host``/``api_key`` take precedence, then the environment, then
+    the .env file. The file is only read when the environment does not already
+    provide both values.
+
+    Args:
+        env_file (str, optional): Path to the .env file to load. None skips the file.
+        test_env (dict, optional): Explicit values used instead of the environment.
+        host (str, optional): The API host.
+        api_key (str, optional): The API key.
+
+    Returns:
+        tuple: The ``(host, api_key)`` pair.
+
+    Raises:
+        ValueError: If the host or key is missing.
+    """
+    if test_env is not None:
+        host = host or test_env.get('API_HOST')
+        api_key = api_key or test_env.get('API_KEY')
+    elif not host or not api_key:
+        host = host or os.getenv('API_HOST')
+        api_key = api_key or os.getenv('API_KEY')
+        if (not host or not api_key) and env_file:
+            values = read_env_file(env_file)
+            host = host or values.get('API_HOST')
+            api_key = api_key or values.get('API_KEY')
+
+    if not host or not api_key:
+        raise ValueError("API_HOST and API_KEY must be set in the .env file or as environment variables")
+    return host, api_key
+
+def refresh_deadline(lifetime, margin):
+    """
+    Compute when a token should be refreshed proactively.
+
+    The margin is capped at half the lifetime, so a token that lives less than
+    twice the margin is still used for half its life rather than refreshed at once.
+
+    Args:
+        lifetime (float or None): Seconds the token was issued for.
+        margin (float): Seconds before expiry at which to refresh.
+
+    Returns:
+        float or None: Seconds after issue at which to refresh, or None if the lifetime is unknown.
+    """
+    if lifetime is None:
+        return None
+    return lifetime - min(margin, max(lifetime, 0.0) / 2.0)
+
+def token_lifetime(data):
+    """
+    Extract the remaining lifetime of an auth token from an authentication response.
+
+    Accepts a relative TTL (``expiresIn``/``expires_in``/``ttl``, in seconds) or an
+    absolute expiry (``expiresAt``/``expires_at``, as epoch seconds, epoch
+    milliseconds or an ISO 8601 string).
+
+    Args:
+        data (dict): The decoded authentication response.
+
+    Returns:
+        float or None: Seconds until the token expires, or None if the server gave no expiry.
+    """
+    for key in ('expiresIn', 'expires_in', 'ttl'):
+        value = data.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+
+    for key in ('expiresAt', 'expires_at'):
+        value = data.get(key)
+        if isinstance(value, bool) or value is None:
+            continue
+        if isinstance(value, (int, float)):
+            expires_at = value / 1000.0 if value > 1e11 else float(value)
+        elif isinstance(value, str):
+            from datetime import datetime
+
+            try:
+                expires_at = datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                continue
         else:
-            self.host = test_env.get('API_HOST')
-            self.api_key = test_env.get('API_KEY')
+            continue
+        return expires_at - time.time()
+    return None
+
+def build_prompt_payload(session, message, model, filter_counts=None, context_prompts=None):
+    """
+    Validate submitPrompt arguments and build the request body.
+
+    Raises:
+        ValueError: If required parameters are missing or invalid.
+    """
+    if not isinstance(session, dict) or 'sessionId' not in session or 'sessionName' not in session:
+        raise ValueError("session must be a dictionary containing 'sessionId' and 'sessionName'")
+    if not message or not isinstance(message, str):
+        raise ValueError("message must be a non-empty string")
+    if not model or not isinstance(model, str):
+        raise ValueError("model must be a non-empty string")
+
+    return {
+        "session": session,
+        "message": message,
+        "model": model,
+        "filterCounts": filter_counts or {},
+        "contextPrompts": context_prompts or []
+    }
 
-        if not self.host or not self.api_key:
-            raise ValueError("API_HOST and API_KEY must be set in the .env file or as environment variables")
-
-        self.session = requests.Session()
+class APIClient:
+    def __init__(self, env_file='.env', test_env=None, host=None, api_key=None, refresh_margin=30,
+                 pool_connections=10, pool_maxsize=10, pool_block=False, connect_timeout=10,
+                 read_timeout=300, keepalive=True, adapter=None, cache=None, filter_cache=None,
+                 retry_policy=None, circuit_breaker=None, rate_limiter=None, token_budget=None,
+                 instrumentation=None, serializer='auto', typed_responses=False, token_store=None,
+                 coalesce=None, compression=None, prefilter=None, hosts=None, routing='least_outstanding',
+                 hedging=None, profiler=None):
+        self.host, self.api_key = load_config(env_file, test_env, host or (hosts[0] if hosts else None), api_key)
+        # Several hosts may be given as a list or as a comma-separated API_HOST.
+        hosts = list(hosts) if hosts else [h.strip() for h in self.host.split(',') if h.strip()]
+        self.host = hosts[0]
+        self.hosts = hosts
+        # Multi-host routing; each host gets its own auth token through a per-host client.
+        self.balancer = HostBalancer(hosts, routing) if len(hosts) > 1 else None
+        self._host_clients = {}
+        pool_connections = max(pool_connections, len(hosts))
+
+        # The HTTP session (and requests itself) is only created on first use.
+        self._adapter = adapter
+        self._pool_options = {
+            'pool_connections': pool_connections,
+            'pool_maxsize': pool_maxsize,
+            'pool_block': pool_block,
+            'timeout': (connect_timeout, read_timeout),
+            'keepalive': keepalive,
+        }
+        self._session = None
+        self._session_lock = threading.Lock()
+        # Opt-in cache for read-mostly GET endpoints; True selects an in-memory LRU.
+        self.cache = ResponseCache(MemoryCache()) if cache is True else cache or None
+        # Opt-in memo of filterText results keyed by content hash and filter version.
+        self.filter_cache = FilterCache() if filter_cache is True else filter_cache or None
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        # Opt-in breaker shared by every thread using this client; True selects the defaults.
+        self.circuit_breaker = CircuitBreaker() if circuit_breaker is True else circuit_breaker or None
+        # Client-side admission control: a TokenBucket (or FileTokenBucket) and a TokenBudget.
+        self.rate_limiter = rate_limiter
+        self.token_budget = token_budget
+        # Latency histograms, counters and hooks; None keeps the request path free of any bookkeeping.
+        self.instrumentation = instrumentation
+        # JSON backend for request and response bodies (orjson/msgspec when installed).
+        self.serializer = get_serializer(serializer)
+        # Return models from strongly.models instead of dicts where the response shape is known.
+        self.typed_responses = typed_responses
+        # Opt-in local pre-filter that answers filterText for texts no applied filter can match.
+        self.prefilter = LocalPrefilter() if prefilter is True else prefilter or None
+        # Opt-in single-flight deduplication of identical in-flight calls; True selects the defaults.
+        self.coalescer = RequestCoalescer() if coalesce is True else coalesce or None
+        # Opt-in request body compression: True selects gzip, or pass 'zstd' or a Compression.
+        if compression is True or isinstance(compression, str):
+            compression = Compression(compression if isinstance(compression, str) else 'gzip')
+        self.compression = compression or None
+        # Opt-in hedging of slow idempotent requests; True selects the defaults.
+        if hedging is True:
+            from .hedge import Hedging
+
+            hedging = Hedging()
+        self.hedging = hedging or None
+        # Opt-in per-method wall/CPU profile; may also be set or cleared at run time.
+        self.profiler = Profiler() if profiler is True else profiler or None
+        # Optional FileTokenStore so several processes share one auth token.
+        self.token_store = token_store
+        self.refresh_margin = refresh_margin
         self._auth_token = None
+        self._auth_expires_at = None  # time.monotonic() deadline, None if unknown
+        self._auth_refresh_at = None  # time.monotonic() at which to refresh proactively
+        self._auth_lock = threading.Lock()
+
+    @property
+    def session(self):
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+                session = self._session
+        return session
+
+    @session.setter
+    def session(self, value):
+        self._session = value
 
+    @property
+    def adapter(self):
+        if self._adapter is None:
+            self.session  # mounts the default adapter
+        return self._adapter
+
+    def _build_session(self):
+        import requests
+        from .adapters import PoolingAdapter
+
+        if self._adapter is None:
+            self._adapter = PoolingAdapter(**self._pool_options)
+        session = requests.Session()
+        session.mount('https://', self._adapter)
+        session.mount('http://', self._adapter)
+        return session
+
+    @profiled
     def authenticate(self):
         url = f"{self.host}/api/v1/authenticate"
         headers = {'X-API-Key': self.api_key}
 
+        inst = self.instrumentation
+        start = time.perf_counter() if inst is not None else 0.0
         response = self.session.get(url, headers=headers)
+        if inst is not None:
+            inst.observe_phase('auth', time.perf_counter() - start)
 
         if response.status_code != 200:
-            raise AuthenticationError(f"Authentication failed: {response.text}")
+            # The cause carries the status, so callers can tell an outage from bad credentials.
+            raise AuthenticationError(f"Authentication failed: {response.text}") from APIError(
+                f"API call failed: {response.text}", status_code=response.status_code)
 
         data = response.json()
-        self._auth_token = data.get('authToken')
-        if not self._auth_token:
+        token = data.get('authToken')
+        if not token:
             raise AuthenticationError("No session token received from authentication endpoint")
+
+        self._set_token(token, token_lifetime(data))
         return self._auth_token
 
+    def _set_token(self, token, lifetime, issued_at=None):
+        now = time.monotonic()
+        issued_at = now if issued_at is None else issued_at
+        refresh_after = refresh_deadline(lifetime, self.refresh_margin)
+        self._auth_expires_at = issued_at + lifetime if lifetime is not None else None
+        self._auth_refresh_at = issued_at + refresh_after if refresh_after is not None else None
+        self._auth_token = token
+
+    def _token_expiring(self):
+        refresh_at = self._auth_refresh_at
+        return refresh_at is not None and time.monotonic() >= refresh_at
+
+    def _refresh_token(self, stale_token=None):
+        """
+        Authenticate at most once for all threads waiting on a new token.
+
+        Args:
+            stale_token (str, optional): A token the caller saw rejected. It is only
+                replaced if no other thread has refreshed it in the meantime.
+
+        Returns:
+            str: A valid auth token.
+        """
+        token = self._auth_token
+        expires_at = self._auth_expires_at
+        if token and token != stale_token and expires_at is not None and time.monotonic() < expires_at:
+            # Proactive refresh: the current token is still usable, so only one thread
+            # refreshes while the others keep going with the old token.
+            if not self._auth_lock.acquire(blocking=False):
+                return token
+        else:
+            self._auth_lock.acquire()
+
+        try:
+            token = self._auth_token
+            if token and token != stale_token and not self._token_expiring():
+                return token
+            return self._authenticate(stale_token)
+        finally:
+            self._auth_lock.release()
+
+    def _authenticate(self, stale_token=None):
+        store = self.token_store
+        if store is None:
+            return self.authenticate()
+
+        with store.locked():
+            token, expires_at, saved_at = store.load()
+            if token and token != stale_token:
+                now = time.time()
+                saved_at = now if saved_at is None else saved_at
+                lifetime = expires_at - saved_at if expires_at is not None else None
+                refresh_after = refresh_deadline(lifetime, self.refresh_margin)
+                if refresh_after is None or now < saved_at + refresh_after:
+                    # Another process already refreshed the token; adopt it.
+                    self._set_token(token, lifetime, time.monotonic() - (now - saved_at))
+                    return token
+
+            token = self.authenticate()
+            expires_at = self._auth_expires_at
+            store.save(token, time.time() + expires_at - time.monotonic() if expires_at is not None else None)
+            return token
+
     @property
     def auth_token(self):
-        if not self._auth_token:
-            self.authenticate()
-        return self._auth_token
+        token = self._auth_token
+        if token and not self._token_expiring():
+            return token
+        return self._refresh_token()
 
-    def call_api(self, method, endpoint, **kwargs):
+    def connection_stats(self):
+        """
+        Report how often pooled connections were reused versus newly opened.
+
+        Returns:
+            dict: Pool statistics, or an empty dict if the mounted adapter does not track them.
+        """
+        stats = getattr(self.adapter, 'connection_stats', None)
+        return stats() if stats is not None else {}
+
+    def host_stats(self):
+        """
+        Report per-host load, latency and health when several hosts are configured.
+
+        Returns:
+            list: One dict per host, or an empty list for a single host.
+        """
+        return self.balancer.stats() if self.balancer is not None else []
+
+    def _host_client(self, url):
+        client = self._host_clients.get(url)
+        if client is None:
+            session = self.session
+            with self._session_lock:
+                client = self._host_clients.get(url)
+                if client is None:
+                    client = APIClient(env_file=None, host=url, api_key=self.api_key,
+                                       refresh_margin=self.refresh_margin, adapter=self._adapter,
+                                       serializer=self.serializer, instrumentation=self.instrumentation)
+                    client.session = session
+                    self._host_clients[url] = client
+        return client
+
+    def _authenticated_host(self, tried):
+        """
+        Pick a host whose client holds a valid token, failing over like a data call.
+
+        A host whose authentication endpoint is unreachable or answers 5xx is
+        counted as failed and the next one is tried. Rejected credentials are
+        raised at once, as every host would reject them.
+
+        Returns:
+            tuple: The ``HostState`` to release and its per-host client.
+        """
+        from requests import RequestException
+
+        balancer = self.balancer
+        while True:
+            host = balancer.acquire(exclude=tried)
+            client = self._host_client(host.url)
+            start = time.monotonic()
+            try:
+                client.auth_token  # authenticates against this host if needed
+                return host, client
+            except (AuthenticationError, RequestException) as exc:
+                cause = exc.__cause__ if isinstance(exc, AuthenticationError) else None
+                outage = isinstance(exc, RequestException) or (
+                    isinstance(cause, APIError) and (cause.status_code or 0) >= 500)
+                balancer.release(host, time.monotonic() - start, not outage)
+                if not outage:
+                    raise
+                tried.add(host.url)
+                if not balancer.has_alternative(tried):
+                    raise
+
+    def _dispatch(self, method, endpoint, headers, kwargs, tried):
+        balancer = self.balancer
+        if balancer is None:
+            return self._send_once(method, endpoint, headers=headers, **kwargs)
+
+        host, client = self._authenticated_host(tried)
+        start = time.monotonic()
+        ok = retry_elsewhere = False
+        try:
+            response = client._send_once(method, endpoint, headers=headers, **kwargs)
+            ok = response.status_code < 500
+            retry_elsewhere = response.status_code in self.retry_policy.retry_statuses
+            return response
+        finally:
+            balancer.release(host, time.monotonic() - start, ok)
+            if not ok or retry_elsewhere:
+                tried.add(host.url)
+
+    def _hedged_dispatch(self, method, endpoint, headers, kwargs, tried):
+        inst = self.instrumentation
+        span = inst.current_span() if inst is not None else None
+
+        def send():
+            # Runs on a worker thread; keep the caller's span current for phase timings.
+            if span is None:
+                return self._dispatch(method, endpoint, dict(headers), kwargs, tried)
+            with inst.attach(span):
+                return self._dispatch(method, endpoint, dict(headers), kwargs, tried)
+
+        rate_limiter = self.rate_limiter
+        admit = rate_limiter.try_acquire if rate_limiter is not None else None
+        return self.hedging.run(endpoint, send, admit, inst.count if inst is not None else None)
+
+    def _send(self, method, endpoint, **kwargs):
+        """
+        Send a request, retrying transient failures according to the retry policy.
+
+        Returns:
+            requests.Response: The final response, which may still be an error status.
+
+        Raises:
+            APIError: If the request could not be sent at all.
+            CircuitOpenError: If the circuit breaker is open.
+        """
+        from requests import ConnectTimeout, RequestException
+
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        idempotent = is_idempotent(method, endpoint)
+        headers = kwargs.pop('headers', {})
+        if 'json' in kwargs:
+            # Encode once, outside the retry loop.
+            kwargs['data'] = self.serializer.dumps(kwargs.pop('json'))
+            headers.setdefault('Content-Type', 'application/json')
+        body = kwargs.get('data')
+        # Streamed bodies are consumed by the first attempt and cannot be resent.
+        replayable = not is_stream(body)
+        compression = self.compression
+        if compression is not None and body is not None:
+            kwargs['data'], encoding = compression.encode(body)
+            if encoding is not None:
+                headers['Content-Encoding'] = encoding
+        hedged = self.hedging is not None and idempotent and replayable and not kwargs.get('stream')
+        deadline = time.monotonic() + policy.deadline if policy.deadline else None
+        attempt = 0
+        tried = set()  # hosts that failed this request
+
+        while True:
+            attempt += 1
+            # Wait for the rate limiter first, so a throttled attempt never holds the breaker's probe slot.
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(
+                    f"API call failed: circuit open, retry in {breaker.retry_in():.1f}s", status_code=503)
+
+            attempt_kwargs = kwargs
+            if deadline is not None and 'timeout' not in kwargs:
+                attempt_kwargs = dict(kwargs, timeout=max(deadline - time.monotonic(), 0.001))
+
+            try:
+                if hedged:
+                    response = self._hedged_dispatch(method, endpoint, headers, attempt_kwargs, tried)
+                else:
+                    response = self._dispatch(method, endpoint, dict(headers), attempt_kwargs, tried)
+                if response.status_code == 415 and 'Content-Encoding' in headers and replayable:
+                    # The server does not accept compressed bodies: resend as-is and stop compressing.
+                    compression.supported = False
+                    del headers['Content-Encoding']
+                    kwargs['data'] = body
+                    attempt_kwargs = dict(attempt_kwargs, data=body)
+                    response.close()
+                    response = self._dispatch(method, endpoint, dict(headers), attempt_kwargs, tried)
+            except RequestException as exc:
+                if breaker is not None:
+                    breaker.record_failure()
+                # A connect timeout means the request never reached the server.
+                retryable = replayable and policy.can_retry(idempotent, isinstance(exc, ConnectTimeout))
+                delay = policy.backoff(attempt)
+                if (not retryable or attempt >= policy.max_attempts
+                        or (deadline is not None and time.monotonic() + delay >= deadline)):
+                    raise APIError(f"API call failed: {exc}") from exc
+            except BaseException:
+                # Not a verdict on the API's health (e.g. authentication or encoding failed).
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                status = response.status_code
+                if breaker is not None:
+                    if status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if status not in policy.retry_statuses:
+                    return response
+                retryable = replayable and policy.can_retry(idempotent, status == 429)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                delay = policy.backoff(attempt, retry_after)
+                # A server asking for a longer pause than backoff_max gets its answer returned instead.
+                if (not retryable or attempt >= policy.max_attempts
+                        or (retry_after is not None and retry_after > policy.backoff_max)
+                        or (deadline is not None and time.monotonic() + delay >= deadline)):
+                    return response
+                response.close()
+
+            if self.balancer is not None and self.balancer.has_alternative(tried):
+                delay = 0.0  # fail over to another host right away
+            if self.instrumentation is not None:
+                self.instrumentation.count('retries')
+                span = self.instrumentation.current_span()
+                if span is not None:
+                    span.add_event('retry', attempt=attempt, delay=delay)
+            time.sleep(delay)
+
+    def _send_once(self, method, endpoint, **kwargs):
         headers = kwargs.pop('headers', {})
         headers['X-API-Key'] = self.api_key
-        headers['X-Auth-Token'] = self.auth_token
+        token = self.auth_token
+        headers['X-Auth-Token'] = token
 
         url = f"{self.host}{endpoint}"
+        inst = self.instrumentation
+        if inst is None:
+            response = self.session.request(method, url, headers=headers, **kwargs)
+        else:
+            response = self._instrumented_request(inst, method, url, headers, kwargs)
+
+        # Unauthorized, token might have expired; a streamed body cannot be resent.
+        if response.status_code == 401 and not is_stream(kwargs.get('data')):
+            headers['X-Auth-Token'] = self._refresh_token(stale_token=token)  # Re-authenticate once across threads
+            if inst is None:
+                response = self.session.request(method, url, headers=headers, **kwargs)  # Retry the request
+            else:
+                inst.count('reauths')
+                response = self._instrumented_request(inst, method, url, headers, kwargs)
+
+        return response
+
+    def _instrumented_request(self, inst, method, url, headers, kwargs):
+        start = time.perf_counter()
         response = self.session.request(method, url, headers=headers, **kwargs)
+        inst.observe_phase('network', time.perf_counter() - start)
+
+        body = getattr(getattr(response, 'request', None), 'body', None)
+        if isinstance(body, (bytes, str)):
+            inst.count('bytes_sent', len(body))
+        content = getattr(response, '_content', None)
+        if isinstance(content, bytes):
+            inst.count('bytes_received', len(content))
+        span = inst.current_span()
+        if span is not None:
+            span.attributes['http.status_code'] = response.status_code
+        return response
+
+    def _decode(self, response, response_type=None):
+        inst = self.instrumentation
+        start = time.perf_counter() if inst is not None else 0.0
+        if response_type is None:
+            data = self.serializer.loads(response.content)
+        else:
+            from .models import decode
+
+            data = decode(response.content, response_type, self.serializer)
+        if inst is not None:
+            inst.observe_phase('decode', time.perf_counter() - start)
+        return data
 
-        if response.status_code == 401:  # Unauthorized, token might have expired
-            self._auth_token = None  # Clear the token
-            self.authenticate()  # Re-authenticate
-            headers['X-Auth-Token'] = self.auth_token  # Update the token in headers
-            response = self.session.request(method, url, headers=headers, **kwargs)  # Retry the request
+    def _response_type(self, model_name):
+        if not self.typed_responses:
+            return {}
+        from . import models
+
+        return {'response_type': getattr(models, model_name)}
+
+    def _convert(self, data, model_name):
+        response_type = self._response_type(model_name).get('response_type')
+        return data if response_type is None else response_type.from_dict(data)
+
+    def invalidate_cache(self, endpoint=None):
+        """
+        Drop cached responses so the next call goes to the API.
+
+        Args:
+            endpoint (str, optional): Only drop entries for this endpoint, e.g. '/api/v1/models'.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
+
+    def cache_stats(self):
+        """
+        Report response cache hit, miss and revalidation counters.
+
+        Returns:
+            dict: Cache statistics, or an empty dict if caching is disabled.
+        """
+        return self.cache.stats() if self.cache is not None else {}
+
+    def _cached_call(self, method, endpoint, response_type=None, **kwargs):
+        cache = self.cache
+        key = cache.key(endpoint, self.host, self.api_key, kwargs.get('params'))
+        entry = cache.get(key)
+        if entry is not None and entry.fresh:
+            cache.record('hits')
+            if self.instrumentation is not None:
+                self.instrumentation.count('cache_hits')
+            return entry.value if response_type is None else response_type.from_dict(entry.value)
+
+        headers = kwargs.pop('headers', {})
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        response = self._send(method, endpoint, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            cache.record('revalidations')
+            cache.store(key, endpoint, entry.value, entry.etag)
+            return entry.value if response_type is None else response_type.from_dict(entry.value)
+
+        cache.record('misses')
+        if response.status_code != 200:
+            raise APIError(f"API call failed: {response.text}", status_code=response.status_code)
+        data = self._decode(response)
+        cache.store(key, endpoint, data, response.headers.get('ETag'))
+        return data if response_type is None else response_type.from_dict(data)
+
+    @profiled
+    def call_api(self, method, endpoint, **kwargs):
+        coalescer = self.coalescer
+        if coalescer is not None:
+            key = coalescer.key(method, endpoint, kwargs)
+            if key is not None:
+                return coalescer.run(key, lambda: self._observed_call(method, endpoint, kwargs))
+        return self._observed_call(method, endpoint, kwargs)
+
+    def _observed_call(self, method, endpoint, kwargs):
+        if self.instrumentation is None:
+            return self._call_api(method, endpoint, **kwargs)
+        with self.instrumentation.request(method, endpoint):
+            return self._call_api(method, endpoint, **kwargs)
+
+    def _call_api(self, method, endpoint, response_type=None, **kwargs):
+        if self.cache is not None and method == 'GET' and self.cache.ttl_for(endpoint) is not None:
+            return self._cached_call(method, endpoint, response_type, **kwargs)
+
+        response = self._send(method, endpoint, **kwargs)
 
         if response.status_code != 200:
-            raise APIError(f"API call failed: {response.text}")
+            raise APIError(f"API call failed: {response.text}", status_code=response.status_code)
 
-        return response.json()
+        return self._decode(response, response_type)
 
+    @profiled
     def get_applied_filters(self):
         """
         Fetch the applied filters from the API.
@@ -69,8 +701,9 @@ class APIClient:
         Raises:
             APIError: If the API call fails.
         """
-        return self.call_api('GET', '/api/v1/filters')
+        return self.call_api('GET', '/api/v1/filters', **self._response_type('AppliedFilters'))
 
+    @profiled
     def get_models(self):
         """
         Fetch all models from the API.
@@ -81,8 +714,9 @@ class APIClient:
         Raises:
             APIError: If the API call fails.
         """
-        return self.call_api('GET', '/api/v1/models')
+        return self.call_api('GET', '/api/v1/models', **self._response_type('ModelList'))
 
+    @profiled
     def create_session(self, session_name):
         """
         Create a new chat session.
@@ -97,8 +731,9 @@ class APIClient:
             APIError: If the API call fails.
         """
         data = {"sessionName": session_name}
-        return self.call_api('POST', '/api/v1/session/create', json=data)
+        return self.call_api('POST', '/api/v1/session/create', json=data, **self._response_type('SessionResult'))
 
+    @profiled
     def delete_session(self, session_id):
         """
         Delete a chat session.
@@ -115,8 +750,9 @@ class APIClient:
         if not isinstance(session_id, str) or not session_id:
             raise ValueError("session_id must be a non-empty string")
         data = {"sessionId": session_id}
-        return self.call_api('POST', '/api/v1/session/delete', json=data)
+        return self.call_api('POST', '/api/v1/session/delete', json=data, **self._response_type('SessionResult'))
 
+    @profiled
     def rename_session(self, session_id, new_name):
         """
         Rename a chat session.
@@ -138,8 +774,9 @@ class APIClient:
             raise ValueError("new_name must be a non-empty string")
 
         data = {"sessionId": session_id, "newName": new_name}
-        return self.call_api('POST', '/api/v1/session/rename', json=data)
+        return self.call_api('POST', '/api/v1/session/rename', json=data, **self._response_type('SessionResult'))
 
+    @profiled
     def check_token_usage(self):
         """
         Check the token usage for the current user.
@@ -150,14 +787,20 @@ class APIClient:
         Raises:
             APIError: If the API call fails.
         """
-        return self.call_api('GET', '/api/v1/tokens')
+        return self.call_api('GET', '/api/v1/tokens', **self._response_type('TokenUsage'))
 
+    @profiled
     def filter_text(self, text):
         """
         Filter the given text using applicable filters.
 
+        Large documents can be passed as a file-like object or an iterator of
+        ``str``/``bytes`` chunks. The request body is then encoded and sent as
+        it is read, so the document is never held in memory as a whole. Such
+        requests are not retried and bypass the filter cache.
+
         Args:
-            text (str): The text to be filtered.
+            text (str, file or iterator): The text to be filtered.
 
         Returns:
             dict: A dictionary containing the filtered text, filter counts, and hash map.
@@ -166,12 +809,83 @@ class APIClient:
             APIError: If the API call fails.
             ValueError: If text is invalid.
         """
+        if is_stream(text):
+            return self.call_api('POST', '/api/v1/filterText', data=json_text_stream(text),
+                                 headers={'Content-Type': 'application/json'},
+                                 **self._response_type('FilterResult'))
         if not text or not isinstance(text, str):
             raise ValueError("text must be a non-empty string")
 
-        data = {"text": text}
-        return self.call_api('POST', '/api/v1/filterText', json=data)
+        if self.prefilter is not None and not self.prefilter.might_match(
+                text, lambda: self.call_api('GET', '/api/v1/filters')):
+            return self._convert({'filteredText': text, 'filterCounts': {}, 'hashMap': {}}, 'FilterResult')
+
+        if self.filter_cache is None:
+            return self.call_api('POST', '/api/v1/filterText', json={"text": text},
+                                 **self._response_type('FilterResult'))
+
+        namespace = hashlib.sha256(f"{self.host}|{self.api_key}".encode()).hexdigest()[:16]
+        version = self.filter_cache.current_version(lambda: self.call_api('GET', '/api/v1/filters'))
+        key = self.filter_cache.key(text, version, namespace)
+        result = self.filter_cache.get(key)
+        if result is None:
+            result = self.call_api('POST', '/api/v1/filterText', json={"text": text})
+            self.filter_cache.store(key, result)
+        return self._convert(result, 'FilterResult')
+
+    @profiled
+    def filter_texts(self, texts, concurrency=8, max_chars_per_request=100000):
+        """
+        Filter many texts concurrently, yielding results in input order.
+
+        Inputs are consumed lazily and at most ``concurrency`` requests are in
+        flight, so memory stays flat for arbitrarily large corpora. Texts longer
+        than ``max_chars_per_request`` are split at whitespace into pieces that
+        are filtered in parallel and merged back into a single result. A text is
+        never sent in a request larger than the cap, so if two pieces use the
+        same placeholder for different values the clash is raised.
+
+        Args:
+            texts (iterable): The texts to be filtered.
+            concurrency (int): Maximum number of concurrent filterText requests.
+            max_chars_per_request (int, optional): Size cap for a single request. None disables splitting.
+
+        Yields:
+            dict: The filtered text, filter counts, and hash map of each input text.
 
+        Raises:
+            APIError: If an API call fails.
+            ValueError: If a text is invalid, or its pieces' placeholders clash.
+                Such a text needs a larger ``max_chars_per_request``.
+        """
+        def pieces():
+            for text in texts:
+                if not text or not isinstance(text, str):
+                    raise ValueError("text must be a non-empty string")
+                parts = split_text(text, max_chars_per_request)
+                for index, part in enumerate(parts):
+                    yield len(parts) - index - 1, part
+
+        def filter_piece(item):
+            remaining, part = item
+            return remaining, self.filter_text(part)
+
+        group = []
+        for remaining, result in ordered_map(filter_piece, pieces(), concurrency):
+            group.append(result)
+            if remaining == 0:
+                try:
+                    merged = merge_filter_results(group)
+                except ValueError as exc:
+                    raise ValueError(f"{exc}; filter this text with a larger max_chars_per_request") from exc
+                yield self._convert(merged, 'FilterResult') if isinstance(merged, dict) else merged
+                group = []
+
+    def _admit_prompt(self, data):
+        if self.token_budget is not None:
+            self.token_budget.admit(estimate_prompt_tokens(data), lambda: self.call_api('GET', '/api/v1/tokens'))
+
+    @profiled
     def submit_prompt(self, session, message, model, filter_counts=None, context_prompts=None):
         """
         Submit a prompt to the ChatGPT model.
@@ -188,20 +902,54 @@ class APIClient:
 
         Raises:
             APIError: If the API call fails.
+            TokenBudgetExceeded: If a token budget is set and the prompt would exceed it.
             ValueError: If required parameters are missing or invalid.
         """
-        if not isinstance(session, dict) or 'sessionId' not in session or 'sessionName' not in session:
-            raise ValueError("session must be a dictionary containing 'sessionId' and 'sessionName'")
-        if not message or not isinstance(message, str):
-            raise ValueError("message must be a non-empty string")
-        if not model or not isinstance(model, str):
-            raise ValueError("model must be a non-empty string")
-
-        data = {
-            "session": session,
-            "message": message,
-            "model": model,
-            "filterCounts": filter_counts or {},
-            "contextPrompts": context_prompts or []
-        }
-        return self.call_api('POST', '/api/v1/submitPrompt', json=data)
+        data = build_prompt_payload(session, message, model, filter_counts, context_prompts)
+        self._admit_prompt(data)
+        result = self.call_api('POST', '/api/v1/submitPrompt', json=data)
+        self.invalidate_cache('/api/v1/tokens')  # the prompt consumed tokens
+        return result
+
+    @profiled
+    def stream_prompt(self, session, message, model, filter_counts=None, context_prompts=None):
+        """
+        Submit a prompt and stream the model's answer as it is generated.
+
+        The request is sent immediately; the returned iterator yields text
+        fragments as they arrive. Event streams (SSE) and chunked plain-text
+        responses are both supported; a plain JSON response is yielded in one
+        piece.
+
+        Args:
+            session (dict): A dictionary containing 'sessionId' and 'sessionName'.
+            message (str): The prompt message to send.
+            model (str): The name of the model to use.
+            filter_counts (dict, optional): A dictionary of filter counts.
+            context_prompts (list, optional): A list of context prompts.
+
+        Returns:
+            iterator: Text fragments of the response.
+
+        Raises:
+            APIError: If the API call fails.
+            ValueError: If required parameters are missing or invalid.
+        """
+        data = build_prompt_payload(session, message, model, filter_counts, context_prompts)
+        self._admit_prompt(data)
+        data['stream'] = True
+        response = self._send('POST', '/api/v1/submitPrompt', json=data,
+                              headers={'Accept': 'text/event-stream'}, stream=True)
+        if response.status_code != 200:
+            try:
+                raise APIError(f"API call failed: {response.text}", status_code=response.status_code)
+            finally:
+                response.close()
+        return self._stream_text(response)
+
+    def _stream_text(self, response):
+        try:
+            yield from iter_response_text(response)
+        finally:
+            response.close()
+            self.invalidate_cache('/api/v1/tokens')
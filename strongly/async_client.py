@@ -0,0 +1,305 @@
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .api_client import build_prompt_payload, load_config, refresh_deadline, token_lifetime
+from .exceptions import AuthenticationError, APIError
+from .serialization import get_serializer
+from .streaming import aiter_response_text
+
+class AsyncAPIClient:
+    """
+    Asyncio counterpart of :class:`~strongly.APIClient`.
+
+    All requests share a single ``aiohttp.ClientSession`` (and therefore one
+    connection pool), and concurrent callers that hit an expired token share a
+    single re-authentication. Use it as an async context manager, or call
+    :meth:`close` when done.
+    """
+
+    def __init__(self, env_file='.env', test_env=None, host=None, api_key=None, max_connections=100,
+                 max_connections_per_host=0, refresh_margin=30, serializer='auto'):
+        if aiohttp is None:
+            raise ImportError("AsyncAPIClient requires aiohttp; install it with 'pip install strongly[async]'")
+
+        self.host, self.api_key = load_config(env_file, test_env, host, api_key)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.refresh_margin = refresh_margin
+        self.serializer = get_serializer(serializer)
+
+        self._session = None
+        self._auth_token = None
+        self._auth_refresh_at = None  # time.monotonic() at which to refresh proactively
+        self._auth_lock = None
+
+    @property
+    def session(self):
+        # The session must be created from within a running event loop.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @session.setter
+    def session(self, value):
+        self._session = value
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def authenticate(self):
+        url = f"{self.host}/api/v1/authenticate"
+        headers = {'X-API-Key': self.api_key}
+
+        async with self.session.get(url, headers=headers) as response:
+            if response.status != 200:
+                raise AuthenticationError(f"Authentication failed: {await response.text()}")
+            data = await response.json()
+
+        token = data.get('authToken')
+        if not token:
+            raise AuthenticationError("No session token received from authentication endpoint")
+
+        refresh_after = refresh_deadline(token_lifetime(data), self.refresh_margin)
+        self._auth_refresh_at = time.monotonic() + refresh_after if refresh_after is not None else None
+        self._auth_token = token
+        return self._auth_token
+
+    def _token_expiring(self):
+        refresh_at = self._auth_refresh_at
+        return refresh_at is not None and time.monotonic() >= refresh_at
+
+    async def get_auth_token(self, stale_token=None):
+        """
+        Return a valid auth token, authenticating at most once for concurrent callers.
+
+        Args:
+            stale_token (str, optional): A token the caller knows to be rejected. It is only
+                replaced if no other coroutine has refreshed it in the meantime.
+
+        Returns:
+            str: The current auth token.
+        """
+        if self._auth_token and self._auth_token != stale_token and not self._token_expiring():
+            return self._auth_token
+
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if not self._auth_token or self._auth_token == stale_token or self._token_expiring():
+                await self.authenticate()
+            return self._auth_token
+
+    async def call_api(self, method, endpoint, **kwargs):
+        headers = kwargs.pop('headers', {})
+        if 'json' in kwargs:
+            kwargs['data'] = self.serializer.dumps(kwargs.pop('json'))
+            headers.setdefault('Content-Type', 'application/json')
+        headers['X-API-Key'] = self.api_key
+        token = await self.get_auth_token()
+        headers['X-Auth-Token'] = token
+
+        url = f"{self.host}{endpoint}"
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            status = response.status
+            if status == 200:
+                return self.serializer.loads(await response.read())
+            if status != 401:
+                raise APIError(f"API call failed: {await response.text()}", status_code=response.status)
+
+        # Unauthorized, token might have expired; only the first caller re-authenticates.
+        headers['X-Auth-Token'] = await self.get_auth_token(stale_token=token)
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            if response.status != 200:
+                raise APIError(f"API call failed: {await response.text()}", status_code=response.status)
+            return self.serializer.loads(await response.read())
+
+    async def get_applied_filters(self):
+        """
+        Fetch the applied filters from the API.
+
+        Returns:
+            dict: A dictionary containing the applied filters and other response data.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        return await self.call_api('GET', '/api/v1/filters')
+
+    async def get_models(self):
+        """
+        Fetch all models from the API.
+
+        Returns:
+            dict: A dictionary containing the models and other response data.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        return await self.call_api('GET', '/api/v1/models')
+
+    async def create_session(self, session_name):
+        """
+        Create a new chat session.
+
+        Args:
+            session_name (str): The name of the session to create.
+
+        Returns:
+            dict: A dictionary containing the session ID and other response data.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        data = {"sessionName": session_name}
+        return await self.call_api('POST', '/api/v1/session/create', json=data)
+
+    async def delete_session(self, session_id):
+        """
+        Delete a chat session.
+
+        Args:
+            session_id (str): The _id of the session to delete.
+
+        Returns:
+            dict: A dictionary containing response data.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        if not isinstance(session_id, str) or not session_id:
+            raise ValueError("session_id must be a non-empty string")
+        data = {"sessionId": session_id}
+        return await self.call_api('POST', '/api/v1/session/delete', json=data)
+
+    async def rename_session(self, session_id, new_name):
+        """
+        Rename a chat session.
+
+        Args:
+            session_id (str): The ID of the session to rename.
+            new_name (str): The new name for the session.
+
+        Returns:
+            dict: A dictionary containing response data.
+
+        Raises:
+            APIError: If the API call fails or if a session with the new name already exists.
+            ValueError: If session_id or new_name is invalid.
+        """
+        if not session_id or not isinstance(session_id, str):
+            raise ValueError("session_id must be a non-empty string")
+        if not new_name or not isinstance(new_name, str):
+            raise ValueError("new_name must be a non-empty string")
+
+        data = {"sessionId": session_id, "newName": new_name}
+        return await self.call_api('POST', '/api/v1/session/rename', json=data)
+
+    async def check_token_usage(self):
+        """
+        Check the token usage for the current user.
+
+        Returns:
+            dict: A dictionary containing token usage information.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        return await self.call_api('GET', '/api/v1/tokens')
+
+    async def filter_text(self, text):
+        """
+        Filter the given text using applicable filters.
+
+        Args:
+            text (str): The text to be filtered.
+
+        Returns:
+            dict: A dictionary containing the filtered text, filter counts, and hash map.
+
+        Raises:
+            APIError: If the API call fails.
+            ValueError: If text is invalid.
+        """
+        if not text or not isinstance(text, str):
+            raise ValueError("text must be a non-empty string")
+
+        data = {"text": text}
+        return await self.call_api('POST', '/api/v1/filterText', json=data)
+
+    async def submit_prompt(self, session, message, model, filter_counts=None, context_prompts=None):
+        """
+        Submit a prompt to the ChatGPT model.
+
+        Args:
+            session (dict): A dictionary containing 'sessionId' and 'sessionName'.
+            message (str): The prompt message to send.
+            model (str): The name of the model to use.
+            filter_counts (dict, optional): A dictionary of filter counts.
+            context_prompts (list, optional): A list of context prompts.
+
+        Returns:
+            dict: The response from the ChatGPT model.
+
+        Raises:
+            APIError: If the API call fails.
+            ValueError: If required parameters are missing or invalid.
+        """
+        data = build_prompt_payload(session, message, model, filter_counts, context_prompts)
+        return await self.call_api('POST', '/api/v1/submitPrompt', json=data)
+
+    async def stream_prompt(self, session, message, model, filter_counts=None, context_prompts=None):
+        """
+        Submit a prompt and stream the model's answer as it is generated.
+
+        This is an async generator: arguments are validated and the request is
+        sent when iteration starts.
+
+        Args:
+            session (dict): A dictionary containing 'sessionId' and 'sessionName'.
+            message (str): The prompt message to send.
+            model (str): The name of the model to use.
+            filter_counts (dict, optional): A dictionary of filter counts.
+            context_prompts (list, optional): A list of context prompts.
+
+        Yields:
+            str: Text fragments of the response.
+
+        Raises:
+            APIError: If the API call fails.
+            ValueError: If required parameters are missing or invalid.
+        """
+        data = build_prompt_payload(session, message, model, filter_counts, context_prompts)
+        data['stream'] = True
+        url = f"{self.host}/api/v1/submitPrompt"
+        body = self.serializer.dumps(data)
+        token = await self.get_auth_token()
+
+        for attempt in range(2):
+            headers = {'Accept': 'text/event-stream', 'Content-Type': 'application/json',
+                       'X-API-Key': self.api_key, 'X-Auth-Token': token}
+            async with self.session.post(url, headers=headers, data=body) as response:
+                if response.status == 401 and attempt == 0:
+                    token = await self.get_auth_token(stale_token=token)
+                    continue
+                if response.status != 200:
+                    raise APIError(f"API call failed: {await response.text()}", status_code=response.status)
+                async for text in aiter_response_text(response):
+                    yield text
+                return
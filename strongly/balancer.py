@@ -0,0 +1,149 @@
+import random
+import threading
+import time
+
+STRATEGIES = ('least_outstanding', 'latency')
+
+class HostState:
+    """
+    Routing and health state of one API host.
+    """
+
+    __slots__ = ('url', 'outstanding', 'latency', 'health', 'failures', 'ejections',
+                 'ejected_until', 'probing', 'requests', 'errors')
+
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.latency = None  # EWMA of response time in seconds
+        self.health = 1.0  # EWMA of the success rate
+        self.failures = 0  # consecutive failures
+        self.ejections = 0  # consecutive ejections, for backoff
+        self.ejected_until = None
+        self.probing = False
+        self.requests = 0
+        self.errors = 0
+
+    def to_dict(self):
+        return {
+            'host': self.url,
+            'outstanding': self.outstanding,
+            'latency': self.latency,
+            'health': self.health,
+            'ejected': self.ejected_until is not None,
+            'requests': self.requests,
+            'errors': self.errors,
+        }
+
+class HostBalancer:
+    """
+    Spread requests over several API hosts and route around failing ones.
+
+    A host is ejected after ``failure_threshold`` consecutive failures (transport
+    errors or 5xx responses). Once its ejection time has passed it is probed:
+    a single request at a time is let through, and the first success brings
+    the host back. Another failure ejects it again, for twice as long, up to
+    ``max_ejection_time``. If every host is ejected, the one due back first is used.
+
+    Args:
+        hosts (list): Base URLs of the hosts.
+        strategy (str): 'least_outstanding' sends each request to the host with
+            the fewest requests in flight. 'latency' weighs that count by the
+            host's recent response time and success rate.
+        failure_threshold (int): Consecutive failures that eject a host.
+        ejection_time (float): Seconds a host stays out after its first ejection.
+        max_ejection_time (float): Cap on the ejection time.
+        latency_alpha (float): Weight of the newest sample in the latency and health averages.
+    """
+
+    def __init__(self, hosts, strategy='least_outstanding', failure_threshold=3, ejection_time=10.0,
+                 max_ejection_time=300.0, latency_alpha=0.2):
+        if not hosts:
+            raise ValueError("at least one host is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of: {', '.join(STRATEGIES)}")
+        self.hosts = [HostState(url) for url in hosts]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.latency_alpha = latency_alpha
+        self._lock = threading.Lock()
+
+    def _score(self, host):
+        if self.strategy == 'least_outstanding':
+            return host.outstanding
+        # Unmeasured hosts score zero so they get sampled.
+        return (host.latency or 0.0) * (host.outstanding + 1) / max(host.health, 0.05)
+
+    def acquire(self, exclude=()):
+        """
+        Pick the host for the next request and count it as outstanding.
+
+        Args:
+            exclude (collection): URLs of hosts to avoid, e.g. ones that just failed
+                this request. Ignored if no other host is available.
+
+        Returns:
+            HostState: The chosen host. Pass it to :meth:`release` when done.
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = []
+            for host in self.hosts:
+                if host.ejected_until is not None:
+                    if now < host.ejected_until or host.probing:
+                        continue
+                available.append(host)
+            preferred = [host for host in available if host.url not in exclude] or available
+            if preferred:
+                best = min(self._score(host) for host in preferred)
+                host = random.choice([host for host in preferred if self._score(host) == best])
+            else:
+                host = min(self.hosts, key=lambda h: (h.url in exclude, h.ejected_until))
+            if host.ejected_until is not None:
+                host.probing = True
+            host.outstanding += 1
+            host.requests += 1
+            return host
+
+    def has_alternative(self, exclude):
+        """Tell whether a host outside ``exclude`` is currently available."""
+        now = time.monotonic()
+        with self._lock:
+            return any(host.url not in exclude and (host.ejected_until is None or
+                                                    (now >= host.ejected_until and not host.probing))
+                       for host in self.hosts)
+
+    def release(self, host, elapsed, ok):
+        """
+        Record the outcome of a request sent to ``host``.
+
+        Args:
+            host (HostState): The host returned by :meth:`acquire`.
+            elapsed (float): Seconds the request took.
+            ok (bool): False for transport errors and 5xx responses.
+        """
+        alpha = self.latency_alpha
+        with self._lock:
+            host.outstanding -= 1
+            host.health += alpha * ((1.0 if ok else 0.0) - host.health)
+            if ok:
+                host.latency = elapsed if host.latency is None else host.latency + alpha * (elapsed - host.latency)
+                host.failures = 0
+                host.ejections = 0
+                host.ejected_until = None
+                host.probing = False
+                return
+            host.errors += 1
+            host.failures += 1
+            if host.probing or host.failures >= self.failure_threshold:
+                host.ejections += 1
+                backoff = min(self.ejection_time * 2 ** (host.ejections - 1), self.max_ejection_time)
+                host.ejected_until = time.monotonic() + backoff
+                host.probing = False
+                host.failures = 0
+
+    def stats(self):
+        with self._lock:
+            return [host.to_dict() for host in self.hosts]
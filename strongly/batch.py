@@ -0,0 +1,126 @@
+from collections import deque
+
+# Preferred places to split, best first: paragraphs, lines, then sentences.
+_BOUNDARIES = ('\n\n', '\n', '. ', '! ', '? ')
+_WHITESPACE = ' \t\r\n'
+
+def _cut(text, start, end):
+    """Return the index just past the best boundary for a piece starting at ``start``."""
+    # Only look for structural boundaries in the second half, so pieces stay large.
+    half = start + (end - start) // 2
+    for boundary in _BOUNDARIES:
+        cut = text.rfind(boundary, half, end)
+        if cut != -1:
+            return cut + len(boundary)
+    cut = max(text.rfind(char, start, end) for char in _WHITESPACE)
+    if cut > start:
+        return cut + 1
+    # A single run longer than the limit is kept whole, up to the next whitespace.
+    ends = [text.find(char, end) for char in _WHITESPACE]
+    ends = [index for index in ends if index != -1]
+    return min(ends) + 1 if ends else len(text)
+
+def split_text(text, max_chars):
+    """
+    Split text into pieces of at most ``max_chars`` characters.
+
+    Pieces end at a paragraph, line or sentence boundary in the second half of
+    the limit, else at the last whitespace, so a word, email address or number
+    is never cut in two. A piece is only longer than ``max_chars`` when a single
+    run without whitespace is. Joining the pieces gives back the original text.
+
+    Args:
+        text (str): The text to split.
+        max_chars (int): Maximum size of each piece.
+
+    Returns:
+        list: The pieces, in order.
+    """
+    if max_chars is None or len(text) <= max_chars:
+        return [text]
+    if max_chars < 1:
+        raise ValueError("max_chars must be a positive integer")
+
+    pieces = []
+    start = 0
+    length = len(text)
+    while length - start > max_chars:
+        cut = _cut(text, start, start + max_chars)
+        pieces.append(text[start:cut])
+        start = cut
+    if start < length:
+        pieces.append(text[start:])
+    return pieces
+
+def merge_filter_results(results):
+    """
+    Combine the filterText responses of a document's pieces into one result.
+
+    Filtered texts are concatenated, filter counts are summed and hash maps are
+    merged.
+
+    Args:
+        results (list): The per-piece responses (dicts or typed models), in order.
+
+    Returns:
+        dict: A single result with 'filteredText', 'filterCounts' and 'hashMap'.
+
+    Raises:
+        ValueError: If two pieces use the same placeholder for different values.
+            Each piece is filtered on its own, so placeholders can clash, and
+            the merged text could not tell them apart.
+    """
+    if len(results) == 1:
+        return results[0]
+    results = [r.to_dict() if hasattr(r, 'to_dict') else r for r in results]
+
+    filtered = []
+    counts = {}
+    hash_map = {}
+    for result in results:
+        filtered.append(result.get('filteredText', ''))
+        for key, count in (result.get('filterCounts') or {}).items():
+            counts[key] = counts.get(key, 0) + count
+        for key, value in (result.get('hashMap') or {}).items():
+            if hash_map.setdefault(key, value) != value:
+                raise ValueError(f"placeholder {key!r} stands for different values in different pieces")
+    return {'filteredText': ''.join(filtered), 'filterCounts': counts, 'hashMap': hash_map}
+
+def ordered_map(func, iterable, concurrency=8, executor=None):
+    """
+    Apply ``func`` to each item on a thread pool and yield results in input order.
+
+    At most ``concurrency`` calls are in flight at once and the input is consumed
+    lazily, so memory stays bounded for arbitrarily long iterables.
+
+    Args:
+        func (callable): Function applied to each item.
+        iterable (iterable): The inputs.
+        concurrency (int): Maximum number of concurrent calls.
+        executor (Executor, optional): Executor to submit to. A private one is
+            created and shut down if omitted.
+
+    Yields:
+        The result of ``func`` for each item. Exceptions are raised in order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+
+    own_executor = executor is None
+    if own_executor:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending = deque()
+    try:
+        for item in iterable:
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
@@ -0,0 +1,198 @@
+"""
+Bulk ``submit_prompt`` across a pool of worker processes.
+
+Each worker process builds its own pooled :class:`~strongly.APIClient` and
+runs several requests at once on a small thread pool. Workers share one auth
+token through a :class:`~strongly.token_store.FileTokenStore` and, when a rate
+is given, one :class:`~strongly.ratelimit.FileTokenBucket`. Results are
+appended to a JSONL file as chunks finish, and that file doubles as the
+checkpoint: re-running the same jobs against the same output skips every job
+that already has a result.
+"""
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from .api_client import APIClient
+
+# Per-process client and thread pool, created by _init_worker.
+_worker = None
+
+def _init_worker(client_options, state_dir, rate, burst, threads):
+    from .ratelimit import FileTokenBucket
+    from .token_store import FileTokenStore
+
+    global _worker
+    options = dict(client_options)
+    options.setdefault('token_store', FileTokenStore(os.path.join(state_dir, 'auth-token')))
+    if rate is not None:
+        options.setdefault('rate_limiter', FileTokenBucket(os.path.join(state_dir, 'rate-limit'), rate, burst))
+    options.setdefault('pool_maxsize', threads)
+    _worker = (APIClient(**options), ThreadPoolExecutor(max_workers=threads))
+
+def _run_job(job):
+    job_id, spec = job
+    client = _worker[0]
+    try:
+        result = client.submit_prompt(
+            spec.get('session'),
+            spec.get('message'),
+            spec.get('model'),
+            filter_counts=spec.get('filter_counts', spec.get('filterCounts')),
+            context_prompts=spec.get('context_prompts', spec.get('contextPrompts')),
+        )
+    except Exception as exc:
+        return {'id': job_id, 'error': str(exc), 'error_type': type(exc).__name__,
+                'status_code': getattr(exc, 'status_code', None)}
+    if hasattr(result, 'to_dict'):
+        result = result.to_dict()
+    return {'id': job_id, 'result': result}
+
+def _run_chunk(chunk):
+    return list(_worker[1].map(_run_job, chunk))
+
+def read_jobs(path):
+    """
+    Yield jobs from a JSONL file, one JSON object per line. Blank lines are skipped.
+
+    Args:
+        path (str): Path of the JSONL file.
+
+    Yields:
+        dict: Each job.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def completed_jobs(path):
+    """
+    Collect the ids of jobs that already have a successful result in an output file.
+
+    A line left half-written by a crash is truncated away so that appending
+    can resume cleanly.
+
+    Args:
+        path (str): Path of the output JSONL file.
+
+    Returns:
+        set: Ids of completed jobs. Empty if the file does not exist.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb+') as f:
+        good = 0
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b'\n'):
+                break
+            good += len(line)
+            if 'result' in record:
+                done.add(record['id'])
+        f.truncate(good)
+    return done
+
+class BulkExecutor:
+    """
+    Run many ``submit_prompt`` jobs across a pool of worker processes.
+
+    Jobs are dicts with ``session``, ``message`` and ``model`` and optionally
+    ``filter_counts``/``filterCounts``, ``context_prompts``/``contextPrompts``
+    and an ``id``. Jobs without an id are numbered by their position in the
+    input, so resuming requires feeding the same input in the same order.
+
+    Each output line is ``{"id": ..., "result": ...}`` or, for a failed job,
+    ``{"id": ..., "error": ..., "error_type": ..., "status_code": ...}``.
+    Failed jobs are retried on the next run, so an id may appear more than
+    once and the last line for an id wins.
+
+    Args:
+        workers (int, optional): Worker processes. Defaults to the CPU count.
+        threads_per_worker (int): Concurrent requests inside each worker.
+        chunk_size (int): Jobs handed to a worker at a time; results are written
+            per finished chunk.
+        client_options (dict, optional): Keyword arguments for each worker's
+            ``APIClient``. Must be picklable, e.g.
+            ``{'env_file': None, 'host': ..., 'api_key': ...}``.
+        rate (float, optional): Requests per second shared by all workers.
+        burst (float, optional): Burst size of the shared rate limit.
+        state_dir (str, optional): Directory for the shared token and rate-limit
+            files. A private temporary directory is used and removed if omitted.
+    """
+
+    def __init__(self, workers=None, threads_per_worker=4, chunk_size=16, client_options=None,
+                 rate=None, burst=None, state_dir=None):
+        if threads_per_worker < 1 or chunk_size < 1:
+            raise ValueError("threads_per_worker and chunk_size must be positive integers")
+        self.workers = workers or os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker
+        self.chunk_size = chunk_size
+        self.client_options = dict(client_options or {})
+        self.rate = rate
+        self.burst = burst
+        self.state_dir = state_dir
+
+    def _chunks(self, jobs, skip, stats):
+        if isinstance(jobs, (str, os.PathLike)):
+            jobs = read_jobs(jobs)
+        chunk = []
+        for index, spec in enumerate(jobs):
+            job_id = spec.get('id', index)
+            if job_id in skip:
+                stats['skipped'] += 1
+                continue
+            chunk.append((job_id, spec))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, jobs, output):
+        """
+        Submit every job and append the results to ``output``.
+
+        Args:
+            jobs (iterable or str): Job dicts, or the path of a JSONL file of jobs.
+            output (str): Path of the output JSONL file, also used as the checkpoint.
+
+        Returns:
+            dict: Counts of ``submitted``, ``succeeded``, ``failed`` and ``skipped`` jobs.
+        """
+        stats = {'submitted': 0, 'succeeded': 0, 'failed': 0, 'skipped': 0}
+        done = completed_jobs(output)
+        state_dir = self.state_dir or tempfile.mkdtemp(prefix='strongly-bulk-')
+        initargs = (self.client_options, state_dir, self.rate, self.burst, self.threads_per_worker)
+        try:
+            with open(output, 'a', encoding='utf-8') as out, \
+                    ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+                pending = set()
+                for chunk in self._chunks(jobs, done, stats):
+                    # Keep two chunks queued per worker; the input is read lazily.
+                    if len(pending) >= self.workers * 2:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self._write(out, finished, stats)
+                    pending.add(pool.submit(_run_chunk, chunk))
+                    stats['submitted'] += len(chunk)
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    self._write(out, finished, stats)
+        finally:
+            if self.state_dir is None:
+                shutil.rmtree(state_dir, ignore_errors=True)
+        return stats
+
+    @staticmethod
+    def _write(out, futures, stats):
+        for future in futures:
+            for record in future.result():
+                stats['succeeded' if 'result' in record else 'failed'] += 1
+                out.write(json.dumps(record) + '\n')
+        out.flush()
+        os.fsync(out.fileno())
@@ -0,0 +1,211 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTLS = {
+    '/api/v1/models': 300,
+    '/api/v1/filters': 60,
+    '/api/v1/tokens': 10,
+}
+
+class CacheEntry:
+    __slots__ = ('value', 'etag', 'expires_at')
+
+    def __init__(self, value, etag=None, expires_at=0.0):
+        self.value = value
+        self.etag = etag
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+class MemoryCache:
+    """
+    Thread-safe in-memory LRU cache backend.
+
+    Args:
+        max_entries (int): Maximum number of entries kept before the least
+            recently used one is evicted.
+    """
+
+    def __init__(self, max_entries=1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        # Hand out a copy so callers mutating a response cannot corrupt the cache.
+        return CacheEntry(copy.deepcopy(entry.value), entry.etag, entry.expires_at)
+
+    def set(self, key, entry):
+        entry = CacheEntry(copy.deepcopy(entry.value), entry.etag, entry.expires_at)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix=None):
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteCache:
+    """
+    On-disk cache backend shared by every process on the host that uses the same file.
+
+    Values must be JSON-serializable. Each thread (and each forked process)
+    opens its own connection; the database runs in WAL mode so readers do not
+    block writers.
+
+    Args:
+        path (str): Path to the sqlite database file.
+        max_entries (int): Maximum number of entries kept before the least
+            recently used ones are evicted. Eviction runs every ``EVICT_EVERY``
+            writes, so the table may briefly exceed the limit.
+    """
+
+    EVICT_EVERY = 64
+
+    def __init__(self, path, max_entries=10000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            import sqlite3
+
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute('SELECT value, etag, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key, entry):
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, etag, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+            (key, json.dumps(entry.value), entry.etag, entry.expires_at, time.time()),
+        )
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0 or self.max_entries < self.EVICT_EVERY:
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self, prefix=None):
+        conn = self._connection()
+        if prefix is None:
+            conn.execute('DELETE FROM cache')
+        else:
+            conn.execute('DELETE FROM cache WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+class ResponseCache:
+    """
+    Per-endpoint TTL cache for read-mostly GET endpoints.
+
+    Entries that carry an ETag are kept after they expire so the next request
+    can revalidate them with ``If-None-Match`` instead of downloading the body
+    again.
+
+    Args:
+        backend (MemoryCache or SQLiteCache, optional): Where entries are stored.
+            Defaults to a ``MemoryCache``.
+        ttls (dict, optional): Seconds to cache each endpoint for. Endpoints not
+            listed are never cached. Defaults to ``DEFAULT_TTLS``.
+    """
+
+    def __init__(self, backend=None, ttls=None):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint)
+
+    @staticmethod
+    def key(endpoint, host, api_key, params=None):
+        # Keyed by API key so a shared on-disk cache never leaks data between accounts.
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        suffix = json.dumps(params, sort_keys=True, default=str) if params else ''
+        return f"{endpoint}|{host}|{key_hash}|{suffix}"
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def store(self, key, endpoint, value, etag=None):
+        self.backend.set(key, CacheEntry(value, etag, time.time() + self.ttls[endpoint]))
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def invalidate(self, endpoint=None):
+        """
+        Drop cached responses.
+
+        Args:
+            endpoint (str, optional): Only drop entries for this endpoint.
+        """
+        self.backend.clear(None if endpoint is None else f"{endpoint}|")
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'entries': len(self.backend),
+        }
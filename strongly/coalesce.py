@@ -0,0 +1,103 @@
+import copy
+import hashlib
+import json
+import threading
+from .retry import PURE_ENDPOINTS
+
+COALESCED_METHODS = frozenset({'GET', 'HEAD'})
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+class RequestCoalescer:
+    """
+    Single-flight deduplication of identical in-flight API calls.
+
+    While a call is in flight, identical calls from other threads wait for it
+    and share its result instead of going over the wire themselves. Calls are
+    identical when their method, endpoint and arguments (including the JSON
+    body) hash the same. Each waiter gets its own copy of the result, so
+    callers cannot affect one another by mutating it.
+
+    Only GET/HEAD calls are coalesced, plus POSTs to endpoints known to be
+    free of side effects.
+
+    Args:
+        post_endpoints (iterable): POST endpoints that may be coalesced.
+            Defaults to ``PURE_ENDPOINTS`` (``/api/v1/filterText``). Pass an
+            empty tuple to coalesce GETs only.
+    """
+
+    def __init__(self, post_endpoints=PURE_ENDPOINTS):
+        self.post_endpoints = frozenset(post_endpoints)
+        self.leaders = 0
+        self.followers = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def key(self, method, endpoint, kwargs):
+        """
+        Build the deduplication key of a call.
+
+        Returns:
+            str or None: The key, or None if the call must not be coalesced.
+        """
+        method = method.upper()
+        if method not in COALESCED_METHODS and not (method == 'POST' and endpoint in self.post_endpoints):
+            return None
+        if kwargs.get('stream'):
+            return None
+        material = json.dumps([method, endpoint, kwargs], sort_keys=True, separators=(',', ':'), default=repr)
+        return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+    def run(self, key, func):
+        """
+        Run ``func`` unless an identical call is in flight, in which case wait for its result.
+
+        Args:
+            key (str): The deduplication key from :meth:`key`.
+            func (callable): Performs the call.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            Exception: Whatever the shared call raised.
+        """
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.leaders += 1
+            else:
+                call.waiters += 1
+                self.followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.event.set()
+        # Once the call is out of the in-flight table nobody else can join it;
+        # without waiters the result is not shared and needs no copy.
+        return copy.deepcopy(call.result) if call.waiters else call.result
+
+    def stats(self):
+        return {'leaders': self.leaders, 'followers': self.followers, 'in_flight': len(self._inflight)}
@@ -0,0 +1,118 @@
+from collections import deque
+from .streaming import payload_text
+from .tokens import estimate_tokens
+
+class Conversation:
+    """
+    Chat history for one session that sends only the context that fits a token budget.
+
+    Turns are kept in a ring buffer of at most ``max_turns`` entries, each
+    stored with its token estimate computed once when it is added. Each call
+    sends the newest turns whose combined estimate fits ``max_context_tokens``,
+    as ``{'role', 'content'}`` context prompts, after any pinned prompts. Payload
+    size and per-turn work therefore stay bounded however long the chat runs.
+
+    A conversation is not thread-safe; use one per chat.
+
+    Args:
+        client (APIClient): The client used to submit prompts.
+        session (dict): A dictionary containing 'sessionId' and 'sessionName'.
+        model (str): The default model.
+        max_context_tokens (int): Estimated token budget for the context sent with each prompt.
+        max_turns (int): Number of turns kept in history; older turns are dropped.
+        pinned (list, optional): Context prompts always sent first, e.g. a system
+            prompt; they count against ``max_context_tokens``.
+    """
+
+    def __init__(self, client, session, model, max_context_tokens=4000, max_turns=200, pinned=None):
+        if max_context_tokens < 0 or max_turns < 1:
+            raise ValueError("max_context_tokens must not be negative and max_turns must be positive")
+        self.client = client
+        self.session = session
+        self.model = model
+        self.max_context_tokens = max_context_tokens
+        self.pinned = list(pinned or [])
+        self._pinned_tokens = sum(estimate_tokens(prompt.get('content', '')) for prompt in self.pinned)
+        self._turns = deque(maxlen=max_turns)  # (role, content, estimated tokens)
+
+    def __len__(self):
+        return len(self._turns)
+
+    @property
+    def history(self):
+        """All retained turns as ``{'role', 'content'}`` dicts, oldest first."""
+        return [{'role': role, 'content': content} for role, content, _ in self._turns]
+
+    def add(self, role, content):
+        """
+        Append a turn to the history without sending anything.
+
+        Args:
+            role (str): 'user', 'assistant' or another role understood by the model.
+            content (str): The text of the turn.
+        """
+        self._turns.append((role, content, estimate_tokens(content)))
+
+    def clear(self):
+        self._turns.clear()
+
+    def context_window(self, max_tokens=None):
+        """
+        Build the context prompts for the next call.
+
+        Args:
+            max_tokens (int, optional): Token budget. Defaults to ``max_context_tokens``.
+
+        Returns:
+            list: Pinned prompts followed by the newest turns that fit the budget, oldest first.
+        """
+        budget = (self.max_context_tokens if max_tokens is None else max_tokens) - self._pinned_tokens
+        window = []
+        for role, content, tokens in reversed(self._turns):
+            if tokens > budget:
+                break
+            budget -= tokens
+            window.append({'role': role, 'content': content})
+        window.reverse()
+        return self.pinned + window
+
+    def send(self, message, model=None, filter_counts=None):
+        """
+        Submit a message with the current context window and record both sides of the turn.
+
+        Args:
+            message (str): The prompt message.
+            model (str, optional): Overrides the default model for this call.
+            filter_counts (dict, optional): A dictionary of filter counts.
+
+        Returns:
+            dict: The response from the model.
+
+        Raises:
+            APIError: If the API call fails. Nothing is recorded in that case.
+            ValueError: If the message is invalid.
+        """
+        result = self.client.submit_prompt(self.session, message, model or self.model,
+                                           filter_counts, self.context_window())
+        self.add('user', message)
+        reply = payload_text(result.to_dict() if hasattr(result, 'to_dict') else result)
+        if reply:
+            self.add('assistant', reply)
+        return result
+
+    def stream(self, message, model=None, filter_counts=None):
+        """
+        Like :meth:`send`, but yield the reply as it is generated.
+
+        The turn is recorded once the stream has been read to the end.
+
+        Yields:
+            str: Text fragments of the reply.
+        """
+        fragments = []
+        for fragment in self.client.stream_prompt(self.session, message, model or self.model,
+                                                  filter_counts, self.context_window()):
+            fragments.append(fragment)
+            yield fragment
+        self.add('user', message)
+        self.add('assistant', ''.join(fragments))
@@ -2,4 +2,15 @@ class AuthenticationError(Exception):
     pass
 
 class APIError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class CircuitOpenError(APIError):
+    pass
+
+class RateLimitExceeded(APIError):
+    pass
+
+class TokenBudgetExceeded(APIError):
     pass
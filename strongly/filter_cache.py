@@ -0,0 +1,89 @@
+import hashlib
+import json
+import threading
+import time
+from .cache import CacheEntry, MemoryCache
+
+class FilterCache:
+    """
+    Content-addressed memo of filterText results.
+
+    Results are keyed on a hash of the text plus a version derived from the
+    applied filters, so a change to the filter configuration naturally misses
+    every old entry. The filter version is re-checked at most once every
+    ``version_ttl`` seconds.
+
+    Args:
+        backend (MemoryCache or SQLiteCache, optional): Where results are stored.
+            Defaults to a ``MemoryCache`` of 10000 entries; pass a
+            ``SQLiteCache`` to persist results across runs and processes.
+        version_ttl (float): Seconds between applied-filter version checks.
+    """
+
+    def __init__(self, backend=None, version_ttl=60):
+        self.backend = backend if backend is not None else MemoryCache(max_entries=10000)
+        self.version_ttl = version_ttl
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._version_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version_of(filters_response):
+        """
+        Compute a stable version string for an applied-filters response.
+
+        Args:
+            filters_response (dict): The response of ``get_applied_filters``.
+
+        Returns:
+            str: A short digest of the filter configuration.
+        """
+        filters = filters_response.get('filters', filters_response)
+        encoded = json.dumps(filters, sort_keys=True, separators=(',', ':'), default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+    def current_version(self, fetch_filters):
+        """
+        Return the filter version, refreshing it through ``fetch_filters`` when stale.
+
+        Args:
+            fetch_filters (callable): Returns the applied-filters response.
+
+        Returns:
+            str: The current filter version.
+        """
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at < self.version_ttl:
+            return self._version
+        with self._lock:
+            if self._version is None or time.monotonic() - self._version_checked_at >= self.version_ttl:
+                self._version = self.version_of(fetch_filters())
+                self._version_checked_at = time.monotonic()
+            return self._version
+
+    def key(self, text, version, namespace=''):
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{namespace}|{version}|{digest}"
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry.value
+
+    def store(self, key, result):
+        self.backend.set(key, CacheEntry(result))
+
+    def invalidate(self):
+        """Forget the current filter version and drop every memoized result."""
+        with self._lock:
+            self._version = None
+        self.backend.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.backend), 'version': self._version}
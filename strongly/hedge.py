@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import deque
+
+MAX_CREDIT = 10.0  # hedges that may be saved up for a burst of slow responses
+
+class Hedging:
+    """
+    Request hedging for ``APIClient(hedging=...)``.
+
+    When a response to an idempotent request has not arrived after the
+    ``percentile`` of that endpoint's recent latencies, a duplicate is sent. It
+    goes through the same pool, so it uses another connection (or another host
+    when several are configured). The first usable answer wins. The loser is
+    cancelled if it has not started yet; otherwise its response is closed when
+    it arrives, which returns the connection to the pool.
+
+    Each hedgeable request earns ``budget`` hedge credits and each hedge spends
+    one, so hedges add at most ``budget`` extra load (5% by default) plus a
+    small burst allowance. Endpoints are only hedged once ``min_samples``
+    latencies have been seen. Until then, and whenever all ``max_workers``
+    threads are busy, requests run unhedged on the calling thread.
+
+    Args:
+        percentile (float): Recent-latency percentile, 0-100, after which a duplicate is sent.
+        budget (float): Maximum hedges as a fraction of hedgeable requests.
+        min_delay (float): Lower bound on the hedge delay in seconds.
+        window (int): Number of recent latencies kept per endpoint.
+        min_samples (int): Latencies needed on an endpoint before it is hedged.
+        max_workers (int): Threads that run hedged requests.
+    """
+
+    def __init__(self, percentile=95, budget=0.05, min_delay=0.005, window=512, min_samples=20, max_workers=32):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if budget < 0:
+            raise ValueError("budget must not be negative")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = max(min_samples, 1)
+        self.max_workers = max_workers
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.denied = 0
+        self._credit = 0.0
+        self._samples = {}  # endpoint -> deque of recent latencies
+        self._observed = {}  # endpoint -> total samples observed
+        self._delays = {}  # endpoint -> (delay, samples observed when it was computed)
+        self._busy = 0  # workers running a request
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def delay(self, endpoint):
+        """
+        Return the hedge delay for ``endpoint``, or None if it has too few samples.
+
+        The percentile is recomputed every 16 samples rather than on every call.
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            cached = self._delays.get(endpoint)
+            observed = self._observed[endpoint]
+            if cached is not None and observed - cached[1] < 16:
+                return cached[0]
+            ordered = sorted(samples)
+            delay = max(ordered[int(self.percentile / 100.0 * (len(ordered) - 1))], self.min_delay)
+            self._delays[endpoint] = (delay, observed)
+            return delay
+
+    def observe(self, endpoint, seconds):
+        """Record the latency of a successful response."""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._observed[endpoint] = self._observed.get(endpoint, 0) + 1
+
+    def _take_credit(self, admit):
+        with self._lock:
+            if self._credit < 1.0:
+                self.denied += 1
+                return False
+            self._credit -= 1.0
+        # admit() takes the rate limiter's lock; never call it while holding ours.
+        if admit is None or admit():
+            return True
+        self._refund()
+        return False
+
+    def _refund(self):
+        with self._lock:
+            self._credit = min(self._credit + 1.0, MAX_CREDIT)
+            self.denied += 1
+
+    def _submit(self, send):
+        """
+        Start ``send`` on an idle worker.
+
+        Returns:
+            tuple or None: ``(future, started)``, where the ``started`` event is set
+            once the request is being sent, or None if every worker is busy.
+        """
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return None
+            self._busy += 1
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='strongly-hedge')
+        started = threading.Event()
+
+        def task():
+            started.set()
+            return send()
+
+        future = self._executor.submit(task)
+        # Also runs when a hedge is cancelled before it starts.
+        future.add_done_callback(self._release_worker)
+        return future, started
+
+    def _release_worker(self, future):
+        with self._lock:
+            self._busy -= 1
+
+    def _send_directly(self, endpoint, send):
+        start = time.monotonic()
+        response = send()
+        if response.status_code < 500:
+            self.observe(endpoint, time.monotonic() - start)
+        return response
+
+    def run(self, endpoint, send, admit=None, count=None):
+        """
+        Send a request, hedging it if it is slow.
+
+        The request only goes to a worker thread when one is idle, so it never
+        queues behind other requests; otherwise it is sent unhedged on the
+        calling thread. The hedge delay is measured from when it is sent.
+
+        Args:
+            endpoint (str): The endpoint, used to pick the latency window.
+            send (callable): Sends the request once and returns the response.
+                Called from worker threads, possibly twice at the same time.
+            admit (callable, optional): Returns False to refuse a hedge, e.g.
+                when the client-side rate limit has no token left.
+            count (callable, optional): Called with 'hedges' when a hedge is sent
+                and 'hedge_wins' when it answers first, e.g. ``Instrumentation.count``.
+
+        Returns:
+            requests.Response: The first usable response.
+        """
+        with self._lock:
+            self.requests += 1
+            self._credit = min(self._credit + self.budget, MAX_CREDIT)
+        delay = self.delay(endpoint)
+        submitted = self._submit(send) if delay is not None else None
+        if submitted is None:
+            return self._send_directly(endpoint, send)
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        primary, started = submitted
+        started.wait()
+        start = time.monotonic()
+        wait((primary,), timeout=delay)
+        hedged = None
+        if not primary.done() and self._take_credit(admit):
+            hedged = self._submit(send)
+            if hedged is None:
+                self._refund()
+        if hedged is None:
+            response = primary.result()
+            if response.status_code < 500:
+                self.observe(endpoint, time.monotonic() - start)
+            return response
+
+        hedge = hedged[0]
+        with self._lock:
+            self.fired += 1
+        if count is not None:
+            count('hedges')
+        pending = {primary, hedge}
+        winner = None
+        while winner is None and pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if winner is None and future.exception() is None and future.result().status_code < 500:
+                    winner = future
+        if winner is None:
+            # Both failed: report the primary's outcome, as an unhedged request would.
+            if hedge.exception() is None:
+                hedge.result().close()
+            return primary.result()
+
+        elapsed = time.monotonic() - start
+        for future in (primary, hedge):
+            if future is not winner:
+                _cancel(future)
+        self.observe(endpoint, elapsed)
+        if winner is hedge:
+            with self._lock:
+                self.won += 1
+            if count is not None:
+                count('hedge_wins')
+        return winner.result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'fired': self.fired,
+                'won': self.won,
+                'denied': self.denied,
+                'delays': {endpoint: delay for endpoint, (delay, _) in self._delays.items()},
+            }
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def _cancel(future):
+    """Stop a losing request, or release its connection once it completes."""
+    if not future.cancel():
+        future.add_done_callback(_close_response)
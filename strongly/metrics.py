@@ -0,0 +1,304 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+COUNTERS = ('requests', 'errors', 'retries', 'reauths', 'bytes_sent', 'bytes_received', 'cache_hits',
+            'hedges', 'hedge_wins')
+
+class LatencyHistogram:
+    """
+    Thread-safe fixed-bucket latency histogram.
+
+    Args:
+        buckets (tuple): Upper bounds of the buckets in seconds, ascending. An
+            implicit +Inf bucket is added.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q):
+        """
+        Estimate a percentile by linear interpolation inside its bucket.
+
+        Args:
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            float: The estimated latency in seconds, or 0.0 if nothing was observed.
+        """
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            largest = self.max
+        if not total:
+            return 0.0
+        rank = q / 100.0 * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else largest
+                upper = min(upper, largest)
+                return lower + (upper - lower) * max(rank - seen, 0) / bucket_count
+            seen += bucket_count
+        return largest
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+class RequestSpan:
+    """
+    Timing and attributes of one API call, shaped like an OpenTelemetry span.
+    """
+
+    __slots__ = ('name', 'method', 'endpoint', 'trace_id', 'span_id', 'start_time_unix_nano',
+                 'end_time_unix_nano', 'duration', 'phases', 'attributes', 'events', 'error', '_start')
+
+    def __init__(self, method, endpoint):
+        self.name = f"{method} {endpoint}"
+        self.method = method
+        self.endpoint = endpoint
+        self.trace_id = os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano = None
+        self.duration = None
+        self.phases = {}
+        self.attributes = {'http.method': method, 'http.route': endpoint}
+        self.events = []
+        self.error = None
+        self._start = time.perf_counter()
+
+    def add_event(self, name, **attributes):
+        self.events.append({'name': name, 'time_unix_nano': time.time_ns(), 'attributes': attributes})
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'start_time_unix_nano': self.start_time_unix_nano,
+            'end_time_unix_nano': self.end_time_unix_nano,
+            'attributes': dict(self.attributes, **{f'strongly.phase.{k}': v for k, v in self.phases.items()}),
+            'events': list(self.events),
+            'status': {'code': 'ERROR' if self.error else 'OK',
+                       'message': str(self.error) if self.error else ''},
+        }
+
+class Instrumentation:
+    """
+    Per-endpoint latency histograms, counters and request hooks for ``APIClient``.
+
+    Attach an instance with ``APIClient(instrumentation=...)``. Each call is
+    recorded as a :class:`RequestSpan`. Its total latency and phases ('auth',
+    'network', 'decode') feed per-endpoint histograms.
+
+    Args:
+        buckets (tuple): Histogram bucket bounds in seconds.
+        span_exporter (callable, optional): Called with each finished span.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, span_exporter=None):
+        self.buckets = buckets
+        self.span_exporter = span_exporter
+        self.pre_request_hooks = []
+        self.post_request_hooks = []
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_pre_request_hook(self, hook):
+        """Register ``hook(span)``, called before each API call."""
+        self.pre_request_hooks.append(hook)
+
+    def add_post_request_hook(self, hook):
+        """Register ``hook(span)``, called after each API call, successful or not."""
+        self.post_request_hooks.append(hook)
+
+    def histogram(self, endpoint, phase='total'):
+        key = (endpoint, phase)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(self.buckets))
+        return histogram
+
+    def current_span(self):
+        return getattr(self._local, 'span', None)
+
+    @contextmanager
+    def attach(self, span):
+        """Make ``span`` current on this thread, e.g. for work handed off to a worker thread."""
+        parent = self.current_span()
+        self._local.span = span
+        try:
+            yield span
+        finally:
+            self._local.span = parent
+
+    @contextmanager
+    def request(self, method, endpoint):
+        """
+        Record one API call.
+
+        A call made while another is in progress on the same thread gets its
+        own span, ``requests`` count and latency sample. The outer span becomes
+        current again when it finishes.
+        """
+        parent = self.current_span()
+        span = RequestSpan(method, endpoint)
+        self._local.span = span
+        for hook in self.pre_request_hooks:
+            hook(span)
+        try:
+            yield span
+        except Exception as exc:
+            span.error = exc
+            self.count('errors')
+            raise
+        finally:
+            self._local.span = parent
+            span.duration = time.perf_counter() - span._start
+            span.end_time_unix_nano = time.time_ns()
+            self.count('requests', span=span)
+            self.histogram(endpoint).observe(span.duration)
+            for hook in self.post_request_hooks:
+                hook(span)
+            if self.span_exporter is not None:
+                self.span_exporter(span)
+
+    def observe_phase(self, phase, seconds):
+        span = self.current_span()
+        if span is None:
+            return
+        span.phases[phase] = span.phases.get(phase, 0.0) + seconds
+        self.histogram(span.endpoint, phase).observe(seconds)
+
+    def count(self, name, value=1, span=None):
+        span = span or self.current_span()
+        endpoint = span.endpoint if span is not None else ''
+        key = (name, endpoint)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        if span is not None and name not in ('requests', 'errors'):
+            attribute = f'strongly.{name}'
+            span.attributes[attribute] = span.attributes.get(attribute, 0) + value
+
+    def counter(self, name, endpoint=None):
+        """
+        Read a counter, summed over all endpoints unless ``endpoint`` is given.
+        """
+        with self._lock:
+            return sum(v for (n, e), v in self._counters.items()
+                       if n == name and (endpoint is None or e == endpoint))
+
+    def percentiles(self, endpoint, phase='total'):
+        """
+        Return p50/p95/p99 latency in seconds for an endpoint and phase.
+        """
+        return self.histogram(endpoint, phase).summary()
+
+    def snapshot(self):
+        """
+        Return every counter and histogram summary as a plain dict.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+        return {
+            'counters': {f'{name}:{endpoint}': value for (name, endpoint), value in sorted(counters.items())},
+            'latency': {f'{endpoint}:{phase}': h.summary() for (endpoint, phase), h in sorted(histograms.items())},
+        }
+
+    def to_prometheus(self, prefix='strongly_client'):
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        lines = []
+        # Known counters first, then any other counter that has been recorded.
+        names = COUNTERS + tuple(sorted({n for (n, _), _ in counters} - set(COUNTERS)))
+        for name in names:
+            series = [(endpoint, value) for (n, endpoint), value in counters if n == name]
+            if not series:
+                continue
+            metric = f'{prefix}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            for endpoint, value in series:
+                lines.append(f'{metric}{{endpoint="{endpoint}"}} {value}')
+
+        if histograms:
+            metric = f'{prefix}_request_duration_seconds'
+            lines.append(f'# TYPE {metric} histogram')
+            for (endpoint, phase), histogram in histograms:
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                with histogram._lock:
+                    counts = list(histogram.counts)
+                    total, total_sum = histogram.count, histogram.sum
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{labels}}} {total_sum}')
+                lines.append(f'{metric}_count{{{labels}}} {total}')
+        return '\n'.join(lines) + '\n'
+
+class OpenTelemetryExporter:
+    """
+    Span exporter that replays finished spans into an OpenTelemetry tracer.
+
+    Requires ``opentelemetry-api``.
+
+    Args:
+        tracer (opentelemetry.trace.Tracer, optional): Defaults to the global tracer for 'strongly'.
+    """
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer('strongly')
+
+    def __call__(self, span):
+        data = span.to_dict()
+        otel_span = self.tracer.start_span(data['name'], start_time=data['start_time_unix_nano'],
+                                           attributes=data['attributes'])
+        for event in data['events']:
+            otel_span.add_event(event['name'], attributes=event['attributes'],
+                                timestamp=event['time_unix_nano'])
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        otel_span.end(end_time=data['end_time_unix_nano'])
@@ -0,0 +1,160 @@
+"""
+Typed response models.
+
+With ``msgspec`` installed the models are ``msgspec.Struct`` types and JSON is
+decoded straight from bytes into them without building intermediate dicts.
+Otherwise they are plain ``__slots__`` classes filled from the decoded dict.
+Either way they expose the same snake_case attributes plus ``from_dict`` and
+``to_dict``.
+"""
+import typing
+from .exceptions import APIError
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+def _define(name, fields, doc):
+    """
+    Build a model class.
+
+    Args:
+        name (str): Class name.
+        fields (list): ``(attribute, json_key, type, default)`` tuples. A default
+            of ``list`` or ``dict`` means an empty container.
+        doc (str): Class docstring.
+    """
+    if msgspec is not None:
+        specs = []
+        for attr, _, type_, default in fields:
+            if default in (list, dict):
+                # A container may be null in a response, as the fallback accepts.
+                specs.append((attr, typing.Optional[type_], msgspec.field(default_factory=default)))
+            else:
+                specs.append((attr, type_, default))
+        namespace = {
+            '__doc__': doc,
+            '_fields': fields,
+            'from_dict': classmethod(lambda cls, data: msgspec.convert(data, cls)),
+            'to_dict': lambda self: msgspec.to_builtins(self),
+        }
+        return msgspec.defstruct(name, specs, rename={attr: key for attr, key, _, _ in fields},
+                                 module=__name__, namespace=namespace)
+
+    def __init__(self, **kwargs):
+        for attr, _, _, default in fields:
+            value = kwargs.get(attr, default)
+            setattr(self, attr, value() if value in (list, dict) else value)
+
+    def from_dict(cls, data):
+        kwargs = {}
+        for attr, key, type_, _ in fields:
+            if key not in data:
+                continue
+            value = data[key]
+            item_type = typing.get_args(type_)[0] if typing.get_origin(type_) is list else None
+            if item_type is not None and hasattr(item_type, 'from_dict') and isinstance(value, list):
+                value = [item_type.from_dict(item) for item in value]
+            kwargs[attr] = value
+        return cls(**kwargs)
+
+    def to_dict(self):
+        result = {}
+        for attr, key, _, _ in fields:
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                value = [item.to_dict() if hasattr(item, 'to_dict') else item for item in value]
+            result[key] = value
+        return result
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(
+            getattr(self, attr) == getattr(other, attr) for attr, _, _, _ in fields)
+
+    def __repr__(self):
+        args = ', '.join(f'{attr}={getattr(self, attr)!r}' for attr, _, _, _ in fields)
+        return f'{name}({args})'
+
+    return type(name, (), {
+        '__doc__': doc,
+        '_fields': fields,
+        '__slots__': tuple(attr for attr, _, _, _ in fields),
+        '__module__': __name__,
+        '__init__': __init__,
+        'from_dict': classmethod(from_dict),
+        'to_dict': to_dict,
+        '__eq__': __eq__,
+        '__hash__': None,
+        '__repr__': __repr__,
+    })
+
+Any = typing.Any
+
+Model = _define('Model', [
+    ('id', 'id', Any, None),
+    ('name', 'name', Any, None),
+], "A model available to the account.")
+
+ModelList = _define('ModelList', [
+    ('models', 'models', typing.List[Model], list),
+    ('user_id', 'userId', Any, None),
+    ('message', 'message', Any, None),
+], "Response of ``get_models``.")
+
+AppliedFilter = _define('AppliedFilter', [
+    ('id', '_id', Any, None),
+    ('name', 'name', Any, None),
+    ('description', 'description', Any, None),
+], "A filter applied to the account.")
+
+AppliedFilters = _define('AppliedFilters', [
+    ('filters', 'filters', typing.List[AppliedFilter], list),
+    ('user_id', 'userId', Any, None),
+    ('message', 'message', Any, None),
+], "Response of ``get_applied_filters``.")
+
+SessionResult = _define('SessionResult', [
+    ('session_id', 'sessionId', Any, None),
+    ('message', 'message', Any, None),
+], "Response of the session create, delete and rename calls.")
+
+TokenUsage = _define('TokenUsage', [
+    ('is_over_limit', 'isOverLimit', Any, None),
+    ('is_restricted', 'isRestricted', Any, None),
+    ('user_token_usage', 'userTokenUsage', Any, None),
+    ('plan_token_limit', 'planTokenLimit', Any, None),
+    ('company_tokens_available', 'companyTokensAvailable', Any, None),
+    ('purchased_tokens', 'purchasedTokens', Any, None),
+], "Response of ``check_token_usage``.")
+
+FilterResult = _define('FilterResult', [
+    ('filtered_text', 'filteredText', Any, None),
+    ('filter_counts', 'filterCounts', typing.Dict[str, Any], dict),
+    ('hash_map', 'hashMap', typing.Dict[str, Any], dict),
+], "Response of ``filter_text``.")
+
+def convert(data, cls):
+    """
+    Convert an already-decoded response dict into a model.
+    """
+    return cls.from_dict(data)
+
+def decode(data, cls, serializer):
+    """
+    Decode raw JSON bytes into a model.
+
+    Args:
+        data (bytes): The response body.
+        cls (type): The model class.
+        serializer (object): Fallback serializer used when msgspec is unavailable.
+
+    Raises:
+        APIError: If msgspec is used and the body does not fit the model.
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data, type=cls)
+        except msgspec.ValidationError as exc:
+            raise APIError(f"API call failed: unexpected {cls.__name__} response: {exc}") from exc
+    return cls.from_dict(serializer.loads(data))
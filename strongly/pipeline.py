@@ -0,0 +1,209 @@
+import queue
+import threading
+from collections import deque
+
+_DONE = object()
+
+class _Message:
+    __slots__ = ('seq', 'key', 'session', 'message', 'model', 'context_prompts',
+                 'filtered', 'filter_done', 'response', 'error')
+
+    def __init__(self, seq, item, default_model):
+        if isinstance(item, dict):
+            session, message = item['session'], item['message']
+            model = item.get('model') or default_model
+            context_prompts = item.get('context_prompts')
+        else:
+            session, message = item
+            model, context_prompts = default_model, None
+        self.seq = seq
+        self.key = session.get('sessionId') if isinstance(session, dict) else session
+        self.session = session
+        self.message = message
+        self.model = model
+        self.context_prompts = context_prompts
+        self.filtered = None
+        self.filter_done = False
+        self.response = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'session': self.session,
+            'message': self.message,
+            'filtered': self.filtered,
+            'response': self.response,
+            'error': self.error,
+        }
+
+class Pipeline:
+    """
+    Filter messages and submit them as prompts with both stages overlapping.
+
+    Each message goes through ``filter_text`` and then ``submit_prompt`` with
+    the filtered text and its filter counts. Both stages run at the same time
+    on their own thread pools. While one message is at the model, the next
+    ones are already being filtered, so throughput approaches that of the
+    slower stage rather than the sum of both.
+
+    Prompts for the same session are submitted one at a time, in input order.
+    Prompts for different sessions run in parallel. Results are yielded in
+    input order. At most ``max_pending`` messages are between the input and
+    the output at once, so a slow consumer or a slow stage holds back reading
+    of the input instead of buffering it.
+
+    Args:
+        client (APIClient): The client used for both stages.
+        model (str): The default model.
+        filter_concurrency (int): Maximum concurrent ``filter_text`` calls.
+        prompt_concurrency (int): Maximum concurrent ``submit_prompt`` calls.
+        max_pending (int): Maximum messages in the pipeline.
+    """
+
+    def __init__(self, client, model, filter_concurrency=4, prompt_concurrency=4, max_pending=32):
+        if min(filter_concurrency, prompt_concurrency, max_pending) < 1:
+            raise ValueError("concurrency limits and max_pending must be positive integers")
+        self.client = client
+        self.model = model
+        self.filter_concurrency = filter_concurrency
+        self.prompt_concurrency = prompt_concurrency
+        self.max_pending = max_pending
+
+    def run(self, messages):
+        """
+        Run messages through the pipeline.
+
+        Args:
+            messages (iterable): ``(session, message)`` tuples, or dicts with 'session',
+                'message' and optionally 'model' and 'context_prompts'. Read lazily.
+
+        Yields:
+            dict: ``{'session', 'message', 'filtered', 'response', 'error'}`` per message,
+            in input order. If filtering fails, the prompt is not sent and 'error'
+            holds the exception; the session's later messages still go through.
+
+        Raises:
+            Exception: Whatever reading ``messages`` raised, after the messages read before it.
+        """
+        return _PipelineRun(self).results(messages)
+
+class _PipelineRun:
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.client = pipeline.client
+        self.slots = threading.Semaphore(pipeline.max_pending)
+        self.filter_queue = queue.Queue(pipeline.max_pending)
+        # Bounded by the slots: a message only reaches it after taking one.
+        self.prompt_queue = queue.Queue()
+        self.ready = threading.Condition()
+        self.finished = {}  # seq -> _Message
+        self.waiting = {}  # session key -> deque of messages not yet prompted, in input order
+        self.busy = set()  # session keys with a prompt in flight
+        self.total = None
+        self.error = None
+        self.stopped = False
+
+    def results(self, messages):
+        threads = [threading.Thread(target=self._feed, args=(messages,), daemon=True)]
+        threads += [threading.Thread(target=self._filter, daemon=True)
+                    for _ in range(self.pipeline.filter_concurrency)]
+        threads += [threading.Thread(target=self._prompt, daemon=True)
+                    for _ in range(self.pipeline.prompt_concurrency)]
+        for thread in threads:
+            thread.start()
+
+        seq = 0
+        try:
+            while True:
+                with self.ready:
+                    while seq not in self.finished and (self.total is None or seq < self.total):
+                        self.ready.wait()
+                    message = self.finished.pop(seq, None)
+                if message is None:
+                    break
+                self.slots.release()
+                yield message.to_dict()
+                seq += 1
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.stopped = True
+            for _ in range(self.pipeline.max_pending):
+                self.slots.release()  # unblock the feeder if the caller stopped early
+            for _ in range(self.pipeline.prompt_concurrency):
+                self.prompt_queue.put(_DONE)
+
+    def _feed(self, messages):
+        count = 0
+        try:
+            for item in messages:
+                self.slots.acquire()
+                if self.stopped:
+                    break
+                message = _Message(count, item, self.pipeline.model)
+                with self.ready:
+                    self.waiting.setdefault(message.key, deque()).append(message)
+                count += 1
+                self.filter_queue.put(message)
+        except Exception as exc:
+            self.error = exc
+        finally:
+            with self.ready:
+                self.total = count
+                self.ready.notify_all()
+            for _ in range(self.pipeline.filter_concurrency):
+                self.filter_queue.put(_DONE)
+
+    def _filter(self):
+        while True:
+            message = self.filter_queue.get()
+            if message is _DONE:
+                return
+            if not self.stopped:
+                try:
+                    filtered = self.client.filter_text(message.message)
+                    message.filtered = filtered.to_dict() if hasattr(filtered, 'to_dict') else filtered
+                except Exception as exc:
+                    message.error = exc
+            with self.ready:
+                message.filter_done = True
+                self._advance(message.key)
+
+    def _prompt(self):
+        while True:
+            message = self.prompt_queue.get()
+            if message is _DONE:
+                return
+            if not self.stopped:
+                filtered = message.filtered or {}
+                try:
+                    message.response = self.client.submit_prompt(
+                        message.session, filtered.get('filteredText', message.message), message.model,
+                        filtered.get('filterCounts') or {}, message.context_prompts)
+                except Exception as exc:
+                    message.error = exc
+            with self.ready:
+                self.waiting[message.key].popleft()
+                self.busy.discard(message.key)
+                self._finish(message)
+                self._advance(message.key)
+
+    def _advance(self, key):
+        # Called with the lock held: hand the session's next message to the prompt stage.
+        pending = self.waiting.get(key)
+        if key in self.busy or pending is None:
+            return
+        while pending and pending[0].filter_done:
+            message = pending[0]
+            if message.error is None:
+                self.busy.add(key)
+                self.prompt_queue.put(message)
+                return
+            pending.popleft()
+            self._finish(message)
+        if not pending:
+            del self.waiting[key]
+
+    def _finish(self, message):
+        self.finished[message.seq] = message
+        self.ready.notify_all()
@@ -0,0 +1,196 @@
+import re
+import threading
+import time
+from .filter_cache import FilterCache
+
+PATTERN_KEYS = ('regex', 'pattern', 'patterns', 'regexPattern')
+KEYWORD_KEYS = ('keywords', 'terms', 'words')
+
+# Patterns without flags of their own are matched more loosely than any flags
+# the server may use: case-insensitive, ^/$ at every line and '.' across
+# newlines. A superset of the server's matches keeps the pre-filter free of
+# false negatives. Classes such as \w and \d are ASCII-only, as in JavaScript.
+MATCH_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.ASCII
+
+# JavaScript flags that change what a pattern matches; g, y, d and u do not here.
+_JS_FLAGS = 'ims'
+
+_JS_LITERAL = re.compile(r'^/(.*)/([a-z]*)$', re.DOTALL)
+
+# Negated classes, lookarounds and word boundaries match more when the rest of
+# the pattern is loosened, so their matches are no longer a superset.
+_NOT_CHECKABLE = re.compile(r'\[\^|\(\?<?[=!]|\\[BbDSW]')
+
+def _from_literal(literal):
+    body, flags = literal.groups()
+    enabled = ''.join(flag for flag in _JS_FLAGS if flag in flags)
+    disabled = ''.join(flag for flag in _JS_FLAGS if flag not in flags)
+    return f"(?{enabled}-{disabled}:{body})" if disabled else f"(?{enabled}:{body})"
+
+def filter_patterns(applied_filter):
+    """
+    Extract the regular expressions that implement one applied filter.
+
+    Args:
+        applied_filter (dict): One entry of the ``filters`` list of ``get_applied_filters``.
+
+    Returns:
+        list or None: Regular expression sources, or None if the filter is not
+        purely pattern based, or a pattern does not compile or uses a negated
+        construct, in which case it cannot be evaluated locally. The flags of a
+        ``/.../flags`` literal are kept as a scoped inline group.
+    """
+    if not isinstance(applied_filter, dict):
+        return None
+    patterns = []
+    for key in PATTERN_KEYS:
+        value = applied_filter.get(key)
+        for source in [value] if isinstance(value, str) else value or ():
+            if not isinstance(source, str) or not source:
+                return None
+            if _NOT_CHECKABLE.search(source):
+                return None
+            literal = _JS_LITERAL.match(source)
+            patterns.append(_from_literal(literal) if literal else source)
+    for key in KEYWORD_KEYS:
+        value = applied_filter.get(key)
+        for word in [value] if isinstance(value, str) else value or ():
+            if not isinstance(word, str) or not word:
+                return None
+            patterns.append(re.escape(word))
+    if not patterns:
+        return None
+    for source in patterns:
+        try:
+            re.compile(source, MATCH_FLAGS)
+        except re.error:
+            return None
+    return patterns
+
+class FilterMatcher:
+    """
+    Combined local matcher for a set of applied filters.
+
+    Every pattern-based filter is compiled into one alternation, so a document
+    is scanned once whatever the number of filters. Patterns that cannot be
+    combined (backreferences, named groups, global inline flags) are kept as
+    separate regexes.
+
+    Args:
+        filters (list): The applied filters.
+    """
+
+    def __init__(self, filters):
+        sources = []
+        self.complete = True
+        for applied_filter in filters:
+            patterns = filter_patterns(applied_filter)
+            if patterns is None:
+                self.complete = False
+                continue
+            sources.extend(patterns)
+
+        combinable = [s for s in sources if not re.search(r'\\[1-9]|\(\?P|\(\?[aiLmsux]+\)', s)]
+        self._separate = [re.compile(s, MATCH_FLAGS) for s in sources if s not in combinable]
+        self._combined = None
+        if combinable:
+            self._combined = re.compile('|'.join(f'(?:{s})' for s in combinable), MATCH_FLAGS)
+        self.pattern_count = len(sources)
+
+    def might_match(self, text):
+        """
+        Tell whether any filter could fire on ``text``.
+
+        Returns:
+            bool: False only if no filter can match; True whenever the server must be asked.
+        """
+        # ASCII-only matching is narrower than JavaScript's for other text:
+        # case folding of non-ASCII letters and \s.
+        if not self.complete or not text.isascii():
+            return True
+        if self._combined is not None and self._combined.search(text):
+            return True
+        return any(regex.search(text) for regex in self._separate)
+
+class LocalPrefilter:
+    """
+    Skip filterText calls for texts that no applied filter can match.
+
+    The applied filters are fetched through ``get_applied_filters`` and compiled
+    into a :class:`FilterMatcher`. Texts it rules out are answered locally
+    with the text unchanged and no filter counts. If any applied filter is not
+    pattern based, every text goes to the server. The filters are re-checked
+    every ``refresh_interval`` seconds and the matcher is rebuilt when they change.
+
+    The pre-filter assumes the applied filters fully describe what filterText
+    does for the account.
+
+    Args:
+        refresh_interval (float): Seconds between applied-filter checks.
+    """
+
+    def __init__(self, refresh_interval=60):
+        self.refresh_interval = refresh_interval
+        self.skipped = 0
+        self.forwarded = 0
+        self.rebuilds = 0
+        self._matcher = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def matcher(self, fetch_filters):
+        """
+        Return the current matcher, refreshing it through ``fetch_filters`` when stale.
+
+        Args:
+            fetch_filters (callable): Returns the applied-filters response.
+        """
+        if self._matcher is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return self._matcher
+        with self._lock:
+            if self._matcher is None or time.monotonic() - self._checked_at >= self.refresh_interval:
+                response = fetch_filters()
+                version = FilterCache.version_of(response)
+                if version != self._version:
+                    filters = response.get('filters', []) if isinstance(response, dict) else response
+                    self._matcher = FilterMatcher(filters or [])
+                    self._version = version
+                    self.rebuilds += 1
+                self._checked_at = time.monotonic()
+            return self._matcher
+
+    def might_match(self, text, fetch_filters):
+        """
+        Tell whether ``text`` has to be sent to the server.
+
+        Args:
+            text (str): The text to be filtered.
+            fetch_filters (callable): Returns the applied-filters response.
+
+        Returns:
+            bool: True if the server must filter the text.
+        """
+        forward = self.matcher(fetch_filters).might_match(text)
+        with self._lock:
+            if forward:
+                self.forwarded += 1
+            else:
+                self.skipped += 1
+        return forward
+
+    def invalidate(self):
+        """Force the applied filters to be fetched again on the next call."""
+        with self._lock:
+            self._matcher = None
+            self._version = None
+
+    def stats(self):
+        matcher = self._matcher
+        return {
+            'skipped': self.skipped,
+            'forwarded': self.forwarded,
+            'rebuilds': self.rebuilds,
+            'complete': matcher.complete if matcher is not None else None,
+            'patterns': matcher.pattern_count if matcher is not None else 0,
+        }
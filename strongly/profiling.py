@@ -0,0 +1,251 @@
+import functools
+import os
+import threading
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CO_GENERATOR = 0x20  # inspect.CO_GENERATOR, without importing inspect
+
+class Profiler:
+    """
+    Client-side profile of the public ``APIClient`` methods.
+
+    Each call records its wall time and the CPU time of the calling thread
+    (``time.thread_time``). Wall time minus CPU time is counted as wait. That
+    covers the network, backoff sleeps and lock waits. Nested calls, e.g.
+    ``filter_text`` -> ``call_api``, are kept as stacks. :meth:`collapsed`
+    writes them in the collapsed-stack format read by flamegraph.pl and
+    speedscope, split into ``[cpu]`` and ``[wait]`` leaves. Work handed to other
+    threads (``filter_texts`` workers, hedged requests) appears as its own stacks.
+
+    With ``trace_allocations``, :mod:`tracemalloc` runs while the profiler is
+    started. :meth:`allocation_sites` then reports where memory still held was
+    allocated under this package. tracemalloc slows every allocation in the
+    process, so enable it only for diagnostic windows.
+
+    Attach with ``APIClient(profiler=...)``, or set ``client.profiler`` at run
+    time; set it back to None to stop recording.
+
+    Args:
+        trace_allocations (bool): Trace allocations with tracemalloc.
+        allocation_frames (int): Frames kept per allocation traceback.
+    """
+
+    def __init__(self, trace_allocations=False, allocation_frames=16):
+        self.trace_allocations = trace_allocations
+        self.allocation_frames = allocation_frames
+        self._methods = {}  # name -> [calls, errors, wall, cpu, max wall]
+        self._stacks = {}  # stack tuple -> [self cpu, self wait]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        if trace_allocations:
+            self.start()
+
+    def start(self):
+        """Start allocation tracing, if enabled. Call timing needs no start."""
+        if self.trace_allocations:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.allocation_frames)
+                self._started_tracemalloc = True
+
+    def stop(self):
+        """Stop allocation tracing if this profiler started it."""
+        if self._started_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._stacks.clear()
+
+    def _enter(self, name):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        # name, wall start, cpu start, wall and cpu spent in nested calls
+        stack.append([name, time.perf_counter(), time.thread_time(), 0.0, 0.0])
+        return stack
+
+    def _exit(self, stack, count, error):
+        wall_end, cpu_end = time.perf_counter(), time.thread_time()
+        path = tuple(frame[0] for frame in stack)
+        name, wall_start, cpu_start, child_wall, child_cpu = stack.pop()
+        wall = wall_end - wall_start
+        cpu = min(cpu_end - cpu_start, wall)
+        if stack:
+            stack[-1][3] += wall
+            stack[-1][4] += cpu
+        with self._lock:
+            method = self._methods.get(name)
+            if method is None:
+                method = self._methods[name] = [0, 0, 0.0, 0.0, 0.0]
+            method[0] += count
+            method[1] += error
+            method[2] += wall
+            method[3] += cpu
+            # Generators are timed step by step; max_wall is the longest step.
+            method[4] = max(method[4], wall)
+            own = self._stacks.get(path)
+            if own is None:
+                own = self._stacks[path] = [0.0, 0.0]
+            own_cpu = max(cpu - child_cpu, 0.0)
+            own[0] += own_cpu
+            own[1] += max(wall - child_wall - own_cpu, 0.0)
+
+    def call(self, name, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` and record it under ``name``."""
+        stack = self._enter(name)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            self._exit(stack, 1, 1)
+            raise
+        self._exit(stack, 1, 0)
+        return result
+
+    def iterate(self, name, generator):
+        """
+        Re-yield ``generator``, recording the time spent producing each item under ``name``.
+
+        Time the consumer spends between items is not counted.
+        """
+        count = 1
+        try:
+            while True:
+                stack = self._enter(name)
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    self._exit(stack, count, 0)
+                    return
+                except BaseException:
+                    self._exit(stack, count, 1)
+                    raise
+                self._exit(stack, count, 0)
+                count = 0
+                yield item
+        finally:
+            generator.close()
+
+    def summary(self):
+        """
+        Per-method totals.
+
+        Returns:
+            dict: ``name -> {'calls', 'errors', 'wall', 'cpu', 'wait', 'mean_wall', 'max_wall'}``,
+            times in seconds and inclusive of nested calls.
+        """
+        with self._lock:
+            methods = {name: list(values) for name, values in self._methods.items()}
+        return {
+            name: {
+                'calls': calls,
+                'errors': errors,
+                'wall': wall,
+                'cpu': cpu,
+                'wait': wall - cpu,
+                'mean_wall': wall / calls if calls else 0.0,
+                'max_wall': max_wall,
+            }
+            for name, (calls, errors, wall, cpu, max_wall) in methods.items()
+        }
+
+    def report(self, sort='wall'):
+        """
+        Format :meth:`summary` as a table, slowest first.
+
+        Args:
+            sort (str): Column to sort by: 'wall', 'cpu', 'wait' or 'calls'.
+
+        Returns:
+            str: The table.
+        """
+        rows = sorted(self.summary().items(), key=lambda item: item[1][sort], reverse=True)
+        lines = [f"{'method':<32}{'calls':>8}{'wall ms':>12}{'cpu ms':>12}{'wait ms':>12}{'mean ms':>10}"]
+        for name, stats in rows:
+            lines.append(f"{name:<32}{stats['calls']:>8}{stats['wall'] * 1e3:>12.2f}{stats['cpu'] * 1e3:>12.2f}"
+                         f"{stats['wait'] * 1e3:>12.2f}{stats['mean_wall'] * 1e3:>10.2f}")
+        return '\n'.join(lines)
+
+    def collapsed(self):
+        """
+        Return the call stacks in collapsed-stack format.
+
+        Returns:
+            list: Lines like ``APIClient.filter_text;APIClient.call_api;[wait] 5120``,
+            with self time in microseconds.
+        """
+        with self._lock:
+            stacks = {path: list(values) for path, values in self._stacks.items()}
+        lines = []
+        for path, (cpu, wait) in sorted(stacks.items()):
+            prefix = ';'.join(path)
+            for leaf, seconds in (('[cpu]', cpu), ('[wait]', wait)):
+                micros = int(seconds * 1e6)
+                if micros:
+                    lines.append(f"{prefix};{leaf} {micros}")
+        return lines
+
+    def write_collapsed(self, path):
+        """Write :meth:`collapsed` to ``path``, e.g. for ``flamegraph.pl path > profile.svg``."""
+        with open(path, 'w') as f:
+            f.write('\n'.join(self.collapsed()) + '\n')
+
+    def allocation_sites(self, limit=10, key_type='lineno'):
+        """
+        Report where memory still held was allocated, for tracebacks through this package.
+
+        Args:
+            limit (int): Number of sites to return.
+            key_type (str): 'lineno', 'filename' or 'traceback'.
+
+        Returns:
+            list: ``{'site', 'size', 'count'}`` dicts, largest first. For 'traceback'
+            the site is a collapsed stack, oldest frame first.
+
+        Raises:
+            RuntimeError: If allocations are not being traced.
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("allocation tracing is off; use Profiler(trace_allocations=True)")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, '*'), all_frames=True)])
+        sites = []
+        for stat in snapshot.statistics(key_type)[:limit]:
+            frames = [f"{os.path.relpath(frame.filename)}:{frame.lineno}" for frame in stat.traceback]
+            sites.append({'site': ';'.join(frames), 'size': stat.size, 'count': stat.count})
+        return sites
+
+def profiled(method):
+    """
+    Record calls of an ``APIClient`` method when the client has a profiler.
+
+    Without a profiler the only cost is one attribute check.
+    """
+    name = f"APIClient.{method.__name__}"
+
+    if method.__code__.co_flags & CO_GENERATOR:
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            return profiler.iterate(name, method(self, *args, **kwargs))
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        return profiler.call(name, method, self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,193 @@
+import os
+import struct
+import threading
+import time
+from .exceptions import RateLimitExceeded, TokenBudgetExceeded
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests per second.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float, optional): Maximum burst size. Defaults to ``rate``.
+        max_wait (float, optional): Longest time ``acquire`` waits before raising
+            ``RateLimitExceeded``. None waits as long as needed; 0 sheds immediately.
+    """
+
+    def __init__(self, rate, capacity=None, max_wait=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.max_wait = max_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens):
+        """Take tokens if available; otherwise return the seconds until they will be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens=1):
+        return self._take(tokens) == 0.0
+
+    def acquire(self, tokens=1):
+        """
+        Wait until ``tokens`` are available and take them.
+
+        Raises:
+            RateLimitExceeded: If they are not available within ``max_wait``.
+        """
+        if tokens > self.capacity:
+            raise ValueError("cannot acquire more tokens than the bucket capacity")
+        deadline = None if self.max_wait is None else time.monotonic() + self.max_wait
+        while True:
+            wait = self._take(tokens)
+            if wait == 0.0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded("Client-side rate limit exceeded", status_code=429)
+            time.sleep(wait)
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a small file, shared by every process on the host.
+
+    The state is guarded with ``flock`` so all processes that point at the same
+    path draw from one budget.
+
+    Args:
+        path (str): Path of the state file; created if missing.
+        rate (float): Tokens added per second.
+        capacity (float, optional): Maximum burst size. Defaults to ``rate``.
+        max_wait (float, optional): See :class:`TokenBucket`.
+    """
+
+    _STATE = struct.Struct('dd')  # tokens, wall-clock timestamp
+
+    def __init__(self, path, rate, capacity=None, max_wait=None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl and is not available on this platform")
+        super().__init__(rate, capacity, max_wait)
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    def _file(self):
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _take(self, tokens):
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(fd, self._STATE.size, 0)
+                if len(raw) == self._STATE.size:
+                    available, updated = self._STATE.unpack(raw)
+                    available = min(self.capacity, available + max(now - updated, 0.0) * self.rate)
+                else:
+                    available = self.capacity
+                wait = 0.0
+                if available >= tokens:
+                    available -= tokens
+                else:
+                    wait = (tokens - available) / self.rate
+                os.pwrite(fd, self._STATE.pack(available, now), 0)
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+class TokenBudget:
+    """
+    Admission control against the account's token quota.
+
+    The remaining quota is read from ``check_token_usage`` every
+    ``refresh_interval`` seconds. Between refreshes, the estimated prompt tokens
+    of every admitted request are subtracted locally, so bursts cannot overrun
+    the plan limit before the server reports them.
+
+    Args:
+        reserve (int): Tokens to keep in reserve below the plan limit.
+        refresh_interval (float): Seconds between quota refreshes.
+        block (bool): Wait for quota to free up instead of shedding the call.
+        max_wait (float, optional): Longest time to wait when ``block`` is set.
+    """
+
+    def __init__(self, reserve=0, refresh_interval=30, block=False, max_wait=None):
+        self.reserve = reserve
+        self.refresh_interval = refresh_interval
+        self.block = block
+        self.max_wait = max_wait
+        self.remaining = None
+        self.shed = 0
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+
+    def update(self, usage):
+        """
+        Reset the budget from a ``check_token_usage`` response.
+
+        Args:
+            usage (dict): The token usage response.
+        """
+        if usage.get('isOverLimit') or usage.get('isRestricted'):
+            remaining = 0
+        else:
+            remaining = usage.get('planTokenLimit', 0) - usage.get('userTokenUsage', 0)
+        with self._lock:
+            self.remaining = max(remaining, 0)
+            self._refreshed_at = time.monotonic()
+
+    def _stale(self):
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_interval
+
+    def _try_reserve(self, tokens):
+        with self._lock:
+            if self.remaining - tokens < self.reserve:
+                return False
+            self.remaining -= tokens
+            return True
+
+    def admit(self, tokens, fetch_usage):
+        """
+        Admit a request of ``tokens`` estimated tokens, or shed it.
+
+        Args:
+            tokens (int): Estimated prompt tokens of the request.
+            fetch_usage (callable): Returns a fresh ``check_token_usage`` response.
+
+        Raises:
+            TokenBudgetExceeded: If the request would exceed the plan limit.
+        """
+        deadline = None if self.max_wait is None else time.monotonic() + self.max_wait
+        refresh = self._stale()
+        while True:
+            if refresh:
+                self.update(fetch_usage())
+            if self._try_reserve(tokens):
+                return
+            if not self.block or (deadline is not None and time.monotonic() + self.refresh_interval > deadline):
+                with self._lock:
+                    self.shed += 1
+                raise TokenBudgetExceeded(
+                    f"Token budget exceeded: {tokens} estimated tokens, {self.remaining} remaining",
+                    status_code=429)
+            time.sleep(self.refresh_interval)
+            refresh = True
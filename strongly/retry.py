@@ -0,0 +1,159 @@
+import random
+import threading
+import time
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# POST endpoints without side effects; safe to retry, deduplicate or hedge.
+PURE_ENDPOINTS = frozenset({'/api/v1/filterText'})
+
+def is_idempotent(method, endpoint):
+    return method.upper() in IDEMPOTENT_METHODS or endpoint in PURE_ENDPOINTS
+
+def parse_retry_after(value):
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value (str): Either a number of seconds or an HTTP date.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime  # rare path; keeps the import cheap
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    Connection errors and ``retry_statuses`` responses are retried. Requests
+    that may have reached the server are only retried when they are idempotent
+    (GET, or a POST to a pure endpoint such as filterText) unless
+    ``retry_non_idempotent`` is set. Throttled (429) requests and connect
+    timeouts never reached the application, so they are always retried.
+
+    Args:
+        max_attempts (int): Total attempts per call, including the first.
+        backoff_base (float): Delay cap in seconds before the first retry; it doubles each attempt.
+        backoff_max (float): Upper bound for a single delay.
+        jitter (bool): Randomize delays between 0 and the cap to avoid synchronized retries.
+        retry_statuses (iterable): HTTP statuses treated as transient.
+        deadline (float, optional): Overall budget in seconds for a call, including retries.
+        retry_non_idempotent (bool): Also retry non-idempotent requests.
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=30.0, jitter=True,
+                 retry_statuses=(429, 502, 503, 504), deadline=None, retry_non_idempotent=False):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.deadline = deadline
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt (int): The attempt that just failed, starting at 1.
+            retry_after (float, optional): Server-requested delay, which takes precedence.
+                It is capped at ``backoff_max`` like any other delay.
+
+        Returns:
+            float: Seconds to sleep.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, cap) if self.jitter else cap
+
+    def can_retry(self, idempotent, always_safe=False):
+        return always_safe or idempotent or self.retry_non_idempotent
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by all threads using a client.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    fail fast for ``recovery_timeout`` seconds. Then a single probe request is
+    let through; its success closes the circuit, its failure re-opens it.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        recovery_timeout (float): Seconds to stay open before probing.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self):
+        """
+        End an attempt that produced neither a response nor a transport error.
+
+        Frees the half-open probe slot without counting a success or a failure,
+        e.g. when authentication or encoding the request failed.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def retry_in(self):
+        """Seconds until the circuit will let a probe through."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
@@ -0,0 +1,90 @@
+import importlib
+import json
+
+def _optional_import(name):
+    # Backends are imported on first use so that importing strongly stays cheap.
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+class JSONSerializer:
+    """Standard library ``json`` backend, always available."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data)
+
+class OrjsonSerializer:
+    """``orjson`` backend."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        orjson = _optional_import('orjson')
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+class MsgspecSerializer:
+    """``msgspec`` backend."""
+
+    name = 'msgspec'
+
+    def __init__(self):
+        msgspec = _optional_import('msgspec')
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        return self._decoder.decode(data)
+
+SERIALIZERS = {
+    'json': JSONSerializer,
+    'orjson': OrjsonSerializer,
+    'msgspec': MsgspecSerializer,
+}
+
+def get_serializer(name='auto'):
+    """
+    Return a JSON serializer by name.
+
+    Args:
+        name (str or object): 'auto', 'orjson', 'msgspec' or 'json'. 'auto' picks
+            the fastest installed backend, falling back to the standard library.
+            An object with ``dumps``/``loads`` methods is returned unchanged.
+
+    Returns:
+        object: A serializer with ``dumps(obj) -> bytes`` and ``loads(bytes)``.
+
+    Raises:
+        ImportError: If the requested backend is not installed.
+        ValueError: If the name is unknown.
+    """
+    if not isinstance(name, str):
+        return name
+    if name == 'auto':
+        for backend in (OrjsonSerializer, MsgspecSerializer):
+            try:
+                return backend()
+            except ImportError:
+                continue
+        return JSONSerializer()
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer '{name}', expected one of: auto, {', '.join(SERIALIZERS)}")
+    return SERIALIZERS[name]()
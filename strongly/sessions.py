@@ -0,0 +1,325 @@
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .batch import ordered_map
+from .exceptions import APIError
+
+class SessionRecord:
+    """
+    A session known to a :class:`SessionManager`.
+    """
+
+    __slots__ = ('session_id', 'name', 'created_at', 'last_used')
+
+    def __init__(self, session_id, name):
+        self.session_id = session_id
+        self.name = name
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def to_session(self):
+        """Return the ``{'sessionId', 'sessionName'}`` dict expected by ``submit_prompt``."""
+        return {'sessionId': self.session_id, 'sessionName': self.name}
+
+def _session_id(result):
+    if isinstance(result, dict):
+        return result.get('sessionId')
+    return getattr(result, 'session_id', None)
+
+class SessionManager:
+    """
+    Local registry of chat sessions with a warm pool and bulk operations.
+
+    Every session created, renamed or deleted through the manager is tracked in
+    an id/name index, so lookups never hit the API. ``acquire`` hands out
+    pre-created sessions from a warm pool that is topped up in the background,
+    so a prompt never waits on session creation.
+
+    Args:
+        client (APIClient): The client used for API calls.
+        pool_size (int): Number of warm sessions to keep ready. 0 disables the pool.
+        name_prefix (str): Prefix of the generated names of pooled sessions.
+        idle_timeout (float, optional): Seconds after which ``collect_idle``
+            deletes an unused session. None disables idle collection.
+        concurrency (int): Maximum concurrent API calls for bulk operations
+            and pool refills.
+    """
+
+    def __init__(self, client, pool_size=0, name_prefix='pool-', idle_timeout=None, concurrency=8):
+        if pool_size < 0:
+            raise ValueError("pool_size must not be negative")
+        self.client = client
+        self.pool_size = pool_size
+        self.name_prefix = name_prefix
+        self.idle_timeout = idle_timeout
+        self.concurrency = concurrency
+        self._by_id = {}
+        self._by_name = {}
+        self._pool = deque()
+        self._refilling = set()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self):
+        """Stop background refills. Pooled sessions are left on the server."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def _register(self, session_id, name):
+        record = SessionRecord(session_id, name)
+        with self._lock:
+            self._by_id[session_id] = record
+            self._by_name[name] = record
+        return record
+
+    def _unregister(self, session_id):
+        with self._lock:
+            record = self._by_id.pop(session_id, None)
+            if record is not None and self._by_name.get(record.name) is record:
+                del self._by_name[record.name]
+            if record is not None and record in self._pool:
+                self._pool.remove(record)
+        return record
+
+    def get(self, session_id):
+        """
+        Look up a session by id.
+
+        Returns:
+            SessionRecord or None: The record, or None if the session is unknown.
+        """
+        return self._by_id.get(session_id)
+
+    def find(self, name):
+        """
+        Look up a session by name.
+
+        Returns:
+            SessionRecord or None: The record, or None if no session has that name.
+        """
+        return self._by_name.get(name)
+
+    def sessions(self):
+        """
+        Return every known session, including pooled ones.
+
+        Returns:
+            list: The ``SessionRecord`` objects.
+        """
+        with self._lock:
+            return list(self._by_id.values())
+
+    def touch(self, session_id):
+        """Mark a session as used now so it is not collected as idle."""
+        record = self._by_id.get(session_id)
+        if record is not None:
+            record.last_used = time.monotonic()
+
+    def create(self, name):
+        """
+        Create a session and register it.
+
+        Args:
+            name (str): The session name.
+
+        Returns:
+            SessionRecord: The new session.
+
+        Raises:
+            APIError: If the API call fails or returns no session id.
+        """
+        session_id = _session_id(self.client.create_session(name))
+        if not session_id:
+            raise APIError("API call failed: no sessionId in create_session response")
+        return self._register(session_id, name)
+
+    def _create_pooled(self):
+        record = self.create(f"{self.name_prefix}{uuid.uuid4().hex}")
+        with self._lock:
+            self._pool.append(record)
+
+    def _refill_done(self, future):
+        with self._lock:
+            self._refilling.discard(future)
+
+    def refill(self):
+        """
+        Start background creation of enough sessions to fill the warm pool.
+
+        Does nothing once the manager is closed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            # A finished refill has already added its session to the pool (or failed
+            # and been reported), even if its done-callback has not run yet.
+            self._refilling = {future for future in self._refilling if not future.done()}
+            missing = self.pool_size - len(self._pool) - len(self._refilling)
+            started = [self._executor.submit(self._create_pooled) for _ in range(missing)]
+            self._refilling.update(started)
+        for future in started:
+            future.add_done_callback(self._refill_done)
+
+    def warm(self):
+        """
+        Fill the warm pool and wait until it is ready.
+
+        Raises:
+            APIError: If a session could not be created.
+            RuntimeError: If the manager is closed.
+        """
+        if self._closed:
+            raise RuntimeError("SessionManager is closed")
+        self.refill()
+        with self._lock:
+            futures = list(self._refilling)
+        for future in futures:
+            future.result()
+
+    def acquire(self, name=None):
+        """
+        Take a session for immediate use.
+
+        A pooled session is returned without an API call when one is ready, and
+        the pool is topped up in the background. Otherwise a session is created
+        on the spot. After :meth:`close` the pool is no longer topped up.
+
+        Args:
+            name (str, optional): Rename the session to this name before returning it.
+
+        Returns:
+            dict: The ``{'sessionId', 'sessionName'}`` session, ready for ``submit_prompt``.
+
+        Raises:
+            APIError: If the session could not be created or renamed.
+        """
+        with self._lock:
+            record = self._pool.popleft() if self._pool else None
+        if self.pool_size:
+            self.refill()
+        if record is None:
+            record = self.create(name or f"{self.name_prefix}{uuid.uuid4().hex}")
+        elif name is not None and name != record.name:
+            record = self.rename(record.session_id, name)
+        record.last_used = time.monotonic()
+        return record.to_session()
+
+    def rename(self, session_id, new_name):
+        """
+        Rename a session and update the registry.
+
+        Returns:
+            SessionRecord: The renamed session.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        self.client.rename_session(session_id, new_name)
+        with self._lock:
+            record = self._by_id.get(session_id)
+            if record is None:
+                record = self._by_id[session_id] = SessionRecord(session_id, new_name)
+            elif self._by_name.get(record.name) is record:
+                del self._by_name[record.name]
+            record.name = new_name
+            self._by_name[new_name] = record
+        return record
+
+    def delete(self, session_id):
+        """
+        Delete a session and drop it from the registry.
+
+        Raises:
+            APIError: If the API call fails.
+        """
+        result = self.client.delete_session(session_id)
+        self._unregister(session_id)
+        return result
+
+    def _bulk(self, func, items):
+        def run(item):
+            try:
+                return {'sessionId': item[0], 'ok': True, 'result': func(*item), 'error': None}
+            except Exception as exc:
+                return {'sessionId': item[0], 'ok': False, 'result': None, 'error': exc}
+
+        return list(ordered_map(run, items, self.concurrency))
+
+    def delete_many(self, session_ids):
+        """
+        Delete many sessions concurrently.
+
+        Args:
+            session_ids (iterable): Ids of the sessions to delete.
+
+        Returns:
+            list: One ``{'sessionId', 'ok', 'result', 'error'}`` dict per id, in
+            input order. Failures are reported per item instead of raised.
+        """
+        return self._bulk(self.delete, ((session_id,) for session_id in session_ids))
+
+    def rename_many(self, renames):
+        """
+        Rename many sessions concurrently.
+
+        Args:
+            renames (dict or iterable): ``{session_id: new_name}`` or ``(session_id, new_name)`` pairs.
+
+        Returns:
+            list: One ``{'sessionId', 'ok', 'result', 'error'}`` dict per rename,
+            in input order. ``result`` is the renamed ``SessionRecord``.
+        """
+        if isinstance(renames, dict):
+            renames = renames.items()
+        return self._bulk(self.rename, renames)
+
+    def idle_sessions(self, max_idle=None):
+        """
+        Return the sessions unused for longer than ``max_idle`` seconds, excluding the warm pool.
+
+        Args:
+            max_idle (float, optional): Defaults to ``idle_timeout``.
+        """
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        if max_idle is None:
+            return []
+        cutoff = time.monotonic() - max_idle
+        with self._lock:
+            pooled = set(id(record) for record in self._pool)
+            return [record for record in self._by_id.values()
+                    if record.last_used <= cutoff and id(record) not in pooled]
+
+    def collect_idle(self, max_idle=None):
+        """
+        Delete every session that has been idle too long.
+
+        Args:
+            max_idle (float, optional): Defaults to ``idle_timeout``.
+
+        Returns:
+            list: Per-item results, as returned by :meth:`delete_many`.
+        """
+        return self.delete_many(record.session_id for record in self.idle_sessions(max_idle))
+
+    def submit_prompt(self, session, message, model, filter_counts=None, context_prompts=None):
+        """
+        Submit a prompt through the client and mark its session as used.
+
+        Takes the same arguments as :meth:`APIClient.submit_prompt`.
+        """
+        if isinstance(session, dict):
+            self.touch(session.get('sessionId'))
+        return self.client.submit_prompt(session, message, model, filter_counts, context_prompts)
@@ -0,0 +1,294 @@
+"""
+Durable local queue for ``filter_text`` and ``submit_prompt`` jobs.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from .api_client import build_prompt_payload
+from .exceptions import APIError, AuthenticationError
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+def is_retryable(exc):
+    """
+    Tell whether a failed job should be replayed later.
+
+    Transport errors, throttling and 5xx responses are retried; validation
+    errors and other 4xx responses are final. So is a failed authentication,
+    unless the authentication endpoint answered with a retryable status.
+    Transport errors while authenticating already surface as ``APIError``.
+    """
+    if isinstance(exc, AuthenticationError):
+        exc = exc.__cause__
+    if not isinstance(exc, APIError):
+        return False
+    return exc.status_code is None or exc.status_code in RETRYABLE_STATUSES
+
+class SpoolQueue:
+    """
+    Write-ahead queue that accepts jobs without waiting on the API.
+
+    Jobs are appended to a sqlite file and return a ``Future`` immediately. A
+    background drainer replays them through the client at most ``rate`` per
+    second with at most ``concurrency`` in flight. Jobs that fail transiently
+    are retried with exponential backoff. Everything still in the file is
+    replayed by the next queue opened on the same path, including jobs that
+    were in flight when a process died (after ``lease_time``). The drainer renews
+    the lease of its jobs in flight, so a slow call is never replayed while it runs.
+
+    Futures only exist in the process that enqueued the job. ``on_complete`` is
+    called for every finished job, including ones recovered from an earlier run,
+    after its future has been resolved. Errors it raises are logged.
+
+    Args:
+        client (APIClient): The client used to replay jobs.
+        path (str): Path of the sqlite spool file.
+        rate (float, optional): Maximum jobs started per second. None is unlimited.
+        concurrency (int): Maximum jobs in flight.
+        max_attempts (int): Attempts before a job is marked failed.
+        backoff_base (float): Delay before the first retry, doubled on each attempt.
+        backoff_max (float): Cap on the retry delay.
+        lease_time (float): Seconds after which a job claimed by a dead drainer is replayed.
+        on_complete (callable, optional): ``on_complete(job_id, result, error)``.
+        autostart (bool): Start the drainer immediately.
+    """
+
+    def __init__(self, client, path, rate=None, concurrency=4, max_attempts=5, backoff_base=1.0,
+                 backoff_max=60.0, lease_time=300.0, on_complete=None, autostart=True):
+        if concurrency < 1 or max_attempts < 1:
+            raise ValueError("concurrency and max_attempts must be positive integers")
+        self.client = client
+        self.path = path
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_time = lease_time
+        self.on_complete = on_complete
+        self.rate_limiter = TokenBucket(rate) if rate else None
+        self._futures = {}
+        self._in_flight = 0
+        self._running = set()  # ids of the jobs this queue has in flight
+        self._renewed_at = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, payload TEXT NOT NULL, '
+            "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            'not_before REAL NOT NULL DEFAULT 0, lease_until REAL, error TEXT, created_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, not_before)')
+        if autostart:
+            self.start()
+
+    def _enqueue(self, kind, payload, callback):
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO jobs (kind, payload, created_at) VALUES (?, ?, ?)',
+                (kind, json.dumps(payload), time.time()))
+            future.job_id = cursor.lastrowid
+            self._futures[future.job_id] = future
+        self._wake.set()
+        return future
+
+    def submit_prompt(self, session, message, model, filter_counts=None, context_prompts=None, callback=None):
+        """
+        Queue a prompt. Arguments are validated now; the request is sent by the drainer.
+
+        Args:
+            callback (callable, optional): Called with the future when the job finishes.
+
+        Returns:
+            Future: Resolves to the ``submit_prompt`` response. Its ``job_id`` attribute
+            identifies the job in the spool.
+
+        Raises:
+            ValueError: If required parameters are missing or invalid.
+        """
+        payload = build_prompt_payload(session, message, model, filter_counts, context_prompts)
+        return self._enqueue('submit_prompt', payload, callback)
+
+    def filter_text(self, text, callback=None):
+        """
+        Queue a text for filtering.
+
+        Returns:
+            Future: Resolves to the ``filter_text`` response.
+
+        Raises:
+            ValueError: If text is invalid.
+        """
+        if not text or not isinstance(text, str):
+            raise ValueError("text must be a non-empty string")
+        return self._enqueue('filter_text', {'text': text}, callback)
+
+    def start(self):
+        """Start the background drainer."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._thread = threading.Thread(target=self._drain, name='strongly-spool', daemon=True)
+        self._thread.start()
+
+    def close(self, wait=True):
+        """
+        Stop the drainer. Jobs not yet finished stay in the spool for the next run.
+
+        Args:
+            wait (bool): Wait for the jobs in flight to finish.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._executor.shutdown(wait=wait)
+            self._thread = None
+        if wait:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def join(self, timeout=None):
+        """
+        Wait until every job in the spool has finished.
+
+        Returns:
+            bool: True if the spool drained, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def pending(self):
+        """Number of jobs waiting or in flight."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status != 'failed'").fetchone()[0]
+
+    def failed_jobs(self):
+        """
+        Return jobs that exhausted their attempts or failed permanently.
+
+        Returns:
+            list: ``{'id', 'kind', 'payload', 'attempts', 'error'}`` dicts.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, kind, payload, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id").fetchall()
+        return [{'id': r[0], 'kind': r[1], 'payload': json.loads(r[2]), 'attempts': r[3], 'error': r[4]}
+                for r in rows]
+
+    def _claim(self, limit):
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, kind, payload, attempts FROM jobs WHERE "
+                    "(status = 'pending' AND not_before <= ?) OR (status = 'running' AND lease_until < ?) "
+                    "ORDER BY id LIMIT ?", (now, now, limit + len(self._running))).fetchall()
+                # Never claim a job this queue is still running, even if its lease ran out.
+                rows = [row for row in rows if row[0] not in self._running][:limit]
+                self._conn.executemany("UPDATE jobs SET status = 'running', lease_until = ? WHERE id = ?",
+                                       [(now + self.lease_time, row[0]) for row in rows])
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._in_flight += len(rows)
+            self._running.update(row[0] for row in rows)
+        return rows
+
+    def _renew_leases(self):
+        now = time.time()
+        with self._lock:
+            if not self._running or now - self._renewed_at < self.lease_time / 3:
+                return
+            self._conn.executemany("UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running'",
+                                   [(now + self.lease_time, job_id) for job_id in self._running])
+            self._renewed_at = now
+
+    def _drain(self):
+        # Wake up often enough to renew leases well before they run out.
+        idle_wait = min(0.5, self.lease_time / 3)
+        while not self._stop.is_set():
+            self._renew_leases()
+            with self._lock:
+                free = self.concurrency - self._in_flight
+            rows = self._claim(free) if free > 0 else []
+            for row in rows:
+                self._executor.submit(self._run, *row)
+            if not rows:
+                self._wake.wait(idle_wait)
+                self._wake.clear()
+
+    def _run(self, job_id, kind, payload, attempts):
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            payload = json.loads(payload)
+            if kind == 'submit_prompt':
+                result = self.client.submit_prompt(payload['session'], payload['message'], payload['model'],
+                                                   payload['filterCounts'], payload['contextPrompts'])
+            else:
+                result = self.client.filter_text(payload['text'])
+        except Exception as exc:
+            self._failed(job_id, attempts + 1, exc)
+        else:
+            self._finish(job_id, "DELETE FROM jobs WHERE id = ?", (job_id,), result, None)
+
+    def _failed(self, job_id, attempts, exc):
+        if is_retryable(exc) and attempts < self.max_attempts:
+            delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'pending', attempts = ?, not_before = ?, error = ? WHERE id = ?",
+                    (attempts, time.time() + delay, str(exc), job_id))
+                self._in_flight -= 1
+                self._running.discard(job_id)
+            self._wake.set()
+            return
+        self._finish(job_id, "UPDATE jobs SET status = 'failed', attempts = ?, error = ? WHERE id = ?",
+                     (attempts, str(exc), job_id), None, exc)
+
+    def _finish(self, job_id, sql, params, result, error):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._in_flight -= 1
+            self._running.discard(job_id)
+            future = self._futures.pop(job_id, None)
+        self._wake.set()
+        if future is not None:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        if self.on_complete is not None:
+            try:
+                self.on_complete(job_id, result, error)
+            except Exception:
+                logger.exception("on_complete failed for spooled job %s", job_id)
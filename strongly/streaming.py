@@ -0,0 +1,203 @@
+import codecs
+import json
+from .exceptions import APIError
+
+DONE = '[DONE]'
+TEXT_KEYS = ('content', 'delta', 'text', 'token', 'response')
+
+class SSEDecoder:
+    """
+    Incremental parser for ``text/event-stream`` bodies.
+
+    Feed it one line at a time; it returns the data of an event once the blank
+    line that terminates the event has been seen.
+    """
+
+    def __init__(self):
+        self._data = []
+
+    def feed(self, line):
+        """
+        Consume one line of the stream.
+
+        Args:
+            line (str): A line, with or without its trailing newline.
+
+        Returns:
+            str or None: The event data if this line completed an event.
+        """
+        line = line.rstrip('\r\n')
+        if not line:
+            return self.flush()
+        if line.startswith(':'):  # comment / keep-alive
+            return None
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+        if field == 'data':
+            self._data.append(value)
+        return None
+
+    def flush(self):
+        if not self._data:
+            return None
+        data = '\n'.join(self._data)
+        self._data = []
+        return data
+
+def event_text(data):
+    """
+    Extract the text carried by one streamed event.
+
+    Events may be plain text or JSON objects carrying the text under one of
+    ``content``, ``delta``, ``text``, ``token`` or ``response``, or in
+    OpenAI-style ``choices[0].delta.content``.
+
+    Args:
+        data (str): The event data.
+
+    Returns:
+        str or None: The text fragment, or None if the event carries none.
+
+    Raises:
+        APIError: If the event reports an error.
+    """
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return data
+
+    if not isinstance(payload, (str, dict)):
+        return data
+    return payload_text(payload)
+
+def payload_text(payload):
+    """
+    Extract the text of a decoded response or event payload.
+
+    Looks in the same places as :func:`event_text`.
+
+    Args:
+        payload (str or dict): The decoded payload.
+
+    Returns:
+        str or None: The text, or None if the payload carries none.
+
+    Raises:
+        APIError: If the payload reports an error.
+    """
+    if isinstance(payload, str):
+        return payload
+    if not isinstance(payload, dict):
+        return None
+    if payload.get('error'):
+        raise APIError(f"API stream failed: {payload['error']}")
+    for key in TEXT_KEYS:
+        value = payload.get(key)
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict) and isinstance(value.get('content'), str):
+            return value['content']
+    choices = payload.get('choices')
+    if choices and isinstance(choices[0], dict):
+        delta = choices[0].get('delta') or choices[0].get('message') or {}
+        if isinstance(delta.get('content'), str):
+            return delta['content']
+    return None
+
+def iter_sse_text(lines):
+    """
+    Yield text fragments from an iterable of event-stream lines.
+
+    Args:
+        lines (iterable): Decoded lines of a ``text/event-stream`` body.
+
+    Yields:
+        str: Text fragments as they arrive.
+    """
+    decoder = SSEDecoder()
+    for line in lines:
+        data = decoder.feed(line)
+        if data is None:
+            continue
+        if data == DONE:
+            return
+        text = event_text(data)
+        if text:
+            yield text
+    data = decoder.flush()
+    if data is not None and data != DONE:
+        text = event_text(data)
+        if text:
+            yield text
+
+def iter_response_text(response):
+    """
+    Yield text fragments from a streamed ``requests`` response.
+
+    Event streams are parsed as SSE, JSON bodies are yielded in one piece and
+    any other content type is yielded chunk by chunk as it arrives.
+
+    Args:
+        response (requests.Response): A response opened with ``stream=True``.
+
+    Yields:
+        str: Text fragments as they arrive.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    if response.encoding is None:
+        response.encoding = 'utf-8'
+
+    if 'text/event-stream' in content_type:
+        yield from iter_sse_text(response.iter_lines(decode_unicode=True))
+    elif 'application/json' in content_type:
+        text = event_text(response.text)
+        if text:
+            yield text
+    else:
+        for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+            if chunk:
+                yield chunk
+
+async def aiter_response_text(response):
+    """
+    Async counterpart of :func:`iter_response_text` for ``aiohttp`` responses.
+
+    Args:
+        response (aiohttp.ClientResponse): An open response.
+
+    Yields:
+        str: Text fragments as they arrive.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    encoding = response.charset or 'utf-8'
+
+    if 'text/event-stream' in content_type:
+        decoder = SSEDecoder()
+        async for raw_line in response.content:
+            data = decoder.feed(raw_line.decode(encoding))
+            if data is None:
+                continue
+            if data == DONE:
+                return
+            text = event_text(data)
+            if text:
+                yield text
+        data = decoder.flush()
+        if data is not None and data != DONE:
+            text = event_text(data)
+            if text:
+                yield text
+    elif 'application/json' in content_type:
+        text = event_text(await response.text())
+        if text:
+            yield text
+    else:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        async for chunk in response.content.iter_any():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+class FileTokenStore:
+    """
+    Auth token shared by every process on the host that uses the same file.
+
+    Attach it with ``APIClient(token_store=...)``. When a client needs a new
+    token it takes an exclusive ``flock`` on the file, adopts a token another
+    process has already obtained if there is one, and only authenticates
+    otherwise. N processes therefore cost one authentication per token
+    rotation rather than N.
+
+    The file holds a credential and is created with mode 0600.
+
+    Args:
+        path (str): Path of the token file; created if missing.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError("FileTokenStore requires fcntl and is not available on this platform")
+        self.path = path
+        self._fd = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _file(self):
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    @contextmanager
+    def locked(self):
+        """Hold the store exclusively across a load/authenticate/save sequence."""
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield self
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def load(self):
+        """
+        Read the shared token. Call while holding :meth:`locked`.
+
+        Returns:
+            tuple: ``(token, expires_at, saved_at)`` where ``expires_at`` is a Unix
+            timestamp or None if unknown and ``saved_at`` is when the token was
+            stored; ``(None, None, None)`` if no token has been stored.
+        """
+        fd = self._file()
+        raw = os.pread(fd, os.fstat(fd).st_size, 0)
+        try:
+            state = json.loads(raw)
+        except ValueError:
+            return None, None, None
+        return state.get('token'), state.get('expires_at'), state.get('saved_at')
+
+    def save(self, token, expires_at=None):
+        """
+        Replace the shared token. Call while holding :meth:`locked`.
+
+        Args:
+            token (str): The auth token.
+            expires_at (float, optional): Unix timestamp at which it expires.
+        """
+        fd = self._file()
+        data = json.dumps({'token': token, 'expires_at': expires_at, 'saved_at': time.time()}).encode()
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, data, 0)
@@ -0,0 +1,36 @@
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    """
+    Cheaply estimate the number of model tokens in a text.
+
+    Uses the common ~4 characters per token rule of thumb, rounded up. It is
+    meant for budgeting, not billing.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def estimate_prompt_tokens(payload):
+    """
+    Estimate the prompt tokens of a submitPrompt request body.
+
+    Args:
+        payload (dict): The request body built by ``build_prompt_payload``.
+
+    Returns:
+        int: Estimated tokens of the message plus all context prompts.
+    """
+    total = estimate_tokens(payload.get('message', ''))
+    for prompt in payload.get('contextPrompts') or ():
+        if isinstance(prompt, str):
+            total += estimate_tokens(prompt)
+        elif isinstance(prompt, dict):
+            total += sum(estimate_tokens(value) for value in prompt.values() if isinstance(value, str))
+    return total
@@ -0,0 +1,144 @@
+"""
+Request body compression and streamed request bodies.
+"""
+import codecs
+import json
+import zlib
+
+ALGORITHMS = ('gzip', 'zstd')
+
+def is_stream(body):
+    """
+    Tell whether a body is a file-like object or an iterator rather than a value.
+
+    Streamed bodies are sent with chunked transfer encoding and cannot be
+    replayed, so requests carrying them are never retried.
+    """
+    return hasattr(body, 'read') or hasattr(body, '__next__')
+
+def iter_chunks(source, chunk_size=65536):
+    """
+    Yield the chunks of a file-like object or an iterable of chunks.
+
+    Args:
+        source (file or iterable): Object with a ``read`` method, or an iterable
+            of ``str``/``bytes`` chunks.
+        chunk_size (int): Read size for file-like objects.
+    """
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+def json_text_stream(source, field='text', chunk_size=65536):
+    """
+    Encode ``{field: <text of source>}`` as JSON, chunk by chunk.
+
+    The text is escaped as it is read, so a large document never has to be
+    held in memory as one string. ``bytes`` chunks are decoded as UTF-8,
+    including characters split across chunk boundaries.
+
+    Args:
+        source (file or iterable): The text, as a file-like object or an iterable
+            of ``str``/``bytes`` chunks.
+        field (str): The JSON field holding the text.
+        chunk_size (int): Read size for file-like objects.
+
+    Yields:
+        bytes: UTF-8 encoded JSON.
+    """
+    yield ('{' + json.dumps(field) + ':"').encode('utf-8')
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in iter_chunks(source, chunk_size):
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield json.dumps(chunk, ensure_ascii=False)[1:-1].encode('utf-8')
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield json.dumps(tail, ensure_ascii=False)[1:-1].encode('utf-8')
+    yield b'"}'
+
+class Compression:
+    """
+    Request body compression for ``APIClient(compression=...)``.
+
+    Bodies of at least ``threshold`` bytes are compressed and sent with a
+    ``Content-Encoding`` header; smaller ones are sent as-is since compressing
+    them costs more than it saves. Streamed bodies are always compressed, chunk
+    by chunk. If the server answers 415 to a compressed body, the client resends
+    it uncompressed and turns compression off by setting ``supported`` to False.
+
+    Args:
+        algorithm (str): 'gzip', or 'zstd' (requires the ``zstandard`` package).
+        threshold (int): Smallest body, in bytes, that is compressed.
+        level (int, optional): Compression level. Defaults to 6 for gzip and 3 for zstd.
+
+    Raises:
+        ImportError: If 'zstd' is requested and ``zstandard`` is not installed.
+        ValueError: If the algorithm is unknown.
+    """
+
+    def __init__(self, algorithm='gzip', threshold=1024, level=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown compression '{algorithm}', expected one of: {', '.join(ALGORITHMS)}")
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.supported = True
+        if algorithm == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compression requires zstandard; install it with "
+                                  "'pip install strongly[compression]'") from None
+            self._zstd = zstandard.ZstdCompressor(level=3 if level is None else level)
+        else:
+            self.level = 6 if level is None else level
+
+    def _compressobj(self):
+        if self.algorithm == 'zstd':
+            return self._zstd.compressobj()
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, body):
+        """Compress a complete body."""
+        if self.algorithm == 'zstd':
+            return self._zstd.compress(body)
+        compressor = self._compressobj()
+        return compressor.compress(body) + compressor.flush()
+
+    def compress_stream(self, chunks):
+        """Compress an iterable of ``bytes`` chunks lazily."""
+        compressor = self._compressobj()
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def encode(self, body):
+        """
+        Compress a request body if it is worth it.
+
+        Args:
+            body (bytes, str or iterable): The body.
+
+        Returns:
+            tuple: ``(body, content_encoding)``; the encoding is None when the body
+            is sent uncompressed.
+        """
+        if not self.supported or body is None:
+            return body, None
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if isinstance(body, (bytes, bytearray)):
+            if len(body) < self.threshold:
+                return body, None
+            return self.compress(body), self.algorithm
+        return self.compress_stream(iter_chunks(body)), self.algorithm
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import Mock
 from strongly import APIClient
@@ -16,3 +17,15 @@ def api_client(mock_env, mock_session):
     client = APIClient()
     client.session = mock_session
     return client
+
+@pytest.fixture
+def make_response():
+    def factory(status_code=200, payload=None, headers=None, text=''):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = payload
+        response.content = json.dumps(payload).encode() if payload is not None else b''
+        response.text = text or response.content.decode()
+        return response
+    return factory
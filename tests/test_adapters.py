@@ -0,0 +1,85 @@
+import json
+import socket
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import requests
+from requests.adapters import HTTPAdapter
+from strongly import APIClient
+from strongly.adapters import PoolingAdapter, keepalive_socket_options
+
+class JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'ok': True}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JSONHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def test_keepalive_socket_options():
+    options = keepalive_socket_options(idle=30)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        assert (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30) in options
+
+def test_adapter_pool_configuration():
+    adapter = PoolingAdapter(pool_connections=4, pool_maxsize=32, pool_block=True)
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == 32
+    assert adapter.poolmanager.connection_pool_kw['block'] is True
+    assert adapter.poolmanager.connection_pool_kw['socket_options'] == adapter.socket_options
+
+def test_adapter_applies_default_timeout():
+    adapter = PoolingAdapter(timeout=(3, 30))
+    with patch.object(HTTPAdapter, 'send') as send:
+        adapter.send('request')
+        adapter.send('request', timeout=5)
+    assert send.call_args_list[0].kwargs['timeout'] == (3, 30)
+    assert send.call_args_list[1].kwargs['timeout'] == 5
+
+def test_connection_stats_counts_reuse(local_server):
+    adapter = PoolingAdapter()
+    session = requests.Session()
+    session.mount('http://', adapter)
+
+    for _ in range(5):
+        assert session.get(f"{local_server}/ping").json() == {'ok': True}
+
+    stats = adapter.connection_stats()
+    assert stats['requests'] == 5
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 4
+
+def test_connection_stats_cover_live_pools_only(local_server):
+    adapter = PoolingAdapter(pool_connections=1)
+    session = requests.Session()
+    session.mount('http://', adapter)
+
+    session.get(f"{local_server}/ping")
+    session.get(local_server.replace('127.0.0.1', 'localhost') + '/ping')
+
+    # The first host's pool was evicted, and its counts with it.
+    assert adapter.connection_stats() == {
+        'pools': 1, 'requests': 1, 'connections_opened': 1, 'connections_reused': 0}
+
+def test_client_mounts_configured_adapter():
+    client = APIClient(test_env={'API_HOST': 'https://api.example.com', 'API_KEY': 'key'},
+                       pool_maxsize=64, connect_timeout=2, read_timeout=20)
+    assert client.session.get_adapter('https://api.example.com') is client.adapter
+    assert client.adapter.timeout == (2, 20)
+    assert client.connection_stats()['requests'] == 0
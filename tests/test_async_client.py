@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from strongly import AsyncAPIClient
+from strongly.exceptions import AuthenticationError, APIError
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+TEST_ENV = {'API_HOST': 'http://placeholder', 'API_KEY': 'test-api-key'}
+
+def build_app(state):
+    async def authenticate(request):
+        state['auth_calls'] += 1
+        if request.headers.get('X-API-Key') != 'test-api-key':
+            return web.Response(status=401, text='Bad key')
+        await asyncio.sleep(0.01)
+        state['token'] = f"token-{state['auth_calls']}"
+        return web.json_response({'authToken': state['token']})
+
+    async def models(request):
+        if request.headers.get('X-Auth-Token') != state['token']:
+            return web.Response(status=401, text='Unauthorized')
+        return web.json_response({'models': [{'id': '1', 'name': 'Model 1'}], 'userId': 'u'})
+
+    async def filter_text(request):
+        if request.headers.get('X-Auth-Token') != state['token']:
+            return web.Response(status=401, text='Unauthorized')
+        body = await request.json()
+        return web.json_response({'filteredText': body['text'].upper(), 'filterCounts': {}, 'hashMap': {}})
+
+    async def broken(request):
+        return web.Response(status=500, text='Internal Server Error')
+
+    app = web.Application()
+    app.router.add_get('/api/v1/authenticate', authenticate)
+    app.router.add_get('/api/v1/models', models)
+    app.router.add_post('/api/v1/filterText', filter_text)
+    app.router.add_get('/api/v1/tokens', broken)
+    return app
+
+def run_with_server(test):
+    async def runner():
+        state = {'auth_calls': 0, 'token': None}
+        server = TestServer(build_app(state))
+        await server.start_server()
+        client = AsyncAPIClient(test_env=dict(TEST_ENV, API_HOST=str(server.make_url('')).rstrip('/')))
+        try:
+            async with client:
+                await test(client, state)
+        finally:
+            await server.close()
+    asyncio.run(runner())
+
+def test_init_missing_env():
+    with pytest.raises(ValueError):
+        AsyncAPIClient(test_env={})
+
+def test_authenticate_and_get_models():
+    async def test(client, state):
+        result = await client.get_models()
+        assert result['models'][0]['name'] == 'Model 1'
+        assert client._auth_token == 'token-1'
+        assert state['auth_calls'] == 1
+    run_with_server(test)
+
+def test_authenticate_failure():
+    async def test(client, state):
+        client.api_key = 'wrong-key'
+        with pytest.raises(AuthenticationError):
+            await client.authenticate()
+    run_with_server(test)
+
+def test_concurrent_calls_share_one_reauth():
+    async def test(client, state):
+        await client.authenticate()
+        state['token'] = 'rotated-on-server'
+        results = await asyncio.gather(*(client.filter_text(f"text {i}") for i in range(50)))
+        assert [r['filteredText'] for r in results] == [f"TEXT {i}" for i in range(50)]
+        assert state['auth_calls'] == 2
+    run_with_server(test)
+
+def test_call_api_failure():
+    async def test(client, state):
+        with pytest.raises(APIError):
+            await client.check_token_usage()
+    run_with_server(test)
+
+def test_filter_text_invalid_input():
+    client = AsyncAPIClient(test_env=TEST_ENV)
+    for invalid_input in [None, "", 123, []]:
+        with pytest.raises(ValueError):
+            asyncio.run(client.filter_text(invalid_input))
+
+def test_submit_prompt_invalid_input():
+    client = AsyncAPIClient(test_env=TEST_ENV)
+    with pytest.raises(ValueError):
+        asyncio.run(client.submit_prompt({}, "message", "model"))
@@ -0,0 +1,104 @@
+import pytest
+import requests
+from unittest.mock import Mock
+from strongly import APIClient
+from strongly.balancer import HostBalancer
+from strongly.exceptions import AuthenticationError
+
+HOSTS = ['https://eu.example.com', 'https://us.example.com']
+
+def test_least_outstanding_routing():
+    balancer = HostBalancer(HOSTS)
+    first = balancer.acquire()
+    second = balancer.acquire()
+    assert {first.url, second.url} == set(HOSTS)
+
+    balancer.release(first, 0.01, True)
+    assert balancer.acquire() is first
+
+def test_latency_routing_prefers_fast_host():
+    balancer = HostBalancer(HOSTS, strategy='latency')
+    eu, us = balancer.hosts
+    balancer.release(balancer.acquire(exclude={us.url}), 0.5, True)
+    balancer.release(balancer.acquire(exclude={eu.url}), 0.05, True)
+    assert all(balancer.acquire() is us for _ in range(3))  # 0.05 * 3 in flight < 0.5
+
+def test_failing_host_is_ejected_and_probed_back():
+    balancer = HostBalancer(HOSTS, failure_threshold=2, ejection_time=0.0)
+    eu, us = balancer.hosts
+    for _ in range(2):
+        balancer.release(balancer.acquire(exclude={us.url}), 0.01, False)
+    assert eu.ejected_until is not None
+
+    probe = balancer.acquire(exclude={us.url})  # ejection time is over: one probe is let through
+    assert probe is eu and eu.probing
+    assert balancer.acquire(exclude={us.url}) is us  # no second request while probing
+    balancer.release(probe, 0.01, False)
+    assert eu.ejections == 2  # failed probe: ejected again, for longer
+
+    probe = balancer.acquire(exclude={us.url})
+    balancer.release(probe, 0.01, True)
+    assert eu.ejected_until is None and not eu.probing
+    assert balancer.stats()[0]['errors'] == 3
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        HostBalancer(HOSTS, strategy='random')
+
+@pytest.fixture
+def multi_host_client(monkeypatch, make_response):
+    monkeypatch.setenv('API_HOST', ','.join(HOSTS))
+    monkeypatch.setenv('API_KEY', 'test-api-key')
+    client = APIClient()
+    client.session = Mock()
+    client.session.get.side_effect = lambda url, headers: make_response(
+        payload={'authToken': f"token-{url.split('//')[1].split('.')[0]}"})
+    return client
+
+def test_client_fails_over_with_per_host_tokens(multi_host_client, make_response, monkeypatch):
+    monkeypatch.setattr('strongly.balancer.random.choice', lambda hosts: hosts[0])  # EU wins ties
+
+    def request(method, url, headers=None, **kwargs):
+        if url.startswith(HOSTS[0]):
+            raise requests.ConnectionError('connection refused')
+        assert headers['X-Auth-Token'] == 'token-us'
+        return make_response(payload={'models': []})
+
+    multi_host_client.session.request.side_effect = request
+
+    for _ in range(3):
+        assert multi_host_client.get_models() == {'models': []}
+
+    assert multi_host_client.hosts == HOSTS
+    stats = {host['host']: host for host in multi_host_client.host_stats()}
+    assert stats[HOSTS[0]]['errors'] == 3
+    assert stats[HOSTS[0]]['ejected']  # three consecutive failures
+    assert stats[HOSTS[1]]['requests'] == 3
+    assert stats[HOSTS[1]]['errors'] == 0
+
+def test_client_fails_over_when_a_host_cannot_authenticate(multi_host_client, make_response, monkeypatch):
+    monkeypatch.setattr('strongly.balancer.random.choice', lambda hosts: hosts[0])  # EU wins ties
+
+    def authenticate(url, headers):
+        if url.startswith(HOSTS[0]):
+            return make_response(status_code=503, text='unavailable')
+        return make_response(payload={'authToken': 'token-us'})
+
+    def request(method, url, headers=None, **kwargs):
+        assert url.startswith(HOSTS[1]) and headers['X-Auth-Token'] == 'token-us'
+        return make_response(payload={'response': 'ok'})
+
+    multi_host_client.session.get.side_effect = authenticate
+    multi_host_client.session.request.side_effect = request
+
+    session = {'sessionId': 's1', 'sessionName': 'Support'}
+    assert multi_host_client.submit_prompt(session, 'Hi', 'gpt-4') == {'response': 'ok'}
+    stats = {host['host']: host for host in multi_host_client.host_stats()}
+    assert stats[HOSTS[0]]['errors'] == 1
+    assert stats[HOSTS[1]]['errors'] == 0
+
+def test_rejected_credentials_are_not_failed_over(multi_host_client, make_response):
+    multi_host_client.session.get.side_effect = lambda url, headers: make_response(status_code=401, text='bad key')
+    with pytest.raises(AuthenticationError):
+        multi_host_client.get_models()
+    assert multi_host_client.session.get.call_count == 1
@@ -0,0 +1,112 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from strongly.batch import merge_filter_results, ordered_map, split_text
+
+def test_split_text_short_text_unchanged():
+    assert split_text("short", 100) == ["short"]
+    assert split_text("short", None) == ["short"]
+
+def test_split_text_prefers_whitespace_boundaries():
+    text = "alpha beta gamma\ndelta epsilon"
+    pieces = split_text(text, 12)
+    assert ''.join(pieces) == text
+    assert all(len(piece) <= 12 for piece in pieces)
+    assert pieces[0] == "alpha beta "
+
+def test_split_text_keeps_long_runs_whole():
+    assert split_text("x" * 25, 10) == ["x" * 25]
+    assert split_text("x" * 25 + " yy", 10) == ["x" * 25 + " ", "yy"]
+
+def test_split_text_keeps_entity_near_boundary_whole():
+    email = "john.doe@example.com"
+    text = "word " * 18 + email + " and more words after it"
+    assert text.index(email) < 100 < text.index(email) + len(email)
+
+    pieces = split_text(text, 100)
+
+    assert ''.join(pieces) == text
+    assert any(email in piece for piece in pieces)
+    assert all(len(piece) <= 100 for piece in pieces)
+
+def test_split_text_prefers_sentence_boundaries():
+    text = "First sentence here. Call me at +1 555 123 4567 today."
+    pieces = split_text(text, 36)  # the last space before the limit is inside the number
+    assert pieces[0] == "First sentence here. "
+
+def test_merge_filter_results():
+    merged = merge_filter_results([
+        {'filteredText': 'a [1:email] ', 'filterCounts': {'1': 1}, 'hashMap': {'[1:email]': 'a@b.c'}},
+        {'filteredText': 'b [1:email]', 'filterCounts': {'1': 1, '2': 3}, 'hashMap': {'[2:email]': 'd@e.f'}},
+    ])
+    assert merged['filteredText'] == 'a [1:email] b [1:email]'
+    assert merged['filterCounts'] == {'1': 2, '2': 3}
+    assert merged['hashMap'] == {'[1:email]': 'a@b.c', '[2:email]': 'd@e.f'}
+
+def test_merge_filter_results_rejects_clashing_placeholders():
+    pieces = [
+        {'filteredText': 'a [1:email] ', 'filterCounts': {'1': 1}, 'hashMap': {'[1:email]': 'a@b.c'}},
+        {'filteredText': 'b [1:email]', 'filterCounts': {'1': 1}, 'hashMap': {'[1:email]': 'd@e.f'}},
+    ]
+    with pytest.raises(ValueError):
+        merge_filter_results(pieces)
+
+    pieces[1]['hashMap'] = {'[1:email]': 'a@b.c'}  # same value: no clash
+    assert merge_filter_results(pieces)['hashMap'] == {'[1:email]': 'a@b.c'}
+
+def test_ordered_map_preserves_order_and_bounds_concurrency():
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    def work(item):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(0.001 * (item % 3))
+        with lock:
+            active['now'] -= 1
+        return item * 2
+
+    assert list(ordered_map(work, range(50), concurrency=4)) == [i * 2 for i in range(50)]
+    assert active['peak'] <= 4
+
+def test_ordered_map_consumes_input_lazily():
+    consumed = []
+
+    def source():
+        for i in range(1000):
+            consumed.append(i)
+            yield i
+
+    results = ordered_map(lambda x: x, source(), concurrency=2)
+    assert next(results) == 0
+    assert len(consumed) <= 3
+    results.close()
+
+def test_filter_texts(api_client):
+    api_client.filter_text = Mock(side_effect=lambda text: {
+        'filteredText': text.upper(), 'filterCounts': {'1': 1}, 'hashMap': {}})
+
+    results = list(api_client.filter_texts(["one", "two words here", "three"], concurrency=2,
+                                           max_chars_per_request=6))
+
+    assert [r['filteredText'] for r in results] == ["ONE", "TWO WORDS HERE", "THREE"]
+    assert results[1]['filterCounts'] == {'1': 3}
+    assert api_client.filter_text.call_count == 5
+
+def test_filter_texts_invalid_input(api_client):
+    api_client.filter_text = Mock(return_value={})
+    with pytest.raises(ValueError):
+        list(api_client.filter_texts(["ok", ""]))
+
+def test_filter_texts_raises_on_placeholder_clash(api_client):
+    def filter_text(text):
+        return {'filteredText': '[1:email]', 'filterCounts': {'1': 1}, 'hashMap': {'[1:email]': text}}
+
+    api_client.filter_text = Mock(side_effect=filter_text)
+    with pytest.raises(ValueError, match='max_chars_per_request'):
+        list(api_client.filter_texts(["aaaa bbbb"], max_chars_per_request=5))
+
+    # The document is never sent in one request larger than the cap.
+    assert [call.args[0] for call in api_client.filter_text.call_args_list] == ["aaaa ", "bbbb"]
@@ -0,0 +1,87 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from strongly.bulk import BulkExecutor, completed_jobs
+
+SESSION = {'sessionId': 's1', 'sessionName': 'Bulk'}
+
+class PromptHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = {}
+    lock = threading.Lock()
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def do_GET(self):
+        self._count('authenticate')
+        self._reply(200, {'authToken': 'shared-token', 'expiresIn': 3600})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self._count('submitPrompt')
+        if body['message'] == 'fail':
+            self._reply(500, {'error': 'boom'})
+        else:
+            self._reply(200, {'response': body['message'].upper()})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def prompt_server():
+    PromptHandler.calls = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PromptHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def read_output(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def make_executor(host, **kwargs):
+    return BulkExecutor(workers=2, threads_per_worker=2, chunk_size=3,
+                        client_options={'env_file': None, 'host': host, 'api_key': 'key'}, **kwargs)
+
+def test_bulk_executor_streams_results_and_shares_auth(prompt_server, tmp_path):
+    jobs = [{'session': SESSION, 'message': f'prompt {i}', 'model': 'gpt'} for i in range(10)]
+    jobs[4]['message'] = 'fail'
+    output = tmp_path / 'results.jsonl'
+
+    stats = make_executor(prompt_server, rate=1000).run(jobs, str(output))
+
+    assert stats == {'submitted': 10, 'succeeded': 9, 'failed': 1, 'skipped': 0}
+    records = {record['id']: record for record in read_output(output)}
+    assert records[0]['result'] == {'response': 'PROMPT 0'}
+    assert records[4]['status_code'] == 500
+    assert PromptHandler.calls['authenticate'] == 1  # one token shared by both workers
+
+def test_bulk_executor_resumes_from_output(prompt_server, tmp_path):
+    jobs_file = tmp_path / 'jobs.jsonl'
+    jobs_file.write_text(''.join(
+        json.dumps({'id': f'job-{i}', 'session': SESSION, 'message': f'm{i}', 'model': 'gpt'}) + '\n'
+        for i in range(5)))
+    output = tmp_path / 'results.jsonl'
+    output.write_text(json.dumps({'id': 'job-0', 'result': {'response': 'M0'}}) + '\n'
+                      + json.dumps({'id': 'job-1', 'error': 'timeout'}) + '\n'
+                      + '{"id": "job-2", "res')  # torn write from a crash
+
+    stats = make_executor(prompt_server).run(str(jobs_file), str(output))
+
+    assert stats['skipped'] == 1
+    assert stats['succeeded'] == 4
+    assert PromptHandler.calls['submitPrompt'] == 4
+    assert completed_jobs(str(output)) == {f'job-{i}' for i in range(5)}
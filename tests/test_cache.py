@@ -0,0 +1,98 @@
+import time
+import pytest
+from strongly import APIClient
+from strongly.cache import CacheEntry, MemoryCache, ResponseCache, SQLiteCache
+
+MODELS = {'models': [{'id': '1', 'name': 'Model 1'}], 'userId': 'test-user-id'}
+
+@pytest.fixture
+def cached_client(api_client):
+    api_client._auth_token = 'test-auth-token'
+    api_client.cache = ResponseCache(MemoryCache())
+    return api_client
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    cache.set('a', CacheEntry(1))
+    cache.set('b', CacheEntry(2))
+    cache.get('a')
+    cache.set('c', CacheEntry(3))
+    assert cache.get('b') is None
+    assert cache.get('a').value == 1
+    assert cache.get('c').value == 3
+
+def test_memory_cache_returns_copies():
+    cache = MemoryCache()
+    value = {'models': []}
+    cache.set('k', CacheEntry(value))
+    value['models'].append('mutated')
+    cache.get('k').value['models'].append('mutated again')
+    assert cache.get('k').value == {'models': []}
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    first = SQLiteCache(path)
+    second = SQLiteCache(path)
+    first.set('/api/v1/models|k', CacheEntry(MODELS, 'etag-1', time.time() + 60))
+
+    entry = second.get('/api/v1/models|k')
+    assert entry.value == MODELS
+    assert entry.etag == 'etag-1'
+    assert entry.fresh
+
+    second.clear('/api/v1/models|')
+    assert first.get('/api/v1/models|k') is None
+
+def test_sqlite_cache_eviction(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'cache.db'), max_entries=3)
+    for i in range(10):
+        cache.set(f'key-{i}', CacheEntry(i))
+    assert len(cache) == 3
+    assert cache.get('key-9').value == 9
+
+def test_get_models_served_from_cache(cached_client, make_response):
+    cached_client.session.request.return_value = make_response(payload=MODELS)
+
+    assert cached_client.get_models() == MODELS
+    assert cached_client.get_models() == MODELS
+
+    assert cached_client.session.request.call_count == 1
+    assert cached_client.cache_stats()['hits'] == 1
+    assert cached_client.cache_stats()['misses'] == 1
+
+def test_expired_entry_revalidated_with_etag(cached_client, make_response):
+    cached_client.cache.ttls['/api/v1/models'] = 0
+    cached_client.session.request.side_effect = [
+        make_response(payload=MODELS, headers={'ETag': '"v1"'}),
+        make_response(304),
+    ]
+
+    assert cached_client.get_models() == MODELS
+    assert cached_client.get_models() == MODELS
+
+    second_headers = cached_client.session.request.call_args_list[1].kwargs['headers']
+    assert second_headers['If-None-Match'] == '"v1"'
+    assert cached_client.cache_stats()['revalidations'] == 1
+
+def test_invalidate_cache(cached_client, make_response):
+    cached_client.session.request.return_value = make_response(payload=MODELS)
+
+    cached_client.get_models()
+    cached_client.invalidate_cache('/api/v1/models')
+    cached_client.get_models()
+
+    assert cached_client.session.request.call_count == 2
+
+def test_uncached_endpoints_and_posts_bypass_cache(cached_client, make_response):
+    cached_client.session.request.return_value = make_response(payload={'filteredText': 'x'})
+
+    cached_client.filter_text('x')
+    cached_client.filter_text('x')
+
+    assert cached_client.session.request.call_count == 2
+    assert cached_client.cache_stats()['misses'] == 0
+
+def test_cache_disabled_by_default(mock_env):
+    client = APIClient()
+    assert client.cache is None
+    assert client.cache_stats() == {}
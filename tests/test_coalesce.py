@@ -0,0 +1,71 @@
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from strongly.coalesce import RequestCoalescer
+from strongly.exceptions import APIError
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+def test_key_only_for_idempotent_or_pure_calls():
+    coalescer = RequestCoalescer()
+    assert coalescer.key('GET', '/api/v1/models', {}) is not None
+    assert coalescer.key('POST', '/api/v1/filterText', {'json': {'text': 'a'}}) is not None
+    assert coalescer.key('POST', '/api/v1/submitPrompt', {'json': {}}) is None
+    assert coalescer.key('GET', '/api/v1/models', {'stream': True}) is None
+    assert (coalescer.key('POST', '/api/v1/filterText', {'json': {'text': 'a'}})
+            != coalescer.key('POST', '/api/v1/filterText', {'json': {'text': 'b'}}))
+    assert RequestCoalescer(post_endpoints=()).key('POST', '/api/v1/filterText', {}) is None
+
+@pytest.fixture
+def coalescing_client(api_client):
+    api_client._auth_token = 'test-auth-token'
+    api_client.coalescer = RequestCoalescer()
+    return api_client
+
+def test_identical_concurrent_calls_share_one_request(coalescing_client, make_response):
+    release = threading.Event()
+
+    def slow_request(*args, **kwargs):
+        release.wait(5)
+        return make_response(payload={'models': [{'id': '1'}]})
+
+    coalescing_client.session.request.side_effect = slow_request
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(coalescing_client.get_models) for _ in range(5)]
+        wait_for(lambda: coalescing_client.coalescer.followers == 4)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert coalescing_client.session.request.call_count == 1
+    assert all(result == {'models': [{'id': '1'}]} for result in results)
+    assert len({id(result) for result in results}) == 5  # every caller gets its own copy
+    assert coalescing_client.coalescer.stats() == {'leaders': 1, 'followers': 4, 'in_flight': 0}
+
+def test_coalesced_failure_is_raised_to_every_caller(coalescing_client, make_response):
+    release = threading.Event()
+
+    def failing_request(*args, **kwargs):
+        release.wait(5)
+        return make_response(status_code=400, text='bad text')
+
+    coalescing_client.session.request.side_effect = failing_request
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(coalescing_client.filter_text, 'same text') for _ in range(3)]
+        wait_for(lambda: coalescing_client.coalescer.followers == 2)
+        release.set()
+        for future in futures:
+            with pytest.raises(APIError):
+                future.result()
+
+    assert coalescing_client.session.request.call_count == 1
+
+def test_sequential_calls_are_not_coalesced(coalescing_client, make_response):
+    coalescing_client.session.request.return_value = make_response(payload={'filters': []})
+    coalescing_client.get_applied_filters()
+    coalescing_client.get_applied_filters()
+    assert coalescing_client.session.request.call_count == 2
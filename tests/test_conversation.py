@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import Mock
+from strongly.conversation import Conversation
+from strongly.exceptions import APIError
+
+SESSION = {'sessionId': 'id', 'sessionName': 'name'}
+
+@pytest.fixture
+def client():
+    client = Mock()
+    client.submit_prompt.side_effect = lambda session, message, *args: {'content': f"re: {message}"}
+    return client
+
+def test_send_records_turns_and_sends_context(client):
+    chat = Conversation(client, SESSION, 'gpt-4o')
+    chat.send('hello')
+    chat.send('again', model='other')
+
+    client.submit_prompt.assert_called_with(SESSION, 'again', 'other', None, [
+        {'role': 'user', 'content': 'hello'},
+        {'role': 'assistant', 'content': 're: hello'},
+    ])
+    assert len(chat) == 4
+
+def test_context_window_fits_token_budget(client):
+    pinned = [{'role': 'system', 'content': 'x' * 8}]  # 2 tokens
+    chat = Conversation(client, SESSION, 'gpt-4o', max_context_tokens=10, max_turns=5, pinned=pinned)
+    for i in range(8):
+        chat.add('user', f"{i}" * 12)  # 3 tokens each
+
+    assert len(chat) == 5  # ring buffer keeps the newest turns
+    window = chat.context_window()
+    assert window[0] == pinned[0]
+    assert [turn['content'] for turn in window[1:]] == ['6' * 12, '7' * 12]
+    assert chat.context_window(max_tokens=2) == pinned
+
+def test_failed_send_records_nothing(client):
+    client.submit_prompt.side_effect = APIError("API call failed: boom", status_code=500)
+    chat = Conversation(client, SESSION, 'gpt-4o')
+    with pytest.raises(APIError):
+        chat.send('hello')
+    assert len(chat) == 0
+
+def test_stream_records_reply_when_finished(client):
+    client.stream_prompt.return_value = iter(['Par', 'is'])
+    chat = Conversation(client, SESSION, 'gpt-4o')
+
+    assert ''.join(chat.stream('capital of France?')) == 'Paris'
+    assert chat.history == [{'role': 'user', 'content': 'capital of France?'},
+                            {'role': 'assistant', 'content': 'Paris'}]
@@ -1,4 +1,4 @@
-from strongly.exceptions import AuthenticationError, APIError
+from strongly.exceptions import AuthenticationError, APIError, CircuitOpenError
 
 def test_authentication_error():
     error = AuthenticationError("Test authentication error")
@@ -7,3 +7,13 @@ def test_authentication_error():
 def test_api_error():
     error = APIError("Test API error")
     assert str(error) == "Test API error"
+
+def test_api_error_status_code():
+    error = APIError("Test API error", status_code=503)
+    assert error.status_code == 503
+    assert APIError("Test API error").status_code is None
+
+def test_circuit_open_error_is_api_error():
+    error = CircuitOpenError("Circuit open", status_code=503)
+    assert isinstance(error, APIError)
+    assert str(error) == "Circuit open"
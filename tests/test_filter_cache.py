@@ -0,0 +1,61 @@
+from unittest.mock import Mock
+from strongly.cache import SQLiteCache
+from strongly.filter_cache import FilterCache
+
+FILTERS = {'filters': [{'_id': '11', 'name': 'Address'}], 'userId': 'test-user-id'}
+RESULT = {'filteredText': 'Hello [1:name]', 'filterCounts': {'1': 1}, 'hashMap': {'[1:name]': 'Bob'}}
+
+def filtering_client(api_client, filter_cache):
+    api_client.filter_cache = filter_cache
+    api_client.call_api = Mock(side_effect=lambda method, endpoint, **kwargs:
+                               FILTERS if endpoint == '/api/v1/filters' else dict(RESULT))
+    return api_client
+
+def filter_calls(client):
+    return [c for c in client.call_api.call_args_list if c.args[1] == '/api/v1/filterText']
+
+def test_version_of_is_order_insensitive_for_keys():
+    first = FilterCache.version_of({'filters': [{'_id': '1', 'name': 'A'}]})
+    second = FilterCache.version_of({'filters': [{'name': 'A', '_id': '1'}]})
+    changed = FilterCache.version_of({'filters': [{'_id': '1', 'name': 'B'}]})
+    assert first == second
+    assert first != changed
+
+def test_repeated_text_served_from_memo(api_client):
+    client = filtering_client(api_client, FilterCache())
+
+    assert client.filter_text("Hello Bob") == RESULT
+    assert client.filter_text("Hello Bob") == RESULT
+    client.filter_text("Hello Alice")
+
+    assert len(filter_calls(client)) == 2
+    assert client.filter_cache.stats()['hits'] == 1
+
+def test_filter_config_change_misses(api_client):
+    client = filtering_client(api_client, FilterCache(version_ttl=0))
+
+    client.filter_text("Hello Bob")
+    FILTERS_CHANGED = {'filters': [{'_id': '12', 'name': 'Email'}]}
+    client.call_api.side_effect = lambda method, endpoint, **kwargs: (
+        FILTERS_CHANGED if endpoint == '/api/v1/filters' else dict(RESULT))
+    client.filter_text("Hello Bob")
+
+    assert len(filter_calls(client)) == 2
+
+def test_version_checked_once_per_ttl(api_client):
+    client = filtering_client(api_client, FilterCache(version_ttl=60))
+
+    for i in range(5):
+        client.filter_text(f"text {i}")
+
+    version_calls = [c for c in client.call_api.call_args_list if c.args[1] == '/api/v1/filters']
+    assert len(version_calls) == 1
+
+def test_persistent_store_survives_new_client(api_client, tmp_path):
+    path = str(tmp_path / 'filters.db')
+    client = filtering_client(api_client, FilterCache(SQLiteCache(path)))
+    client.filter_text("Hello Bob")
+
+    client.filter_cache = FilterCache(SQLiteCache(path))
+    assert client.filter_text("Hello Bob") == RESULT
+    assert len(filter_calls(client)) == 1
@@ -0,0 +1,120 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from strongly.hedge import Hedging
+
+def response(status_code=200):
+    result = Mock()
+    result.status_code = status_code
+    return result
+
+def warmed(hedging, endpoint='/api/v1/models', latency=0.001, count=20):
+    for _ in range(count):
+        hedging.observe(endpoint, latency)
+    return hedging
+
+def test_no_hedging_until_enough_samples():
+    hedging = Hedging(min_samples=5)
+    assert hedging.delay('/api/v1/models') is None
+    warmed(hedging, count=5)
+    assert hedging.delay('/api/v1/models') == hedging.min_delay
+
+def test_delay_follows_recent_percentile():
+    hedging = Hedging(percentile=90, min_delay=0.0, window=10, min_samples=10)
+    for latency in range(1, 11):
+        hedging.observe('/api/v1/models', latency / 100)
+    assert hedging.delay('/api/v1/models') == pytest.approx(0.09)
+
+def test_slow_primary_is_hedged_and_loser_closed():
+    hedging = warmed(Hedging(budget=1.0))
+    slow, fast = response(), response()
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            return slow
+        return fast
+
+    count = Mock()
+    assert hedging.run('/api/v1/models', send, count=count) is fast
+    release.set()
+    deadline = time.monotonic() + 5
+    while not slow.close.called and time.monotonic() < deadline:
+        time.sleep(0.001)
+    slow.close.assert_called_once()
+    assert (hedging.fired, hedging.won) == (1, 1)
+    assert [call.args[0] for call in count.call_args_list] == ['hedges', 'hedge_wins']
+
+def test_budget_caps_hedges():
+    hedging = warmed(Hedging(budget=0.25))
+    for _ in range(8):
+        hedging.run('/api/v1/models', lambda: time.sleep(0.02) or response())
+    assert hedging.requests == 8
+    assert hedging.fired == 2
+    assert hedging.denied == 6
+
+def test_admit_can_refuse_hedge():
+    hedging = warmed(Hedging(budget=1.0))
+    hedging.run('/api/v1/models', lambda: time.sleep(0.02) or response(), admit=lambda: False)
+    assert hedging.fired == 0 and hedging.denied == 1
+
+def test_admit_is_called_without_holding_the_lock():
+    hedging = warmed(Hedging(budget=1.0))
+    held = []
+    hedging.run('/api/v1/models', lambda: time.sleep(0.02) or response(),
+                admit=lambda: held.append(hedging._lock.locked()) or False)
+    assert held == [False]
+
+def test_busy_workers_do_not_queue_requests():
+    hedging = warmed(Hedging(budget=1.0, max_workers=1))
+    release = threading.Event()
+    blocked = threading.Thread(target=hedging.run,
+                               args=('/api/v1/models', lambda: release.wait(5) and response()))
+    blocked.start()
+    deadline = time.monotonic() + 5
+    while hedging._busy < 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    threads = []
+    result = hedging.run('/api/v1/models', lambda: threads.append(threading.current_thread()) or response())
+    release.set()
+    blocked.join(5)
+    assert result.status_code == 200
+    assert threads == [threading.current_thread()]
+
+def test_error_on_one_copy_waits_for_the_other():
+    hedging = warmed(Hedging(budget=1.0))
+    good = response()
+    calls = []
+
+    def send():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.02)
+            return good
+        return response(503)
+
+    assert hedging.run('/api/v1/models', send) is good
+    assert hedging.won == 0
+
+def test_client_hedges_idempotent_calls_only(api_client, mock_session, make_response):
+    api_client._auth_token = 'token'
+    api_client._auth_expires_at = time.monotonic() + 3600
+    api_client.hedging = warmed(Hedging(budget=1.0), '/api/v1/session/create')
+    warmed(api_client.hedging, '/api/v1/models')
+
+    def request(method, url, **kwargs):
+        time.sleep(0.02)
+        return make_response(payload={'ok': True})
+
+    mock_session.request.side_effect = request
+    api_client.create_session('Support')
+    assert mock_session.request.call_count == 1
+
+    assert api_client.get_models() == {'ok': True}
+    assert mock_session.request.call_count == 3
+    assert api_client.hedging.fired == 1
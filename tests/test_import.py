@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ('requests', 'urllib3', 'dotenv', 'aiohttp', 'orjson', 'msgspec')
+
+# Documented import-time budgets in milliseconds (README, "Startup Time").
+IMPORT_BUDGETS_MS = {'strongly': 20, 'strongly.api_client': 50}
+
+# The budgets hold with a warm bytecode cache on an idle machine. The test
+# allows for cold caches and loaded CI runners, and also compares against
+# requests, which is imported in the same process and slowed down alike.
+BUDGET_SLACK = 3
+
+# Modules only needed by opt-in features or rare paths. Checking sys.modules
+# rather than timing the import keeps the test deterministic on busy machines.
+DEFERRED_MODULES = HEAVY_MODULES + (
+    'sqlite3', 'datetime', 'concurrent.futures', 'email.utils', 'tracemalloc',
+    'strongly.hedge', 'strongly.models', 'strongly.adapters', 'strongly.async_client',
+)
+
+def run_python(code, *flags):
+    result = subprocess.run([sys.executable, *flags, '-c', code], capture_output=True, text=True, check=True)
+    return result
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, strongly\n"
+        "client = strongly.APIClient(env_file=None, host='https://api.example.com', api_key='key',"
+        " serializer='json')\n"
+        f"print(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r}))\n"
+    )
+    assert run_python(code).stdout.strip() == '[]'
+
+def test_package_import_loads_no_submodules():
+    code = "import sys\nbefore = set(sys.modules)\nimport strongly\nprint(sorted(set(sys.modules) - before))\n"
+    assert run_python(code).stdout.strip() == "['strongly']"
+
+def test_client_import_defers_optional_modules():
+    code = f"import sys, strongly.api_client\nprint(sorted(m for m in {DEFERRED_MODULES!r} if m in sys.modules))\n"
+    assert run_python(code).stdout.strip() == '[]'
+
+def import_times(code):
+    """Cumulative import times in milliseconds, by module, from ``python -X importtime``."""
+    times = {}
+    for line in run_python(code, '-X', 'importtime').stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1000.0
+    return times
+
+def test_import_time_budget():
+    times = import_times('import strongly, strongly.api_client, requests')
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        assert times[module] < budget * BUDGET_SLACK, (module, times[module])
+    # Everything heavy is deferred, so the client module costs well under its HTTP stack.
+    assert times['strongly.api_client'] < times['requests']
@@ -0,0 +1,104 @@
+import pytest
+import requests
+from unittest.mock import Mock
+from strongly.exceptions import APIError
+from strongly.metrics import Instrumentation, LatencyHistogram
+from strongly.retry import RetryPolicy
+
+@pytest.fixture
+def instrumented_client(api_client):
+    api_client._auth_token = 'test-auth-token'
+    api_client.instrumentation = Instrumentation()
+    return api_client
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.5, 1.0))
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(0.8)
+
+    assert histogram.count == 100
+    assert 0 < histogram.percentile(50) <= 0.1
+    assert 0.5 < histogram.percentile(99) <= 0.8
+    assert LatencyHistogram().percentile(99) == 0.0
+
+def test_call_api_records_latency_and_bytes(instrumented_client, make_response):
+    response = make_response(payload={'models': []})
+    response._content = response.content
+    response.request.body = b'{}'
+    instrumented_client.session.request.return_value = response
+
+    instrumented_client.get_models()
+    instrumented_client.get_models()
+
+    inst = instrumented_client.instrumentation
+    assert inst.counter('requests', '/api/v1/models') == 2
+    assert inst.counter('bytes_received') == 2 * len(response.content)
+    assert inst.counter('bytes_sent') == 4
+    assert inst.percentiles('/api/v1/models')['count'] == 2
+    assert inst.percentiles('/api/v1/models', 'network')['count'] == 2
+    assert inst.percentiles('/api/v1/models', 'decode')['count'] == 2
+
+def test_hooks_and_span_export(instrumented_client, make_response):
+    inst = instrumented_client.instrumentation
+    pre, post, exported = Mock(), Mock(), []
+    inst.add_pre_request_hook(pre)
+    inst.add_post_request_hook(post)
+    inst.span_exporter = exported.append
+    instrumented_client.session.request.return_value = make_response(500, text='Internal Server Error')
+
+    with pytest.raises(APIError):
+        instrumented_client.get_models()
+
+    assert pre.call_count == 1 and post.call_count == 1
+    span = exported[0].to_dict()
+    assert span['name'] == 'GET /api/v1/models'
+    assert span['status']['code'] == 'ERROR'
+    assert span['attributes']['http.status_code'] == 500
+    assert span['end_time_unix_nano'] >= span['start_time_unix_nano']
+    assert inst.counter('errors') == 1
+
+def test_retries_and_reauths_counted(instrumented_client, make_response):
+    instrumented_client.retry_policy = RetryPolicy(backoff_base=0)
+    instrumented_client._refresh_token = Mock(return_value='new-token')
+    instrumented_client.session.request.side_effect = [
+        requests.ConnectionError('reset'),
+        make_response(401, text='Unauthorized'),
+        make_response(payload={'filteredText': 'x'}),
+    ]
+
+    exported = []
+    instrumented_client.instrumentation.span_exporter = exported.append
+    instrumented_client.filter_text('x')
+
+    inst = instrumented_client.instrumentation
+    assert inst.counter('retries') == 1
+    assert inst.counter('reauths') == 1
+    assert exported[0].events[0]['name'] == 'retry'
+
+def test_prometheus_export(instrumented_client, make_response):
+    instrumented_client.session.request.return_value = make_response(payload={'models': []})
+    instrumented_client.get_models()
+
+    text = instrumented_client.instrumentation.to_prometheus()
+
+    assert 'strongly_client_requests_total{endpoint="/api/v1/models"} 1' in text
+    assert '# TYPE strongly_client_request_duration_seconds histogram' in text
+    assert 'strongly_client_request_duration_seconds_count{endpoint="/api/v1/models",phase="total"} 1' in text
+    assert 'le="+Inf"} 1' in text
+
+def test_prometheus_exports_every_recorded_counter():
+    instrumentation = Instrumentation()
+    instrumentation.count('hedges')
+    instrumentation.count('hedge_wins')
+    instrumentation.count('custom')
+
+    text = instrumentation.to_prometheus()
+
+    assert 'strongly_client_hedges_total{endpoint=""} 1' in text
+    assert 'strongly_client_hedge_wins_total{endpoint=""} 1' in text
+    assert 'strongly_client_custom_total{endpoint=""} 1' in text
+
+def test_disabled_by_default(api_client):
+    assert api_client.instrumentation is None
@@ -0,0 +1,99 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from strongly.exceptions import APIError
+from strongly.pipeline import Pipeline
+
+def session(name):
+    return {'sessionId': name, 'sessionName': name}
+
+@pytest.fixture
+def client():
+    client = Mock()
+    client.filter_text.side_effect = lambda text: {'filteredText': text.upper(), 'filterCounts': {'pii': 1}}
+    client.submit_prompt.side_effect = lambda s, message, model, counts, context: {'response': message}
+    return client
+
+def test_results_are_yielded_in_input_order(client):
+    delays = {f"m{i}": 0.001 * (10 - i) for i in range(10)}  # later messages filter faster
+    client.filter_text.side_effect = lambda text: time.sleep(delays[text]) or {'filteredText': text.upper()}
+    messages = [(session(f"s{i % 3}"), f"m{i}") for i in range(10)]
+    results = list(Pipeline(client, 'gpt-4', filter_concurrency=4, prompt_concurrency=4).run(messages))
+    assert [r['message'] for r in results] == [f"m{i}" for i in range(10)]
+    assert [r['response'] for r in results] == [{'response': f"M{i}"} for i in range(10)]
+    assert all(r['error'] is None for r in results)
+
+def test_prompts_use_filtered_text_and_counts(client):
+    [result] = Pipeline(client, 'gpt-4').run([{'session': session('s'), 'message': 'hi', 'model': 'claude',
+                                               'context_prompts': [{'role': 'user', 'content': 'x'}]}])
+    client.submit_prompt.assert_called_once_with(session('s'), 'HI', 'claude', {'pii': 1},
+                                                 [{'role': 'user', 'content': 'x'}])
+    assert result['filtered'] == {'filteredText': 'HI', 'filterCounts': {'pii': 1}}
+
+def test_same_session_prompts_are_sequential_and_ordered(client):
+    lock = threading.Lock()
+    active = set()
+    order = []
+
+    def submit_prompt(s, message, model, counts, context):
+        with lock:
+            assert s['sessionId'] not in active
+            active.add(s['sessionId'])
+            order.append(message)
+        time.sleep(0.005)
+        with lock:
+            active.discard(s['sessionId'])
+        return {'response': message}
+
+    client.submit_prompt.side_effect = submit_prompt
+    messages = [(session(f"s{i % 2}"), f"m{i}") for i in range(12)]
+    results = list(Pipeline(client, 'gpt-4', filter_concurrency=6, prompt_concurrency=4).run(messages))
+    assert all(r['error'] is None for r in results)
+    for name in ('s0', 's1'):
+        sent = [m for m in order if int(m[1:]) % 2 == int(name[1])]
+        assert sent == sorted(sent, key=lambda m: int(m[1:]))
+
+def test_stages_overlap(client):
+    client.filter_text.side_effect = lambda text: time.sleep(0.02) or {'filteredText': text}
+    client.submit_prompt.side_effect = lambda *args: time.sleep(0.02) or {'response': 'ok'}
+    messages = [(session('s'), f"m{i}") for i in range(10)]
+    start = time.monotonic()
+    list(Pipeline(client, 'gpt-4', filter_concurrency=1, prompt_concurrency=1).run(messages))
+    assert time.monotonic() - start < 0.35  # sequential would take 0.4s
+
+def test_filter_error_skips_the_prompt(client):
+    def filter_text(text):
+        if text == 'bad':
+            raise APIError("filter failed", 500)
+        return {'filteredText': text}
+
+    client.filter_text.side_effect = filter_text
+    results = list(Pipeline(client, 'gpt-4').run([(session('s'), 'bad'), (session('s'), 'good')]))
+    assert isinstance(results[0]['error'], APIError) and results[0]['response'] is None
+    assert results[1]['response'] == {'response': 'good'}
+    client.submit_prompt.assert_called_once()
+
+def test_input_is_read_with_backpressure(client):
+    read = []
+
+    def messages():
+        for i in range(100):
+            read.append(i)
+            yield session('s%d' % i), f"m{i}"
+
+    results = Pipeline(client, 'gpt-4', max_pending=4).run(messages())
+    next(results)
+    time.sleep(0.05)
+    assert len(read) <= 6
+    results.close()
+
+def test_input_errors_are_raised_after_earlier_results(client):
+    def messages():
+        yield session('s'), 'first'
+        raise RuntimeError("broken input")
+
+    results = Pipeline(client, 'gpt-4').run(messages())
+    assert next(results)['message'] == 'first'
+    with pytest.raises(RuntimeError):
+        next(results)
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import Mock
+from strongly.prefilter import FilterMatcher, LocalPrefilter, filter_patterns
+
+FILTERS = {'filters': [
+    {'_id': '1', 'name': 'Emails', 'regex': r'[\w.]+@[\w.]+'},
+    {'_id': '2', 'name': 'Codenames', 'keywords': ['Project X', 'a.b']},
+    {'_id': '3', 'name': 'Repeats', 'pattern': r'/(\w)\1{3}/g'},
+]}
+
+def test_filter_patterns():
+    assert filter_patterns({'regex': 'abc'}) == ['abc']
+    assert filter_patterns({'pattern': '/abc/gi'}) == ['(?i-ms:abc)']
+    assert filter_patterns({'pattern': '/a.c/ms'}) == ['(?ms-i:a.c)']
+    assert filter_patterns({'keywords': ['a.b']}) == [r'a\.b']
+    assert filter_patterns({'name': 'PII detector'}) is None  # not pattern based
+    assert filter_patterns({'regex': '[unclosed'}) is None
+
+def test_matcher_has_no_false_negatives():
+    matcher = FilterMatcher(FILTERS['filters'])
+    assert matcher.complete
+    assert matcher.might_match('mail me at someone@example.com')
+    assert matcher.might_match('news about PROJECT x')  # looser than the server on case
+    assert matcher.might_match('zzzz')
+    assert not matcher.might_match('nothing to see here')
+    assert not matcher.might_match('ab')  # keywords are matched literally
+
+@pytest.mark.parametrize('pattern, text', [
+    ('[^a-z]1', 'X1'),
+    ('foo(?!bar)', 'fooBAR'),
+    ('(?<![a-z])id', 'Xid'),
+    (r'\bid\W', 'Xid.'),
+])
+def test_negated_constructs_are_left_to_the_server(pattern, text):
+    # Loosened to case-insensitive, these would miss a server-side match.
+    assert filter_patterns({'regex': pattern}) is None
+    matcher = FilterMatcher([{'regex': pattern}])
+    assert not matcher.complete
+    assert matcher.might_match(text)
+
+def test_literal_flags_are_kept():
+    matcher = FilterMatcher([{'pattern': '/^abc$/'}, {'pattern': '/x.y/s'}])
+    assert matcher.might_match('x\ny')
+    assert not matcher.might_match('ABC')
+    assert not matcher.might_match('ab\nabc')
+
+def test_non_ascii_text_is_forwarded():
+    matcher = FilterMatcher([{'regex': 'caf\u00e9'}])
+    assert matcher.might_match('CAF\u00c9')
+
+def test_incomplete_matcher_always_forwards():
+    matcher = FilterMatcher(FILTERS['filters'] + [{'_id': '4', 'name': 'Names'}])
+    assert not matcher.complete
+    assert matcher.might_match('nothing to see here')
+
+def test_matcher_rebuilt_when_filters_change():
+    prefilter = LocalPrefilter(refresh_interval=0)
+    fetch = Mock(return_value={'filters': [{'regex': 'secret'}]})
+
+    assert not prefilter.might_match('hello', fetch)
+    assert not prefilter.might_match('hello', fetch)
+    assert prefilter.rebuilds == 1
+
+    fetch.return_value = {'filters': [{'regex': 'hel+o'}]}
+    assert prefilter.might_match('hello', fetch)
+    assert prefilter.rebuilds == 2
+    assert prefilter.stats()['skipped'] == 2
+
+def test_client_skips_filter_text_for_non_matching_text(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.prefilter = LocalPrefilter()
+    api_client.session.request.side_effect = [
+        make_response(payload=FILTERS),
+        make_response(payload={'filteredText': '[email]', 'filterCounts': {'1': 1}, 'hashMap': {}}),
+    ]
+
+    assert api_client.filter_text('plain text') == {'filteredText': 'plain text', 'filterCounts': {}, 'hashMap': {}}
+    assert api_client.filter_text('me@example.com')['filteredText'] == '[email]'
+    assert [call.args[1] for call in api_client.session.request.call_args_list] == [
+        'https://api.example.com/api/v1/filters',
+        'https://api.example.com/api/v1/filterText',
+    ]
@@ -0,0 +1,71 @@
+import time
+import pytest
+from strongly.profiling import Profiler
+
+def test_public_methods_are_recorded_with_nesting(api_client, mock_session, make_response):
+    api_client._auth_token = 'token'
+    api_client._auth_expires_at = time.monotonic() + 3600
+
+    def request(method, url, **kwargs):
+        time.sleep(0.01)
+        return make_response(payload={'filteredText': 'x', 'filterCounts': {}})
+
+    mock_session.request.side_effect = request
+    api_client.filter_text('x')  # not recorded: no profiler yet
+    api_client.profiler = Profiler()
+    api_client.filter_text('x')
+
+    summary = api_client.profiler.summary()
+    assert set(summary) == {'APIClient.filter_text', 'APIClient.call_api'}
+    stats = summary['APIClient.filter_text']
+    assert stats['calls'] == 1 and stats['errors'] == 0
+    assert stats['wall'] >= 0.01
+    assert stats['wait'] >= 0.009 and stats['cpu'] < stats['wall']
+
+    stacks = dict(line.rsplit(' ', 1) for line in api_client.profiler.collapsed())
+    assert int(stacks['APIClient.filter_text;APIClient.call_api;[wait]']) >= 9000
+    assert api_client.profiler.report().splitlines()[1].startswith('APIClient.filter_text')
+
+def test_errors_are_counted(api_client, mock_session, make_response):
+    api_client._auth_token = 'token'
+    api_client._auth_expires_at = time.monotonic() + 3600
+    mock_session.request.return_value = make_response(400, text='bad request')
+    api_client.profiler = Profiler()
+    with pytest.raises(Exception):
+        api_client.get_models()
+    assert api_client.profiler.summary()['APIClient.get_models']['errors'] == 1
+
+def test_generators_are_timed_per_item_and_counted_once():
+    profiler = Profiler()
+
+    def produce():
+        for value in range(3):
+            time.sleep(0.005)
+            yield value
+
+    items = []
+    for item in profiler.iterate('produce', produce()):
+        items.append(item)
+        time.sleep(0.02)  # consumer time is not counted
+    assert items == [0, 1, 2]
+    stats = profiler.summary()['produce']
+    assert stats['calls'] == 1
+    assert 0.015 <= stats['wall'] < 0.05
+
+def test_allocation_sites(tmp_path):
+    profiler = Profiler(trace_allocations=True)
+    try:
+        kept = [profiler.summary() for _ in range(100)]
+        profiler.call('noop', time.sleep, 0.001)
+        sites = profiler.allocation_sites(limit=5)
+        assert sites and all(site['size'] > 0 for site in sites)
+        assert any('profiling.py' in site['site'] for site in sites)
+    finally:
+        profiler.stop()
+    del kept
+    with pytest.raises(RuntimeError):
+        profiler.allocation_sites()
+
+    path = tmp_path / 'profile.folded'
+    profiler.write_collapsed(str(path))
+    assert path.read_text().startswith('noop;')
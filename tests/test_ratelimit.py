@@ -0,0 +1,77 @@
+import time
+import pytest
+from unittest.mock import Mock, patch
+from strongly.exceptions import RateLimitExceeded, TokenBudgetExceeded
+from strongly.ratelimit import FileTokenBucket, TokenBucket, TokenBudget
+
+SESSION = {'sessionId': 'id', 'sessionName': 'name'}
+USAGE = {'isOverLimit': False, 'isRestricted': False, 'userTokenUsage': 9000, 'planTokenLimit': 10000}
+
+def test_token_bucket_allows_burst_then_limits():
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+def test_token_bucket_acquire_waits_for_refill():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.005
+
+def test_token_bucket_sheds_after_max_wait():
+    bucket = TokenBucket(rate=0.1, capacity=1, max_wait=0)
+    bucket.acquire()
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire()
+
+def test_file_token_bucket_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'bucket')
+    first = FileTokenBucket(path, rate=0.01, capacity=2)
+    second = FileTokenBucket(path, rate=0.01, capacity=2)
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    assert not second.try_acquire()
+
+def test_client_acquires_rate_limiter_per_request(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.rate_limiter = Mock()
+    api_client.session.request.return_value = make_response(payload={'models': []})
+
+    api_client.get_models()
+    api_client.get_models()
+
+    assert api_client.rate_limiter.acquire.call_count == 2
+
+def test_token_budget_admits_until_reserve():
+    budget = TokenBudget(reserve=100)
+    fetch = Mock(return_value=USAGE)
+    budget.admit(800, fetch)
+    with pytest.raises(TokenBudgetExceeded):
+        budget.admit(200, fetch)
+    assert fetch.call_count == 1
+    assert budget.shed == 1
+
+def test_token_budget_over_limit_sheds():
+    budget = TokenBudget()
+    with pytest.raises(TokenBudgetExceeded):
+        budget.admit(1, Mock(return_value=dict(USAGE, isOverLimit=True)))
+
+def test_token_budget_blocks_until_refresh_frees_quota():
+    budget = TokenBudget(refresh_interval=0.01, block=True)
+    fetch = Mock(side_effect=[dict(USAGE, userTokenUsage=10000), USAGE])
+    with patch('strongly.ratelimit.time.sleep') as sleep:
+        budget.admit(500, fetch)
+    assert sleep.call_count == 1
+    assert budget.remaining == 500
+
+def test_submit_prompt_shed_before_request(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.token_budget = TokenBudget()
+    api_client.session.request.return_value = make_response(payload=dict(USAGE, userTokenUsage=10000))
+
+    with pytest.raises(TokenBudgetExceeded):
+        api_client.submit_prompt(SESSION, 'message', 'model')
+
+    endpoints = [c.args[1] for c in api_client.session.request.call_args_list]
+    assert endpoints == ['https://api.example.com/api/v1/tokens']
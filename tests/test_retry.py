@@ -0,0 +1,142 @@
+import pytest
+import requests
+from unittest.mock import patch
+from strongly.exceptions import APIError, AuthenticationError, CircuitOpenError, RateLimitExceeded
+from strongly.ratelimit import TokenBucket
+from strongly.retry import CircuitBreaker, RetryPolicy, is_idempotent, parse_retry_after
+
+@pytest.fixture
+def retrying_client(api_client):
+    api_client._auth_token = 'test-auth-token'
+    api_client.retry_policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    return api_client
+
+@pytest.fixture
+def no_sleep():
+    with patch('strongly.api_client.time.sleep') as sleep:
+        yield sleep
+
+def test_is_idempotent():
+    assert is_idempotent('GET', '/api/v1/models')
+    assert is_idempotent('POST', '/api/v1/filterText')
+    assert not is_idempotent('POST', '/api/v1/submitPrompt')
+
+def test_parse_retry_after():
+    assert parse_retry_after('5') == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+def test_backoff_grows_and_is_capped():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+    assert [policy.backoff(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+    assert policy.backoff(1, retry_after=3) == 3
+    assert policy.backoff(1, retry_after=7) == 5
+    assert RetryPolicy().backoff(1, 3600.0) == 30.0
+    jittered = RetryPolicy(backoff_base=1, backoff_max=5)
+    assert all(0 <= jittered.backoff(3) <= 4 for _ in range(100))
+
+def test_get_retried_on_503(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.side_effect = [
+        make_response(503, text='Service Unavailable'),
+        make_response(200, {'models': []}),
+    ]
+    assert retrying_client.get_models() == {'models': []}
+    assert retrying_client.session.request.call_count == 2
+    assert no_sleep.call_count == 1
+
+def test_retry_after_honored(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.side_effect = [
+        make_response(429, headers={'Retry-After': '2'}, text='Too Many Requests'),
+        make_response(200, {'ok': True}),
+    ]
+    retrying_client.submit_prompt({'sessionId': 'id', 'sessionName': 'name'}, 'message', 'model')
+    no_sleep.assert_called_once_with(2.0)
+
+def test_long_retry_after_is_not_waited_out(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.return_value = make_response(
+        429, headers={'Retry-After': '3600'}, text='Too Many Requests')
+    with pytest.raises(APIError) as excinfo:
+        retrying_client.get_models()
+    assert excinfo.value.status_code == 429
+    assert retrying_client.session.request.call_count == 1
+    no_sleep.assert_not_called()
+
+def test_submit_prompt_not_retried_on_502(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.return_value = make_response(502, text='Bad Gateway')
+    with pytest.raises(APIError) as excinfo:
+        retrying_client.submit_prompt({'sessionId': 'id', 'sessionName': 'name'}, 'message', 'model')
+    assert excinfo.value.status_code == 502
+    assert retrying_client.session.request.call_count == 1
+
+def test_filter_text_retried_on_connection_reset(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.side_effect = [
+        requests.ConnectionError('Connection reset by peer'),
+        make_response(200, {'filteredText': 'ok'}),
+    ]
+    assert retrying_client.filter_text('text') == {'filteredText': 'ok'}
+
+def test_gives_up_after_max_attempts(retrying_client, make_response, no_sleep):
+    retrying_client.session.request.side_effect = requests.ConnectionError('down')
+    with pytest.raises(APIError):
+        retrying_client.get_models()
+    assert retrying_client.session.request.call_count == 3
+
+def test_deadline_stops_retries(retrying_client, make_response, no_sleep):
+    retrying_client.retry_policy = RetryPolicy(max_attempts=10, backoff_base=5, jitter=False, deadline=1)
+    retrying_client.session.request.return_value = make_response(503, text='Service Unavailable')
+    with pytest.raises(APIError):
+        retrying_client.get_models()
+    assert retrying_client.session.request.call_count == 1
+    assert retrying_client.session.request.call_args.kwargs['timeout'] <= 1
+
+def test_circuit_breaker_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    assert breaker.allow()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    with patch('strongly.retry.time.monotonic', return_value=breaker._opened_at + 1):
+        assert breaker.allow()
+        assert not breaker.allow()  # only one probe while half-open
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_open_circuit_fails_fast(retrying_client, make_response, no_sleep):
+    retrying_client.retry_policy = RetryPolicy(max_attempts=1)
+    retrying_client.circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    retrying_client.session.request.return_value = make_response(503, text='Service Unavailable')
+
+    for _ in range(2):
+        with pytest.raises(APIError):
+            retrying_client.get_models()
+    with pytest.raises(CircuitOpenError):
+        retrying_client.get_models()
+    assert retrying_client.session.request.call_count == 2
+
+def test_half_open_probe_is_released_when_attempt_fails_locally(retrying_client, make_response, no_sleep):
+    retrying_client.retry_policy = RetryPolicy(max_attempts=1)
+    breaker = retrying_client.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    retrying_client.session.request.return_value = make_response(503, text='Service Unavailable')
+    with pytest.raises(APIError):
+        retrying_client.get_models()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Throttled before the breaker is asked: no probe slot is taken.
+    retrying_client.rate_limiter = TokenBucket(rate=0.001, capacity=1, max_wait=0)
+    retrying_client.rate_limiter.acquire()
+    with pytest.raises(RateLimitExceeded):
+        retrying_client.get_models()
+    retrying_client.rate_limiter = None
+
+    # The probe fails to authenticate: the slot is freed without a verdict.
+    with patch.object(retrying_client, '_send_once', side_effect=AuthenticationError('auth down')):
+        with pytest.raises(AuthenticationError):
+            retrying_client.get_models()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    retrying_client.session.request.return_value = make_response(200, {'models': []})
+    assert retrying_client.get_models() == {'models': []}
+    assert breaker.state == CircuitBreaker.CLOSED
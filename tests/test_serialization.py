@@ -0,0 +1,94 @@
+import pytest
+from strongly import models
+from strongly.exceptions import APIError
+from strongly.models import FilterResult, ModelList, TokenUsage
+from strongly.serialization import JSONSerializer, get_serializer
+
+PAYLOAD = {'filteredText': 'Hi [1:name]', 'filterCounts': {'1': 1}, 'hashMap': {'[1:name]': 'Bob'}}
+
+@pytest.mark.parametrize('name', ['json', 'orjson', 'msgspec'])
+def test_serializers_round_trip(name):
+    try:
+        serializer = get_serializer(name)
+    except ImportError:
+        pytest.skip(f'{name} is not installed')
+    encoded = serializer.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert serializer.loads(encoded) == PAYLOAD
+
+def test_get_serializer_auto_and_custom():
+    assert get_serializer('auto').name in ('orjson', 'msgspec', 'json')
+    custom = JSONSerializer()
+    assert get_serializer(custom) is custom
+    with pytest.raises(ValueError):
+        get_serializer('yaml')
+
+def test_decode_typed_model():
+    body = b'{"models": [{"id": "1", "name": "Model 1", "extra": true}], "userId": "u", "message": "ok"}'
+    result = models.decode(body, ModelList, JSONSerializer())
+    assert result.user_id == 'u'
+    assert result.models[0].name == 'Model 1'
+    assert result.to_dict()['models'] == [{'id': '1', 'name': 'Model 1'}]
+
+def test_slots_fallback_models(monkeypatch):
+    monkeypatch.setattr(models, 'msgspec', None)
+    Item = models._define('Item', [('name', 'name', models.Any, None)], "Item.")
+    Bag = models._define('Bag', [('items', 'items', models.typing.List[Item], list),
+                                 ('owner_id', 'ownerId', models.Any, None)], "Bag.")
+
+    bag = models.decode(b'{"items": [{"name": "a"}], "ownerId": "o"}', Bag, JSONSerializer())
+
+    assert bag.owner_id == 'o'
+    assert bag.items == [Item(name='a')]
+    assert bag.to_dict() == {'items': [{'name': 'a'}], 'ownerId': 'o'}
+    assert not hasattr(bag, '__dict__')
+    assert Bag().items == []
+
+@pytest.mark.parametrize('backend', ['msgspec', 'slots'])
+def test_null_containers_decode_alike(backend, monkeypatch):
+    if backend == 'msgspec' and models.msgspec is None:
+        pytest.skip('msgspec is not installed')
+    if backend == 'slots':
+        monkeypatch.setattr(models, 'msgspec', None)
+    filter_result = models._define('FilterResult', FilterResult._fields, "")
+    model_list = models._define('ModelList', ModelList._fields, "")
+
+    result = models.decode(b'{"filteredText": "hi", "filterCounts": null, "hashMap": null}',
+                           filter_result, JSONSerializer())
+    listing = models.decode(b'{"models": null, "userId": "u"}', model_list, JSONSerializer())
+
+    assert (result.filtered_text, result.filter_counts, result.hash_map) == ('hi', None, None)
+    assert (listing.models, listing.user_id) == (None, 'u')
+
+def test_msgspec_rejects_malformed_response_as_api_error():
+    if models.msgspec is None:
+        pytest.skip('msgspec is not installed')
+    with pytest.raises(APIError):
+        models.decode(b'{"models": 5}', ModelList, JSONSerializer())
+
+def test_client_typed_responses(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.typed_responses = True
+    api_client.session.request.side_effect = [
+        make_response(payload=PAYLOAD),
+        make_response(payload={'isOverLimit': False, 'userTokenUsage': 5, 'planTokenLimit': 10}),
+    ]
+
+    result = api_client.filter_text('Hi Bob')
+    usage = api_client.check_token_usage()
+
+    assert isinstance(result, FilterResult)
+    assert result.hash_map == {'[1:name]': 'Bob'}
+    assert isinstance(usage, TokenUsage)
+    assert usage.plan_token_limit == 10
+
+def test_client_encodes_request_body_once(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.serializer = JSONSerializer()
+    api_client.session.request.return_value = make_response(payload=PAYLOAD)
+
+    api_client.filter_text('Hi Bob')
+
+    kwargs = api_client.session.request.call_args.kwargs
+    assert kwargs['data'] == b'{"text":"Hi Bob"}'
+    assert 'json' not in kwargs
@@ -0,0 +1,108 @@
+import itertools
+import threading
+import pytest
+from unittest.mock import Mock
+from strongly.exceptions import APIError
+from strongly.sessions import SessionManager
+
+@pytest.fixture
+def client():
+    client = Mock()
+    counter = itertools.count(1)
+    lock = threading.Lock()
+
+    def create_session(name):
+        with lock:
+            return {'sessionId': f"id-{next(counter)}", 'message': 'created'}
+
+    client.create_session.side_effect = create_session
+    client.rename_session.return_value = {'message': 'renamed'}
+    client.delete_session.return_value = {'message': 'deleted'}
+    return client
+
+def test_registry_indexes_by_id_and_name(client):
+    with SessionManager(client) as manager:
+        record = manager.create('Support')
+        assert manager.get(record.session_id) is record
+        assert manager.find('Support') is record
+
+        manager.rename(record.session_id, 'Billing')
+        assert manager.find('Support') is None
+        assert manager.find('Billing').session_id == record.session_id
+
+        manager.delete(record.session_id)
+        assert manager.get(record.session_id) is None
+        assert len(manager) == 0
+
+def test_acquire_uses_warm_pool(client):
+    with SessionManager(client, pool_size=3) as manager:
+        manager.warm()
+        assert client.create_session.call_count == 3
+
+        session = manager.acquire()
+        assert session['sessionName'].startswith('pool-')
+        assert manager.get(session['sessionId']) is not None
+
+        manager.warm()  # the background refill has been started; wait for it
+        assert client.create_session.call_count == 4
+        assert len(manager) == 4
+
+def test_acquire_with_name_renames_pooled_session(client):
+    with SessionManager(client, pool_size=1) as manager:
+        manager.warm()
+        session = manager.acquire('Customer 42')
+        assert session['sessionName'] == 'Customer 42'
+        client.rename_session.assert_called_once_with(session['sessionId'], 'Customer 42')
+
+def test_bulk_operations_report_per_item_results(client):
+    with SessionManager(client) as manager:
+        ids = [manager.create(f"s{i}").session_id for i in range(4)]
+        client.delete_session.side_effect = lambda session_id: (
+            (_ for _ in ()).throw(APIError("API call failed: gone", status_code=404))
+            if session_id == ids[1] else {'message': 'deleted'})
+
+        renamed = manager.rename_many({ids[0]: 'a', ids[2]: 'c'})
+        assert [r['ok'] for r in renamed] == [True, True]
+        assert manager.find('c').session_id == ids[2]
+
+        results = manager.delete_many(ids)
+        assert [r['sessionId'] for r in results] == ids
+        assert [r['ok'] for r in results] == [True, False, True, True]
+        assert results[1]['error'].status_code == 404
+        assert [r.session_id for r in manager.sessions()] == [ids[1]]
+
+def test_collect_idle_skips_pool_and_recent_sessions(client):
+    with SessionManager(client, pool_size=1, idle_timeout=60) as manager:
+        manager.warm()
+        old = manager.create('old')
+        recent = manager.create('recent')
+        old.last_used -= 120
+
+        results = manager.collect_idle()
+
+        assert [r['sessionId'] for r in results] == [old.session_id]
+        assert manager.get(recent.session_id) is not None
+        assert len(manager) == 2
+
+def test_acquire_after_close_creates_without_refilling(client):
+    manager = SessionManager(client, pool_size=2)
+    manager.warm()
+    manager.close()
+
+    assert manager.acquire()['sessionId'] in ('id-1', 'id-2')
+    assert manager.acquire()['sessionId'] in ('id-1', 'id-2')
+    assert manager.acquire()['sessionId'] == 'id-3'
+    assert client.create_session.call_count == 3
+    with pytest.raises(RuntimeError, match='closed'):
+        manager.warm()
+
+def test_warm_reports_a_failed_refill_once(client):
+    create_session = client.create_session.side_effect
+    client.create_session.side_effect = APIError("API call failed: down", status_code=503)
+    with SessionManager(client, pool_size=1) as manager:
+        with pytest.raises(APIError):
+            manager.warm()
+
+        client.create_session.side_effect = create_session
+        manager.warm()
+        assert manager.acquire()['sessionId'] == 'id-1'
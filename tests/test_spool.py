@@ -0,0 +1,144 @@
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import Mock
+from strongly.exceptions import APIError, AuthenticationError
+from strongly.retry import RetryPolicy
+from strongly.spool import SpoolQueue, is_retryable
+
+SESSION = {'sessionId': 's1', 'sessionName': 'Support'}
+
+@pytest.fixture
+def client():
+    client = Mock()
+    client.filter_text.side_effect = lambda text: {'filteredText': text.upper()}
+    client.submit_prompt.return_value = {'response': 'ok'}
+    return client
+
+def test_jobs_resolve_futures_and_leave_the_spool_empty(client, tmp_path):
+    with SpoolQueue(client, str(tmp_path / 'spool.db')) as spool:
+        filtered = spool.filter_text('hello')
+        prompted = spool.submit_prompt(SESSION, 'Hi', 'gpt-4')
+        assert filtered.result(timeout=5) == {'filteredText': 'HELLO'}
+        assert prompted.result(timeout=5) == {'response': 'ok'}
+        assert spool.join(timeout=5)
+        assert spool.pending() == 0
+    client.submit_prompt.assert_called_once_with(SESSION, 'Hi', 'gpt-4', {}, [])
+
+def test_invalid_jobs_are_rejected_on_enqueue(client, tmp_path):
+    with SpoolQueue(client, str(tmp_path / 'spool.db'), autostart=False) as spool:
+        with pytest.raises(ValueError):
+            spool.filter_text('')
+        with pytest.raises(ValueError):
+            spool.submit_prompt(SESSION, '', 'gpt-4')
+        assert spool.pending() == 0
+
+def test_transient_errors_are_retried(client, tmp_path):
+    client.filter_text.side_effect = [APIError("unavailable", 503), {'filteredText': 'x'}]
+    with SpoolQueue(client, str(tmp_path / 'spool.db'), backoff_base=0.01) as spool:
+        assert spool.filter_text('x').result(timeout=5) == {'filteredText': 'x'}
+    assert client.filter_text.call_count == 2
+
+def test_permanent_errors_fail_the_job(client, tmp_path):
+    client.filter_text.side_effect = APIError("bad request", 400)
+    callback = Mock()
+    with SpoolQueue(client, str(tmp_path / 'spool.db'), on_complete=callback) as spool:
+        future = spool.filter_text('x')
+        with pytest.raises(APIError):
+            future.result(timeout=5)
+        [failed] = spool.failed_jobs()
+        assert failed['id'] == future.job_id
+        assert failed['attempts'] == 1
+        assert failed['payload'] == {'text': 'x'}
+    callback.assert_called_once()
+    assert client.filter_text.call_count == 1
+
+def test_failing_on_complete_does_not_block_the_future(client, tmp_path, caplog):
+    callback = Mock(side_effect=RuntimeError("callback bug"))
+    with SpoolQueue(client, str(tmp_path / 'spool.db'), on_complete=callback) as spool:
+        future = spool.filter_text('x')
+        assert future.result(timeout=5) == {'filteredText': 'X'}
+        assert spool.join(timeout=5)
+    callback.assert_called_once_with(future.job_id, {'filteredText': 'X'}, None)
+    assert 'on_complete failed' in caplog.text
+
+def auth_error(cause):
+    try:
+        raise AuthenticationError("Authentication failed") from cause
+    except AuthenticationError as exc:
+        return exc
+
+def test_auth_outages_are_retryable():
+    assert is_retryable(auth_error(APIError("unavailable", 503)))
+    assert not is_retryable(auth_error(APIError("invalid key", 401)))
+    assert not is_retryable(AuthenticationError("No session token received"))
+
+def test_authentication_failure_carries_the_status(api_client, make_response):
+    api_client.session.get.return_value = make_response(status_code=503, text='unavailable')
+    with pytest.raises(AuthenticationError) as info:
+        api_client.authenticate()
+    assert info.value.__cause__.status_code == 503
+    assert is_retryable(info.value)
+
+def test_auth_transport_errors_are_retryable(api_client):
+    api_client.retry_policy = RetryPolicy(max_attempts=1)
+    api_client.session.get.side_effect = requests.ConnectionError("refused")
+    with pytest.raises(APIError) as info:
+        api_client.filter_text('x')
+    assert is_retryable(info.value)
+
+def test_spooled_jobs_survive_a_restart(client, tmp_path):
+    path = str(tmp_path / 'spool.db')
+    with SpoolQueue(client, path, autostart=False) as spool:
+        spool.filter_text('a')
+        spool.filter_text('b')
+    client.filter_text.assert_not_called()
+
+    done = []
+    finished = threading.Event()
+
+    def on_complete(job_id, result, error):
+        done.append(result['filteredText'])
+        if len(done) == 2:
+            finished.set()
+
+    with SpoolQueue(client, path, concurrency=1, on_complete=on_complete):
+        assert finished.wait(5)
+    assert done == ['A', 'B']
+
+def test_job_outliving_its_lease_is_not_replayed(client, tmp_path):
+    path = str(tmp_path / 'spool.db')
+    release = threading.Event()
+    client.submit_prompt.side_effect = lambda *args: release.wait(5) and {'response': 'ok'}
+
+    with SpoolQueue(client, path, concurrency=2, lease_time=0.15) as spool:
+        future = spool.submit_prompt(SESSION, 'Hi', 'gpt-4')
+        with SpoolQueue(client, path, lease_time=0.15):
+            time.sleep(0.6)  # several lease periods, for this queue and another one on the file
+            assert client.submit_prompt.call_count == 1
+            release.set()
+            assert future.result(timeout=5) == {'response': 'ok'}
+    assert client.submit_prompt.call_count == 1
+
+def test_concurrency_is_bounded(client, tmp_path):
+    active = []
+    peak = []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def filter_text(text):
+        with lock:
+            active.append(text)
+            peak.append(len(active))
+        release.wait(5)
+        with lock:
+            active.remove(text)
+        return {'filteredText': text}
+
+    client.filter_text.side_effect = filter_text
+    with SpoolQueue(client, str(tmp_path / 'spool.db'), concurrency=2) as spool:
+        futures = [spool.filter_text(str(i)) for i in range(6)]
+        release.set()
+        assert [f.result(timeout=5)['filteredText'] for f in futures] == [str(i) for i in range(6)]
+    assert max(peak) <= 2
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import pytest
+from strongly import AsyncAPIClient
+from strongly.exceptions import APIError
+from strongly.serialization import get_serializer
+from strongly.streaming import SSEDecoder, event_text, iter_sse_text
+
+SESSION = {'sessionId': 'test-session-id', 'sessionName': 'Test Session'}
+
+def test_sse_decoder_joins_multiline_data():
+    decoder = SSEDecoder()
+    assert decoder.feed(': keep-alive') is None
+    assert decoder.feed('event: message') is None
+    assert decoder.feed('data: first') is None
+    assert decoder.feed('data: second') is None
+    assert decoder.feed('') == 'first\nsecond'
+    assert decoder.feed('') is None
+
+def test_event_text_formats():
+    assert event_text('plain words') == 'plain words'
+    assert event_text('42') == '42'
+    assert event_text('{"content": "Par"}') == 'Par'
+    assert event_text('{"delta": {"content": "is"}}') == 'is'
+    assert event_text('{"choices": [{"delta": {"content": "!"}}]}') == '!'
+    assert event_text('{"done": true}') is None
+    with pytest.raises(APIError):
+        event_text('{"error": "model overloaded"}')
+
+def test_iter_sse_text_stops_at_done():
+    lines = ['data: {"content": "Hel"}', '', 'data: {"content": "lo"}', '', 'data: [DONE]', '',
+             'data: {"content": "ignored"}', '']
+    assert list(iter_sse_text(lines)) == ['Hel', 'lo']
+
+def test_stream_prompt_sse(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    response = make_response(headers={'Content-Type': 'text/event-stream'})
+    response.encoding = 'utf-8'
+    response.iter_lines.return_value = iter(['data: {"content": "The capital"}', '',
+                                             'data: {"content": " is Paris."}', '', 'data: [DONE]', ''])
+    api_client.session.request.return_value = response
+
+    chunks = list(api_client.stream_prompt(SESSION, "What is the capital of France?", "gpt-3.5-turbo"))
+
+    assert chunks == ['The capital', ' is Paris.']
+    response.close.assert_called_once()
+    args, kwargs = api_client.session.request.call_args
+    assert args == ('POST', 'https://api.example.com/api/v1/submitPrompt')
+    assert kwargs['stream'] is True
+    assert json.loads(kwargs['data'])['stream'] is True
+    assert kwargs['headers']['Content-Type'] == 'application/json'
+    assert kwargs['headers']['Accept'] == 'text/event-stream'
+
+def test_stream_prompt_plain_chunks(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    response = make_response(headers={'Content-Type': 'text/plain'})
+    response.encoding = 'utf-8'
+    response.iter_content.return_value = iter(['Par', 'is'])
+    api_client.session.request.return_value = response
+
+    assert list(api_client.stream_prompt(SESSION, "message", "model")) == ['Par', 'is']
+
+def test_stream_prompt_failure(api_client, make_response):
+    api_client._auth_token = 'test-auth-token'
+    api_client.session.request.return_value = make_response(500, text='Internal Server Error')
+
+    with pytest.raises(APIError):
+        api_client.stream_prompt(SESSION, "message", "model")
+
+def test_stream_prompt_invalid_input(api_client):
+    with pytest.raises(ValueError):
+        api_client.stream_prompt({}, "message", "model")
+
+def test_async_stream_prompt():
+    aiohttp = pytest.importorskip('aiohttp')
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def authenticate(request):
+        return web.json_response({'authToken': 'token'})
+
+    async def submit_prompt(request):
+        body = await request.json()
+        assert body['stream'] is True
+        assert request.content_type == 'application/json'
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        for piece in ('The capital', ' is Paris.'):
+            await response.write(f'data: {{"content": "{piece}"}}\n\n'.encode())
+        await response.write(b'data: [DONE]\n\n')
+        return response
+
+    async def runner():
+        app = web.Application()
+        app.router.add_get('/api/v1/authenticate', authenticate)
+        app.router.add_post('/api/v1/submitPrompt', submit_prompt)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            host = str(server.make_url('')).rstrip('/')
+            serializer = get_serializer('json')
+            dumps = serializer.dumps
+            encoded = []
+            serializer.dumps = lambda obj: encoded.append(obj) or dumps(obj)
+            async with AsyncAPIClient(test_env={'API_HOST': host, 'API_KEY': 'key'}, serializer=serializer) as client:
+                chunks = [chunk async for chunk in client.stream_prompt(SESSION, "message", "model")]
+            assert [payload['message'] for payload in encoded] == ["message"]
+            return chunks
+        finally:
+            await server.close()
+
+    assert asyncio.run(runner()) == ['The capital', ' is Paris.']
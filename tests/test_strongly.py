@@ -1,6 +1,10 @@
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, Mock
 from strongly import APIClient
+from strongly import api_client as api_client_module
+from strongly.api_client import load_config, refresh_deadline, token_lifetime
 from strongly.exceptions import AuthenticationError, APIError
 
 def test_init_missing_env(monkeypatch):
@@ -9,6 +13,33 @@ def test_init_missing_env(monkeypatch):
     with pytest.raises(ValueError):
         APIClient(test_env={})  # Pass an empty dict as test_env
 
+def test_init_explicit_config_skips_env_file(monkeypatch, tmp_path):
+    monkeypatch.setenv('API_HOST', 'https://env.example.com')
+    with patch.object(api_client_module, 'read_env_file') as read_env_file:
+        client = APIClient(env_file=str(tmp_path / 'missing.env'), host='https://api.example.com', api_key='key')
+
+    assert (client.host, client.api_key) == ('https://api.example.com', 'key')
+    read_env_file.assert_not_called()
+    assert client._session is None  # no HTTP session until the first request
+
+def test_load_config_parses_env_file_once(monkeypatch, tmp_path):
+    monkeypatch.delenv('API_HOST', raising=False)
+    monkeypatch.delenv('API_KEY', raising=False)
+    env_file = tmp_path / '.env'
+    env_file.write_text('API_HOST=https://file.example.com\nAPI_KEY=file-key\n')
+
+    with patch('dotenv.dotenv_values', wraps=__import__('dotenv').dotenv_values) as dotenv_values:
+        assert load_config(str(env_file)) == ('https://file.example.com', 'file-key')
+        assert load_config(str(env_file)) == ('https://file.example.com', 'file-key')
+        assert dotenv_values.call_count == 1
+
+        env_file.write_text('API_HOST=https://other.example.com\nAPI_KEY=other-key\n')
+        assert load_config(str(env_file)) == ('https://other.example.com', 'other-key')
+        assert dotenv_values.call_count == 2
+
+    monkeypatch.setenv('API_KEY', 'env-key')  # the environment wins over the file
+    assert load_config(str(env_file)) == ('https://other.example.com', 'env-key')
+
 def test_authenticate_success(api_client):
     mock_response = Mock()
     mock_response.status_code = 200
@@ -38,7 +69,7 @@ def test_call_api_success(api_client):
     api_client._auth_token = 'test-session-token'
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.json.return_value = {'data': 'test-data'}
+    mock_response.content = b'{"data": "test-data"}'
     api_client.session.request.return_value = mock_response
 
     result = api_client.call_api('GET', '/test-endpoint')
@@ -54,7 +85,7 @@ def test_call_api_session_expired(api_client):
     api_client.session_token = 'expired-token'
     mock_responses = [
         Mock(status_code=401, text='Unauthorized'),
-        Mock(status_code=200, json=Mock(return_value={'data': 'test-data'}))
+        Mock(status_code=200, content=b'{"data": "test-data"}')
     ]
     api_client.session.request.side_effect = mock_responses
     api_client.authenticate = Mock(return_value='new-session-token')
@@ -341,3 +372,94 @@ def test_submit_prompt_invalid_input(api_client):
     for session, message, model in invalid_inputs:
         with pytest.raises(ValueError):
             api_client.submit_prompt(session, message, model)
+
+def test_auth_token_single_flight(api_client, make_response):
+    def slow_authenticate(*args, **kwargs):
+        time.sleep(0.05)
+        return make_response(payload={'authToken': 'shared-token'})
+    api_client.session.get.side_effect = slow_authenticate
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        tokens = list(pool.map(lambda _: api_client.auth_token, range(32)))
+
+    assert tokens == ['shared-token'] * 32
+    assert api_client.session.get.call_count == 1
+
+def test_call_api_concurrent_401_reauthenticates_once(api_client, make_response):
+    api_client._auth_token = 'expired-token'
+    api_client.session.get.side_effect = lambda *a, **k: (
+        time.sleep(0.05) or make_response(payload={'authToken': 'fresh-token'}))
+    api_client.session.request.side_effect = lambda method, url, headers, **kwargs: (
+        make_response(200, {'data': 'ok'}) if headers['X-Auth-Token'] == 'fresh-token'
+        else make_response(401, text='Unauthorized'))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: api_client.call_api('GET', '/test-endpoint', headers={}), range(16)))
+
+    assert results == [{'data': 'ok'}] * 16
+    assert api_client.session.get.call_count == 1
+
+def test_auth_token_proactive_refresh(api_client, make_response):
+    api_client.refresh_margin = 30
+    api_client.session.get.side_effect = [
+        make_response(payload={'authToken': 'old', 'expiresIn': 3600}),
+        make_response(payload={'authToken': 'long-lived', 'expiresIn': 3600}),
+    ]
+
+    assert api_client.authenticate() == 'old'
+    assert api_client.auth_token == 'old'
+    api_client._auth_refresh_at = time.monotonic() - 1  # within refresh_margin of expiry
+    assert api_client.auth_token == 'long-lived'
+    assert api_client.auth_token == 'long-lived'
+    assert api_client.session.get.call_count == 2
+
+def test_short_lived_token_is_not_refreshed_at_once(api_client, make_response):
+    api_client.refresh_margin = 30
+    api_client.session.get.return_value = make_response(payload={'authToken': 'short-lived', 'expiresIn': 10})
+
+    assert [api_client.auth_token for _ in range(5)] == ['short-lived'] * 5
+    assert api_client.session.get.call_count == 1
+    # The margin is capped at half the lifetime.
+    assert 4 < api_client._auth_refresh_at - time.monotonic() <= 5
+
+def test_refresh_deadline():
+    assert refresh_deadline(3600, 30) == 3570
+    assert refresh_deadline(10, 30) == 5
+    assert refresh_deadline(-5, 30) == -5
+    assert refresh_deadline(None, 30) is None
+
+def test_token_lifetime():
+    assert token_lifetime({'expiresIn': 60}) == 60
+    assert token_lifetime({'authToken': 'x'}) is None
+    assert 55 < token_lifetime({'expiresAt': time.time() + 60}) <= 60
+    assert 55 < token_lifetime({'expiresAt': (time.time() + 60) * 1000}) <= 60
+    assert token_lifetime({'expiresAt': '2000-01-01T00:00:00Z'}) < 0
+
+def test_token_store_shares_token_between_clients(mock_env, tmp_path):
+    from strongly.token_store import FileTokenStore
+
+    path = str(tmp_path / 'token')
+    first, second = APIClient(token_store=FileTokenStore(path)), APIClient(token_store=FileTokenStore(path))
+    first.authenticate = Mock(side_effect=lambda: setattr(first, '_auth_token', 'token-1') or 'token-1')
+    second.authenticate = Mock(side_effect=lambda: setattr(second, '_auth_token', 'token-2') or 'token-2')
+
+    assert first.auth_token == 'token-1'
+    assert second.auth_token == 'token-1'  # adopted from the store
+    second.authenticate.assert_not_called()
+
+    # A rejected token is replaced once and picked up by the other client.
+    assert second._refresh_token(stale_token='token-1') == 'token-2'
+    assert first._refresh_token(stale_token='token-1') == 'token-2'
+    assert first.authenticate.call_count == 1
+
+def test_token_store_shares_short_lived_token(mock_env, tmp_path):
+    from strongly.token_store import FileTokenStore
+
+    path = str(tmp_path / 'token')
+    first, second = APIClient(token_store=FileTokenStore(path)), APIClient(token_store=FileTokenStore(path))
+    first.authenticate = Mock(side_effect=lambda: first._set_token('token-1', 10) or 'token-1')
+    second.authenticate = Mock(side_effect=lambda: second._set_token('token-2', 10) or 'token-2')
+
+    assert first.auth_token == 'token-1'
+    assert [second.auth_token for _ in range(3)] == ['token-1'] * 3
+    second.authenticate.assert_not_called()
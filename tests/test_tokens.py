@@ -0,0 +1,14 @@
+from strongly.tokens import estimate_prompt_tokens, estimate_tokens
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+def test_estimate_prompt_tokens_includes_context():
+    payload = {
+        'message': 'a' * 40,
+        'contextPrompts': ['b' * 8, {'role': 'assistant', 'content': 'c' * 12}],
+    }
+    assert estimate_prompt_tokens(payload) == 10 + 2 + (3 + 3)
@@ -0,0 +1,91 @@
+import gzip
+import io
+import json
+import pytest
+from strongly.exceptions import APIError
+from strongly.transport import Compression, is_stream, json_text_stream
+
+TEXT = 'Émile said "hi"\n\tand left: 😀 \\ done'
+
+def test_json_text_stream_matches_json_encoding():
+    encoded = TEXT.encode('utf-8')
+    # Split inside multi-byte characters to exercise the incremental decoder.
+    chunks = [encoded[i:i + 3] for i in range(0, len(encoded), 3)]
+    body = b''.join(json_text_stream(iter(chunks)))
+    assert json.loads(body) == {'text': TEXT}
+    assert json.loads(b''.join(json_text_stream(io.StringIO(TEXT), chunk_size=4))) == {'text': TEXT}
+
+def test_is_stream():
+    assert is_stream(io.BytesIO(b'x'))
+    assert is_stream(iter(['x']))
+    assert not is_stream('x')
+    assert not is_stream(b'x')
+    assert not is_stream(['x'])
+
+def test_compression_threshold_and_round_trip():
+    compression = Compression(threshold=100)
+    assert compression.encode(b'small') == (b'small', None)
+
+    body = json.dumps({'text': 'a' * 1000}).encode()
+    compressed, encoding = compression.encode(body)
+    assert encoding == 'gzip'
+    assert len(compressed) < len(body)
+    assert gzip.decompress(compressed) == body
+
+    chunks, encoding = compression.encode(iter([b'abc', 'def']))
+    assert gzip.decompress(b''.join(chunks)) == b'abcdef'
+
+def test_unknown_or_missing_algorithm():
+    with pytest.raises(ValueError):
+        Compression('brotli')
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            Compression('zstd')
+
+@pytest.fixture
+def compressing_client(api_client):
+    api_client._auth_token = 'test-auth-token'
+    api_client.compression = Compression(threshold=100)
+    return api_client
+
+def test_large_bodies_are_compressed(compressing_client, make_response):
+    compressing_client.session.request.return_value = make_response(payload={'filteredText': 'ok'})
+
+    compressing_client.filter_text('short')
+    kwargs = compressing_client.session.request.call_args.kwargs
+    assert 'Content-Encoding' not in kwargs['headers']
+
+    compressing_client.filter_text('long text ' * 100)
+    kwargs = compressing_client.session.request.call_args.kwargs
+    assert kwargs['headers']['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(kwargs['data'])) == {'text': 'long text ' * 100}
+
+def test_compression_disabled_after_415(compressing_client, make_response):
+    compressing_client.session.request.side_effect = [
+        make_response(415, text='Unsupported Media Type'),
+        make_response(payload={'filteredText': 'ok'}),
+    ]
+
+    assert compressing_client.filter_text('long text ' * 100) == {'filteredText': 'ok'}
+
+    retry = compressing_client.session.request.call_args.kwargs
+    assert 'Content-Encoding' not in retry['headers']
+    assert json.loads(retry['data']) == {'text': 'long text ' * 100}
+    assert compressing_client.compression.supported is False
+
+def test_filter_text_streams_file_objects_without_retrying(compressing_client, make_response):
+    sent = []
+
+    def consume(method, url, data=None, **kwargs):
+        sent.append(gzip.decompress(b''.join(data)))
+        return make_response(503, text='Service Unavailable')
+
+    compressing_client.session.request.side_effect = consume
+    with pytest.raises(APIError) as excinfo:
+        compressing_client.filter_text(io.BytesIO(TEXT.encode('utf-8')))
+
+    assert excinfo.value.status_code == 503
+    assert compressing_client.session.request.call_count == 1  # a streamed body cannot be replayed
+    assert json.loads(sent[0]) == {'text': TEXT}